@@ -0,0 +1,79 @@
+"""
+Проверка общих модулей проектов ya_news и ya_note.
+
+Проекты запускаются и разворачиваются отдельно, поэтому общий код
+(middleware метрик, компиляция шаблонов, эталонная тестовая база,
+пул соединений SQLite, помощники бенчмарков) лежит в каждом из них.
+Источник — ya_news: модуль правится там, а копия в ya_note отличается
+только именами проекта. Скрипт сверяет копии и с флагом --write обновляет их.
+
+    python check_mirrors.py
+    python check_mirrors.py --write
+"""
+import argparse
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Файл в ya_news и его копия в ya_note.
+MIRRORS = (
+    ("ya_news/yanews/metrics.py", "ya_note/yanote/metrics.py"),
+    ("ya_news/yanews/templating.py", "ya_note/yanote/templating.py"),
+    ("ya_news/yanews/testing.py", "ya_note/yanote/testing.py"),
+    (
+        "ya_news/yanews/sqlite_pool/__init__.py",
+        "ya_note/yanote/sqlite_pool/__init__.py",
+    ),
+    (
+        "ya_news/yanews/sqlite_pool/base.py",
+        "ya_note/yanote/sqlite_pool/base.py",
+    ),
+    (
+        "ya_news/news/management/commands/compile_templates.py",
+        "ya_note/notes/management/commands/compile_templates.py",
+    ),
+    ("ya_news/benchmarks/common.py", "ya_note/benchmarks/common.py"),
+)
+NAMES = (("ya_news", "ya_note"), ("yanews", "yanote"), ("YaNews", "YaNote"))
+
+
+def expected_copy(source):
+    """Текст копии: исходный модуль с именами второго проекта."""
+    text = source.read_text(encoding="utf-8")
+    for news_name, note_name in NAMES:
+        text = text.replace(news_name, note_name)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--write", action="store_true", help="Обновить копии в ya_note."
+    )
+    args = parser.parse_args()
+
+    stale = []
+    for source, copy in MIRRORS:
+        text = expected_copy(BASE_DIR / source)
+        copy_path = BASE_DIR / copy
+        if copy_path.read_text(encoding="utf-8") == text:
+            continue
+        if args.write:
+            copy_path.write_text(text, encoding="utf-8")
+            print(f"Обновлён {copy}.", file=sys.stderr)
+        else:
+            stale.append(f"{copy} отличается от {source}")
+    if stale:
+        print(
+            "Копии общих модулей разошлись с ya_news, выполните "
+            "python check_mirrors.py --write:",
+            *stale,
+            sep="\n",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
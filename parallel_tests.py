@@ -0,0 +1,165 @@
+"""
+Параллельный запуск тестов проектов ya_news и ya_note.
+
+Тесты каждого проекта делятся на части по модулям (классы TestCase
+не разрывают, чтобы setUpTestData выполнялся один раз) и запускаются
+в отдельных процессах pytest. Тестовая база SQLite у pytest-django
+создаётся в памяти процесса, поэтому у каждой части она своя.
+Проекты выполняются одновременно, результаты всех частей собираются
+в один отчёт JUnit XML.
+
+    python parallel_tests.py ya_news ya_note --workers 4
+
+В stdout печатаются коды возврата pytest по проектам в порядке
+аргументов, вывод pytest идёт в stderr.
+"""
+import argparse
+import heapq
+import os
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from xml.etree import ElementTree
+
+BASE_DIR = Path(__file__).resolve().parent
+SUMMARY_FIELDS = ("tests", "failures", "errors", "skipped")
+
+
+def pytest_command(*args):
+    return [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", *args]
+
+
+def child_env(project):
+    """
+    Окружение pytest для проекта.
+
+    DJANGO_SETTINGS_MODULE передаётся только проекту, в котором
+    лежит этот модуль; другой проект берёт настройки из pytest.ini.
+    """
+    env = os.environ.copy()
+    module = env.get("DJANGO_SETTINGS_MODULE", "")
+    package = module.partition(".")[0]
+    if not package or not (BASE_DIR / project / package).is_dir():
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+    return env
+
+
+def collect_groups(project):
+    """
+    Собирает тесты проекта и группирует их.
+
+    Тесты класса попадают в группу «файл::Класс», функции —
+    в группу своего файла. Возвращает код возврата pytest
+    и размеры групп.
+    """
+    result = subprocess.run(
+        pytest_command("-o", "addopts=", "--collect-only", "-q"),
+        cwd=BASE_DIR / project,
+        env=child_env(project),
+        capture_output=True,
+        text=True,
+    )
+    groups = Counter()
+    if result.returncode:
+        print(result.stdout, result.stderr, sep="\n", file=sys.stderr)
+        return result.returncode, groups
+    for line in result.stdout.splitlines():
+        if "::" not in line:
+            continue
+        parts = line.split("::")
+        groups["::".join(parts[:2]) if len(parts) > 2 else parts[0]] += 1
+    return result.returncode, groups
+
+
+def split_into_shards(groups, workers):
+    """Раскладывает группы по частям, начиная с самых больших."""
+    shards = [(0, index, []) for index in range(min(workers, len(groups)))]
+    for group, size in groups.most_common():
+        total, index, items = heapq.heappop(shards)
+        items.append(group)
+        heapq.heappush(shards, (total + size, index, items))
+    return [items for _, _, items in sorted(shards, key=lambda s: s[1])]
+
+
+def run_shard(project, index, node_ids, report_dir):
+    report = Path(report_dir) / f"{project}-{index}.xml"
+    result = subprocess.run(
+        pytest_command("--tb=line", f"--junitxml={report}", *node_ids),
+        cwd=BASE_DIR / project,
+        env=child_env(project),
+        capture_output=True,
+        text=True,
+    )
+    header = f" {project}, часть {index + 1} "
+    print(
+        f"{header:=^79}", result.stdout, result.stderr,
+        sep="\n", file=sys.stderr, flush=True,
+    )
+    return project, result.returncode, report
+
+
+def merge_reports(reports, output):
+    """Объединяет отчёты частей в один <testsuites> и подводит итог."""
+    merged = ElementTree.Element("testsuites")
+    totals = Counter()
+    for report in reports:
+        if not report.exists():
+            continue
+        root = ElementTree.parse(report).getroot()
+        for suite in root.iter("testsuite"):
+            merged.append(suite)
+            for field in SUMMARY_FIELDS:
+                totals[field] += int(suite.get(field, 0))
+            totals["time"] += float(suite.get("time", 0))
+    for field in SUMMARY_FIELDS:
+        merged.set(field, str(totals[field]))
+    merged.set("time", f"{totals['time']:.3f}")
+    ElementTree.ElementTree(merged).write(
+        output, encoding="utf-8", xml_declaration=True
+    )
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("projects", nargs="+")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--report", default=BASE_DIR / "test-report.xml")
+    args = parser.parse_args()
+
+    statuses = dict.fromkeys(args.projects, 0)
+    with tempfile.TemporaryDirectory() as report_dir:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            groups = {}
+            for project, (status, project_groups) in zip(
+                args.projects, executor.map(collect_groups, args.projects)
+            ):
+                statuses[project] = status
+                groups[project] = project_groups
+            futures = [
+                executor.submit(run_shard, project, index, shard, report_dir)
+                for project in args.projects
+                for index, shard in enumerate(
+                    split_into_shards(groups[project], args.workers)
+                )
+            ]
+            results = [future.result() for future in futures]
+        for project, status, _ in results:
+            statuses[project] = max(statuses[project], status)
+        totals = merge_reports(
+            [report for _, _, report in results], args.report
+        )
+    print(
+        ", ".join(f"{field}: {totals[field]}" for field in SUMMARY_FIELDS),
+        f"отчёт: {args.report}",
+        sep="; ",
+        file=sys.stderr,
+    )
+    print(*statuses.values())
+
+
+if __name__ == "__main__":
+    main()
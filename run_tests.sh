@@ -14,6 +14,50 @@ print_message () {
     echo -e "${left_filler_len// /$symbol}$message${right_filler_len// /$symbol}\033[0m"
 }
 
+run_sequential () {
+    # Run the tests of ya_news and, if they pass, of ya_note.
+    # Set news_status and note_status to the pytest exit codes.
+    # DJANGO_SETTINGS_MODULE applies to the project that owns the module.
+    note_status=0
+    local settings_module=$DJANGO_SETTINGS_MODULE
+    cd ya_news
+    if [[ $settings_module == yanews.* ]]
+    then
+        export DJANGO_SETTINGS_MODULE=$settings_module
+    else
+        export DJANGO_SETTINGS_MODULE="yanews.settings_test"
+    fi
+    pytest --tb=line 1>&2
+    news_status=$?
+    if [[ $news_status -eq 0 ]]
+    then
+        cd ../ya_note
+        if [[ $settings_module == yanote.* ]]
+        then
+            export DJANGO_SETTINGS_MODULE=$settings_module
+        else
+            export DJANGO_SETTINGS_MODULE="yanote.settings_test"
+        fi
+        pytest --tb=line 1>&2
+        note_status=$?
+    fi
+}
+
+run_parallel () {
+    # Run both projects at once, each split across worker processes,
+    # and merge the results into test-report.xml.
+    read -r news_status note_status < <(python parallel_tests.py ya_news ya_note)
+    # No statuses means the runner itself failed.
+    news_status=${news_status:-1}
+    note_status=${note_status:-1}
+}
+
+
+if ! python check_mirrors.py
+then
+    print_message " Копии общих модулей в ya_news и ya_note разошлись, см. check_mirrors.py " "=" 1
+    exit 1
+fi
 
 if python -m flake8 --config=setup.cfg 1>&2;
 then
@@ -21,28 +65,24 @@ then
     echo $LF 1>&2
     if python structure_test.py
     then
-        cd ya_news
-        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanews.settings"}"
-        if pytest --tb=line 1>&2;
+        if [[ "$1" == "--parallel" ]]
         then
-            cd ../ya_note
-            unset DJANGO_SETTINGS_MODULE
-            export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanote.settings"}"
-            if pytest --tb=line 1>&2;
-            then
-                exit 0
-            else
-                status=$?
-                print_message " При запуске упали ваши тесты для проекта YaNote. Проверьте тесты этого проекта " "=" 1
-                echo \`\`\` 1>&2
-                exit $status
-            fi
+            run_parallel
         else
-            status=$?
+            run_sequential
+        fi
+        if [[ $news_status -ne 0 ]]
+        then
             print_message " При запуске упали ваши тесты для проекта YaNews. Проверьте тесты этого проекта " "=" 1
             echo \`\`\` 1>&2
-            exit $status
+            exit $news_status
+        elif [[ $note_status -ne 0 ]]
+        then
+            print_message " При запуске упали ваши тесты для проекта YaNote. Проверьте тесты этого проекта " "=" 1
+            echo \`\`\` 1>&2
+            exit $note_status
         fi
+        exit 0
     else
         status=$?
         print_message " Убедитесь, что написанные вами тесты скопированы в указанные в ТЗ директории " "=" 1
@@ -0,0 +1,187 @@
+"""
+Синхронные и асинхронные представления под ASGI.
+
+Приложение из yanews.asgi вызывается в том же процессе через
+ApplicationCommunicator, нагрузку создают корутины asyncio без
+сетевого стека. Для сравнения те же страницы отдаются синхронными
+вариантами представлений, которые ASGI выполняет в пуле потоков.
+Кеш страниц и карточек подменяется на DummyCache, чтобы каждый запрос
+доходил до представления. Кеш версий остаётся файловым, как в проекте:
+его чтение входит в стоимость каждого запроса.
+
+    python -m benchmarks.async_views --requests 400 --concurrency 1 10 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.urls import include, path
+
+from .common import print_table, setup_django
+
+os.environ.setdefault("DJANGO_DB_CONNECTIONS", "pool")
+
+
+def sync_urlpatterns():
+    """Маршруты проекта, где главная и новость — синхронные."""
+    from django.views import generic
+
+    from news import urls, views
+    from yanews.urls import urlpatterns
+
+    class SyncNewsList(views.NewsList):
+        get = generic.ListView.get
+
+    class SyncNewsDetail(views.CommentsPageMixin, views.NewsDetail):
+        get = generic.DetailView.get
+
+        def get_object(self, queryset=None):
+            return self.model.objects.with_last_comment().get(
+                pk=self.kwargs["pk"]
+            )
+
+    news_patterns = [
+        path("", SyncNewsList.as_view(), name="home"),
+        path("news/<int:pk>/", SyncNewsDetail.as_view(), name="detail"),
+        *urls.urlpatterns[2:],
+    ]
+    return [
+        path("", include((news_patterns, "news"))),
+        *urlpatterns[1:],
+    ]
+
+
+def fill():
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    from news.models import Comment, News
+
+    call_command("migrate", verbosity=0)
+    author = get_user_model().objects.create(username="bench")
+    news = News.objects.bulk_create(
+        News(title=f"Новость {index}", text="Текст") for index in range(10)
+    )
+    Comment.objects.bulk_create(
+        Comment(news=item, author=author, text=f"Комментарий {index}")
+        for item in news
+        for index in range(20)
+    )
+    return news[0].pk
+
+
+async def get(application, url):
+    from asgiref.testing import ApplicationCommunicator
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url,
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 40000),
+    }
+    communicator = ApplicationCommunicator(application, scope)
+    await communicator.send_input({"type": "http.request", "body": b""})
+    start = await communicator.receive_output(10)
+    while (await communicator.receive_output(10)).get("more_body"):
+        pass
+    await communicator.wait(10)
+    return start["status"]
+
+
+async def load(application, url, requests, concurrency):
+    """Держит concurrency запросов в работе, пока не выполнит все."""
+    counter = iter(range(requests))
+    statuses = []
+
+    async def worker():
+        for _ in counter:
+            statuses.append(await get(application, url))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return statuses
+
+
+def run(application, url, requests, concurrency):
+    """Возвращает запросы в секунду и пик памяти на соединение в КБ."""
+    # Прогрев: соединения пула, скомпилированные шаблоны, маршруты.
+    asyncio.run(load(application, url, concurrency, concurrency))
+    start = time.perf_counter()
+    statuses = asyncio.run(load(application, url, requests, concurrency))
+    elapsed = time.perf_counter() - start
+    assert set(statuses) == {200}, set(statuses)
+    tracemalloc.start()
+    asyncio.run(load(application, url, concurrency, concurrency))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return requests / elapsed, peak / 1024 / concurrency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 10, 50]
+    )
+    args = parser.parse_args()
+
+    from django.conf import settings
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yanews.settings")
+    settings.DATABASES["default"]["NAME"] = Path(
+        tempfile.mkdtemp(), "db.sqlite3"
+    )
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        },
+        "filebased": {
+            **settings.CACHES["filebased"],
+            "LOCATION": tempfile.mkdtemp(),
+        },
+    }
+    setup_django()
+    from django.test.utils import override_settings
+
+    from yanews.asgi import application
+
+    news_id = fill()
+    pages = (("главная", "/"), ("новость", f"/news/{news_id}/"))
+    modes = (
+        ("async", settings.ROOT_URLCONF),
+        ("sync", "benchmarks.async_views"),
+    )
+    rows = []
+    for page, url in pages:
+        for mode, urlconf in modes:
+            with override_settings(ROOT_URLCONF=urlconf):
+                for concurrency in args.concurrency:
+                    rps, memory = run(
+                        application, url, args.requests, concurrency
+                    )
+                    rows.append((
+                        page, mode, concurrency,
+                        f"{rps:.0f}", f"{memory:.1f}",
+                    ))
+    print_table(
+        rows,
+        ("страница", "представления", "соединений", "запросов/с",
+         "КБ на соединение"),
+    )
+
+
+if __name__ != "__main__":
+    # Модуль служит ROOT_URLCONF для синхронного режима.
+    urlpatterns = sync_urlpatterns()
+
+
+if __name__ == "__main__":
+    main()
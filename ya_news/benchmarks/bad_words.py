@@ -0,0 +1,71 @@
+"""
+Микробенчмарк фильтра запрещённых слов.
+
+Сравнивает прежний перебор BAD_WORDS с BadWordsMatcher
+на большом словаре и длинном комментарии без совпадений.
+
+    python -m benchmarks.bad_words --words 10000 --text-kb 50
+"""
+import argparse
+import random
+import time
+
+from .common import setup_django
+
+ALPHABET = "абвгдежзийклмнопрстуфхцчшщъыьэюя"
+
+
+def random_word(rng, min_length=4, max_length=12):
+    length = rng.randint(min_length, max_length)
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def naive_search(words, text):
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return word
+    return None
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=10_000)
+    parser.add_argument("--text-kb", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from news.moderation import BadWordsMatcher
+
+    rng = random.Random(0)
+    words = {random_word(rng, min_length=8) for _ in range(args.words)}
+    # Текст из коротких слов гарантированно не содержит словарных.
+    text = ""
+    while len(text.encode()) < args.text_kb * 1024:
+        text += random_word(rng, 2, 6) + " "
+
+    for whole_words in (False, True):
+        start = time.perf_counter()
+        matcher = BadWordsMatcher(words, whole_words=whole_words)
+        compile_ms = (time.perf_counter() - start) * 1000
+        search_ms = best_of(lambda: matcher.search(text), args.repeat)
+        print(
+            f"BadWordsMatcher(whole_words={whole_words}): "
+            f"сборка {compile_ms:.0f} мс, поиск {search_ms:.1f} мс"
+        )
+    naive_ms = best_of(lambda: naive_search(words, text), args.repeat)
+    print(f"Перебор слов: поиск {naive_ms:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Нагрузочный тест режимов соединений с базой.
+
+Для каждого режима DJANGO_DB_CONNECTIONS запускается отдельный
+процесс с локальным сервером и временной базой, после чего
+страница комментариев запрашивается из нескольких потоков.
+WSGI обслуживает многопоточный wsgiref из стандартной библиотеки,
+ASGI — uvicorn, если он установлен.
+
+    python -m benchmarks.connection_pooling --requests 2000 --concurrency 8
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.request import urlopen
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from .common import print_table
+
+MODES = (
+    ("wsgi", ""),
+    ("wsgi", "persistent"),
+    ("asgi", ""),
+    ("asgi", "pool"),
+)
+
+
+class ThreadPoolWSGIServer(WSGIServer):
+    """
+    Обрабатывает запросы в постоянных потоках, как потоковые воркеры
+    gunicorn: соединение с базой потока переживает запрос.
+    """
+
+    def __init__(self, *args, workers=8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(
+            self.process_request_thread, request, client_address
+        )
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+def fill():
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username="bench")
+    news = News.objects.create(title="Новость", text="Текст")
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f"Комментарий {index}")
+        for index in range(50)
+    )
+    return news.pk
+
+
+def serve(interface, port):
+    """Готовит временную базу и обслуживает запросы до завершения."""
+    import django
+    from django.conf import settings
+
+    directory = tempfile.mkdtemp()
+    settings.DATABASES["default"]["NAME"] = Path(directory, "db.sqlite3")
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connections
+
+    call_command("migrate", verbosity=0)
+    news_id = fill()
+    connections.close_all()
+    print(news_id, flush=True)
+    if interface == "wsgi":
+        from yanews.wsgi import application
+
+        make_server(
+            "127.0.0.1", port, application,
+            server_class=ThreadPoolWSGIServer, handler_class=QuietHandler,
+        ).serve_forever()
+    else:
+        import uvicorn
+
+        from yanews.asgi import application
+
+        uvicorn.run(application, port=port, log_level="warning")
+
+
+def load(url, requests, concurrency):
+    """Возвращает задержки запросов в миллисекундах."""
+    latencies = []
+    errors = []
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            start = time.perf_counter()
+            try:
+                with urlopen(url) as response:
+                    response.read()
+            except OSError as error:
+                errors.append(error)
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def run_mode(interface, mode, args):
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "yanews.settings",
+        "DJANGO_DB_CONNECTIONS": mode,
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.connection_pooling",
+            "--serve", interface, "--port", str(args.port),
+        ],
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        news_id = server.stdout.readline().strip()
+        url = f"http://127.0.0.1:{args.port}/news/{news_id}/comments/"
+        for _ in range(50):
+            try:
+                urlopen(url).read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        latencies, errors = load(url, args.requests, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+    percentiles = statistics.quantiles(latencies, n=100)
+    return (
+        interface,
+        mode or "без пула",
+        f"{percentiles[49]:.1f}",
+        f"{percentiles[98]:.1f}",
+        len(errors),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serve", choices=("wsgi", "asgi"))
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    try:
+        import uvicorn  # noqa: F401
+    except ImportError:
+        print("uvicorn не установлен, режимы ASGI пропущены.")
+        modes = [mode for mode in MODES if mode[0] == "wsgi"]
+    else:
+        modes = MODES
+    rows = [run_mode(interface, mode, args) for interface, mode in modes]
+    print_table(rows, ("сервер", "соединения", "p50, мс", "p99, мс", "ошибок"))
+
+
+if __name__ == "__main__":
+    main()
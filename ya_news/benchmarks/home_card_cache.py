@@ -0,0 +1,74 @@
+"""
+Пропускная способность главной страницы с кешем карточек и без него.
+
+Без кеша используется DummyCache: версии и фрагменты не сохраняются,
+и каждая карточка рендерится заново.
+
+    python -m benchmarks.home_card_cache --requests 500
+"""
+import argparse
+import time
+
+from .common import print_table, setup_django, test_database
+
+
+def fill(comments_per_news):
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username="bench")
+    for index in range(settings.NEWS_COUNT_ON_HOME_PAGE):
+        news = News.objects.create(
+            title=f"Новость {index}", text="Длинный текст новости. " * 50
+        )
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text="Текст")
+            for _ in range(comments_per_news)
+        )
+
+
+def throughput(requests):
+    from django.test import Client
+    from django.urls import reverse
+
+    client = Client(HTTP_HOST="localhost")
+    url = reverse("news:home")
+    client.get(url)
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(url)
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test.utils import override_settings
+
+    caches = {
+        **settings.CACHES,
+        "dummy": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+    rows = []
+    with test_database():
+        fill(args.comments)
+        for name, alias in (("без кеша", "dummy"), ("locmem", "default"),
+                            ("filebased", "filebased")):
+            with override_settings(CACHES=caches, NEWS_CARD_CACHE=alias):
+                rows.append((name, f"{throughput(args.requests):.0f}"))
+            if alias == "filebased":
+                from django.core.cache import caches as cache_handler
+
+                cache_handler["filebased"].clear()
+    print_table(rows, ("кеш карточек", "запросов/с"))
+
+
+if __name__ == "__main__":
+    main()
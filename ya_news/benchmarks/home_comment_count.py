@@ -0,0 +1,70 @@
+"""
+Сравнение подсчёта комментариев на главной странице.
+
+prefetch_related("comment_set") загружает все комментарии в память,
+with_comment_count() считает их агрегатом в том же запросе.
+
+    python -m benchmarks.home_comment_count --comments 10000
+"""
+import argparse
+
+from .common import measure, print_table, setup_django, test_database
+
+
+def fill(news_count, comments_per_news):
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username="bench")
+    all_news = News.objects.bulk_create(
+        News(title=f"Новость {index}", text="Текст")
+        for index in range(news_count)
+    )
+    for news in all_news:
+        Comment.objects.bulk_create(
+            (
+                Comment(news=news, author=author, text="Текст " * 20)
+                for _ in range(comments_per_news)
+            ),
+            batch_size=1000,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--news", type=int, default=10)
+    parser.add_argument("--comments", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    from news.models import News
+
+    limit = settings.NEWS_COUNT_ON_HOME_PAGE
+
+    def prefetched():
+        for news in News.objects.prefetch_related("comment_set")[:limit]:
+            news.comment_set.count()
+
+    def annotated():
+        for news in News.objects.with_comment_count()[:limit]:
+            news.comment_count
+
+    with test_database():
+        fill(args.news, args.comments)
+        rows = [
+            (name, f"{ms:.1f}", f"{kb:.0f}", queries)
+            for name, (ms, kb, queries) in (
+                ("prefetch_related", measure(prefetched, args.repeat)),
+                ("with_comment_count", measure(annotated, args.repeat)),
+            )
+        ]
+    print(f"{args.news} новостей по {args.comments} комментариев")
+    print_table(rows, ("способ", "время, мс", "пик памяти, КБ", "запросов"))
+
+
+if __name__ == "__main__":
+    main()
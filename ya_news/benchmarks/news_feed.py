@@ -0,0 +1,120 @@
+"""
+Байты и процессорное время на один опрос ленты агрегатором.
+
+Сравнивается чтение HTML главной страницы (как есть и через
+GZipMiddleware) с JSON-лентой api/news/ без сжатия, с gzip
+и с If-None-Match. Каждый вариант опрашивается дважды: когда
+новости не менялись и когда перед каждым опросом к одной из новостей
+добавляется комментарий. На странице ленты столько же новостей,
+сколько на главной.
+
+    python -m benchmarks.news_feed --polls 300
+"""
+import argparse
+import time
+
+from .common import print_table, setup_django, test_database
+
+GZIP_MIDDLEWARE = "django.middleware.gzip.GZipMiddleware"
+
+
+def fill(news_count, comments_per_news):
+    from django.contrib.auth import get_user_model
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username="bench")
+    news = [
+        News.objects.create(
+            title=f"Новость {index}", text="Длинный текст новости. " * 50
+        )
+        for index in range(news_count)
+    ]
+    Comment.objects.bulk_create(
+        Comment(news=item, author=author, text="Текст")
+        for item in news
+        for _ in range(comments_per_news)
+    )
+    return author, news
+
+
+def poll(url, polls, headers, change=None):
+    """
+    Опрашивает url и возвращает байты тела и миллисекунды
+    процессорного времени на один опрос.
+
+    change() вызывается перед каждым опросом и в замер не входит.
+    С заголовком if-none-match клиент присылает ETag прошлого ответа.
+    """
+    from django.test import Client
+
+    client = Client(HTTP_HOST="localhost")
+    conditional = headers.pop("if-none-match", False)
+    response = client.get(url, headers=headers)
+    size = 0
+    cpu = 0.0
+    for _ in range(polls):
+        if change:
+            change()
+        if conditional:
+            headers["if-none-match"] = response["ETag"]
+        start = time.process_time()
+        new_response = client.get(url, headers=headers)
+        cpu += time.process_time() - start
+        size += len(new_response.content)
+        if new_response.status_code == 200:
+            response = new_response
+    return size / polls, cpu / polls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--polls", type=int, default=300)
+    parser.add_argument("--comments", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test.utils import override_settings
+    from django.urls import reverse
+
+    from news.models import Comment
+
+    gzip = {"accept-encoding": "gzip"}
+    variants = (
+        ("HTML", "news:home", {}, ()),
+        ("HTML + GZipMiddleware", "news:home", gzip, (GZIP_MIDDLEWARE,)),
+        ("JSON", "news:api_news", {}, ()),
+        ("JSON gzip", "news:api_news", gzip, ()),
+        (
+            "JSON gzip + If-None-Match",
+            "news:api_news",
+            {**gzip, "if-none-match": True},
+            (),
+        ),
+    )
+    rows = []
+    with test_database(), override_settings(
+        NEWS_API_COUNT_ON_PAGE=settings.NEWS_COUNT_ON_HOME_PAGE
+    ):
+        author, news = fill(settings.NEWS_COUNT_ON_HOME_PAGE, args.comments)
+
+        def add_comment():
+            Comment.objects.create(news=news[0], author=author, text="Ещё")
+
+        for name, url_name, headers, middleware in variants:
+            with override_settings(
+                MIDDLEWARE=[*middleware, *settings.MIDDLEWARE]
+            ):
+                for changed, change in (("нет", None), ("да", add_comment)):
+                    size, cpu = poll(
+                        reverse(url_name), args.polls, dict(headers), change
+                    )
+                    rows.append((name, changed, f"{size:.0f}", f"{cpu:.3f}"))
+    print_table(
+        rows, ("ответ", "изменения", "байт на опрос", "мс CPU на опрос")
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Задержка поиска по новостям и комментариям на объёме архива.
+
+Во временную файловую базу записываются --news новостей
+по --comments комментариев к каждой из случайных слов, индексы
+ведут триггеры. Затем индексы заново строятся командой
+rebuild_search_index, и одинаковые запросы выполняются через
+search_news и через icontains, с комментариями и без.
+
+    python -m benchmarks.news_search --news 200000 --comments 5
+"""
+import argparse
+import random
+import tempfile
+import time
+from io import StringIO
+from itertools import accumulate
+from pathlib import Path
+
+from .common import measure, print_table, setup_django
+
+SYLLABLES = (
+    "ба", "ве", "го", "ду", "же", "зи", "ко", "ла", "ми", "но",
+    "пу", "ро", "си", "ту", "фа", "хе", "це", "чо", "ша", "ю",
+)
+VOCABULARY_SIZE = 20000
+BATCH_SIZE = 10000
+
+
+def make_vocabulary(rng):
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    # Порядок задаёт частоту: первые слова встречаются чаще всего.
+    return sorted(words)
+
+
+def fill(news_count, comments, vocabulary, rng):
+    """Пишет новости и комментарии пачками в обход ORM."""
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+
+    author = get_user_model().objects.create(username="bench")
+    # Распределение Ципфа: несколько слов частые, остальные редкие.
+    weights = list(
+        accumulate(1 / rank for rank in range(1, len(vocabulary) + 1))
+    )
+
+    def phrase(length):
+        return " ".join(
+            rng.choices(vocabulary, cum_weights=weights, k=length)
+        )
+
+    start = time.perf_counter()
+    for first in range(1, news_count + 1, BATCH_SIZE):
+        ids = range(first, min(first + BATCH_SIZE, news_count + 1))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO news_news (id, title, text, date) "
+                "VALUES (%s, %s, %s, '2020-01-01')",
+                [(news_id, phrase(4), phrase(80)) for news_id in ids],
+            )
+            cursor.executemany(
+                "INSERT INTO news_comment (news_id, author_id, text, created) "
+                "VALUES (%s, %s, %s, '2020-01-01 00:00:00')",
+                [
+                    (news_id, author.pk, phrase(15))
+                    for news_id in ids
+                    for _ in range(comments)
+                ],
+            )
+    return time.perf_counter() - start
+
+
+def icontains_search(query, limit, with_comments):
+    from django.db.models import Q
+
+    from news.models import News
+
+    condition = Q(title__icontains=query) | Q(text__icontains=query)
+    if with_comments:
+        condition |= Q(comment__text__icontains=query)
+    return list(News.objects.filter(condition).distinct()[:limit])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--news", type=int, default=200_000)
+    parser.add_argument("--comments", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from django.conf import settings
+
+    setup_django()
+    settings.DATABASES["default"]["NAME"] = Path(
+        tempfile.mkdtemp(), "db.sqlite3"
+    )
+    from django.core.management import call_command
+
+    from news.search import search_news
+
+    call_command("migrate", verbosity=0)
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng)
+    elapsed = fill(args.news, args.comments, vocabulary, rng)
+    print(
+        f"Записано {args.news} новостей и {args.news * args.comments} "
+        f"комментариев с индексацией триггерами за {elapsed:.1f} с."
+    )
+    start = time.perf_counter()
+    call_command("rebuild_search_index", stdout=StringIO())
+    print(
+        f"rebuild_search_index: {time.perf_counter() - start:.1f} с."
+    )
+
+    queries = (
+        ("частое слово", vocabulary[0]),
+        ("среднее слово", vocabulary[200]),
+        ("редкое слово", vocabulary[-1]),
+        ("два слова", f"{vocabulary[0]} {vocabulary[200]}"),
+        ("нет совпадений", "щщщ"),
+    )
+    rows = []
+    for name, query in queries:
+        for with_comments in (False, True):
+            for method, search in (
+                ("fts5", search_news),
+                ("icontains", icontains_search),
+            ):
+                def run():
+                    return search(
+                        query, limit=args.limit, with_comments=with_comments
+                    )
+
+                found = len(run())
+                time_ms, _, _ = measure(run, repeat=3)
+                rows.append((
+                    name,
+                    "да" if with_comments else "нет",
+                    method,
+                    found,
+                    f"{time_ms:.2f}",
+                ))
+    print_table(
+        rows, ("запрос", "комментарии", "поиск", "найдено", "мс")
+    )
+
+
+if __name__ == "__main__":
+    main()
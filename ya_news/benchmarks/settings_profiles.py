@@ -0,0 +1,63 @@
+"""
+Время прогона тестов с настройками разработки и с settings_test.
+
+Для каждого проекта pytest запускается в отдельном процессе
+с модулем настроек из --ds, в таблицу попадает медиана времени.
+
+    python -m benchmarks.settings_profiles --repeat 3
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .common import print_table
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+PROJECTS = {"ya_news": "yanews", "ya_note": "yanote"}
+PROFILES = ("settings", "settings_test")
+
+
+def run_suite(project, settings_module):
+    """Возвращает время прогона в секундах и код возврата pytest."""
+    env = os.environ.copy()
+    env.pop("DJANGO_SETTINGS_MODULE", None)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "pytest", "-q", "-o", "addopts=",
+            "-p", "no:cacheprovider", f"--ds={settings_module}",
+        ],
+        cwd=ROOT_DIR / project,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start, result.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    for project, package in PROJECTS.items():
+        for profile in PROFILES:
+            timings = []
+            for _ in range(args.repeat):
+                elapsed, status = run_suite(project, f"{package}.{profile}")
+                if status:
+                    sys.exit(f"{project} с {profile}: pytest вернул {status}")
+                timings.append(elapsed)
+            rows.append(
+                (project, profile, f"{statistics.median(timings):.2f}")
+            )
+    print_table(rows, ("проект", "настройки", "время, с"))
+
+
+if __name__ == "__main__":
+    main()
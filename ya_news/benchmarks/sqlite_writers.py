@@ -0,0 +1,108 @@
+"""
+Конкурентная запись в файловую базу SQLite с разными настройками.
+
+Каждый поток в цикле открывает транзакцию, читает число комментариев
+новости и добавляет новый комментарий: так ведёт себя типичная запись
+через ORM. Сравниваются настройки SQLite по умолчанию и настройки
+проекта из DATABASES (прагмы SQLITE_PRAGMAS и BEGIN IMMEDIATE).
+
+    python -m benchmarks.sqlite_writers --threads 8 --writes 200
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .common import print_table, setup_django
+
+ALIAS = "benchmark"
+
+
+def configure(options, directory):
+    from django.db import connections
+
+    connections.settings[ALIAS] = {
+        **connections.settings["default"],
+        "NAME": str(Path(directory, "benchmark.sqlite3")),
+        "OPTIONS": options,
+    }
+    with connections[ALIAS].cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE comment (id INTEGER PRIMARY KEY, news_id INTEGER, "
+            "text TEXT)"
+        )
+        cursor.execute("CREATE INDEX comment_news ON comment (news_id)")
+
+
+def run_writers(threads, writes):
+    """Возвращает число успешных транзакций, ошибок и время в секундах."""
+    from django.db import OperationalError, connections, transaction
+
+    barrier = threading.Barrier(threads)
+    committed, errors = [], []
+
+    def write(news_id):
+        barrier.wait()
+        for _ in range(writes):
+            try:
+                with transaction.atomic(using=ALIAS):
+                    with connections[ALIAS].cursor() as cursor:
+                        cursor.execute(
+                            "SELECT COUNT(*) FROM comment WHERE news_id = %s",
+                            [news_id],
+                        )
+                        cursor.execute(
+                            "INSERT INTO comment (news_id, text) "
+                            "VALUES (%s, %s)",
+                            [news_id, "Текст комментария " * 10],
+                        )
+                committed.append(1)
+            except OperationalError:
+                errors.append(1)
+        connections[ALIAS].close()
+
+    workers = [
+        threading.Thread(target=write, args=(index % 4,))
+        for index in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return len(committed), len(errors), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connections
+
+    profiles = (
+        ("по умолчанию", {}),
+        ("проект", settings.DATABASES["default"]["OPTIONS"]),
+    )
+    rows = []
+    for name, options in profiles:
+        with tempfile.TemporaryDirectory() as directory:
+            configure(options, directory)
+            committed, errors, elapsed = run_writers(
+                args.threads, args.writes
+            )
+            connections[ALIAS].close()
+            del connections[ALIAS]
+            del connections.settings[ALIAS]
+        rows.append(
+            (name, committed, errors, f"{committed / elapsed:.0f}")
+        )
+    print_table(rows, ("настройки", "записей", "ошибок", "записей/с"))
+
+
+if __name__ == "__main__":
+    main()
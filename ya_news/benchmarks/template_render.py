@@ -0,0 +1,103 @@
+"""
+Что даёт прогрев шаблонов при запуске процесса.
+
+Движок настраивается как в проекте: loaders не заданы, и Django
+сам оборачивает загрузчики в кеширующий. Поэтому без прогрева
+дорог только первый рендер news/detail.html в новом процессе:
+шаблон, его родители и включения читаются с диска и разбираются.
+compile_templates() переносит эту работу на запуск. Замеряется
+первый рендер в свежем движке без прогрева и после него, время
+самого прогрева и установившийся рендер.
+
+    python -m benchmarks.template_render --processes 50
+"""
+import argparse
+import statistics
+import time
+
+from .common import print_table, setup_django, test_database
+
+TEMPLATE = "news/detail.html"
+
+
+def make_engine():
+    """Новый движок с настройками проекта, как в новом процессе."""
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    params = {**settings.TEMPLATES[0], "NAME": "benchmark"}
+    del params["BACKEND"]
+    return DjangoTemplates(params)
+
+
+def make_context(comments):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+
+    from news.models import Comment, News
+
+    author = get_user_model().objects.create(username="bench")
+    news = News.objects.create(title="Новость", text="Текст " * 200)
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f"Комментарий {index}")
+        for index in range(comments)
+    )
+    request = RequestFactory().get("/", HTTP_HOST="localhost")
+    request.user = AnonymousUser()
+    context = {
+        "news": news,
+        "comments": list(news.comment_set.select_related("author")),
+    }
+    return context, request
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def prewarm(engine):
+    """Тот же обход, что в yanews.templating.compile_templates."""
+    from yanews.templating import project_template_names
+
+    for name in project_template_names(engine):
+        engine.get_template(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=50)
+    parser.add_argument("--renders", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        context, request = make_context(args.comments)
+
+        def render(engine):
+            engine.get_template(TEMPLATE).render(context, request)
+
+        cold, warmup, warm = [], [], []
+        for _ in range(args.processes):
+            engine = make_engine()
+            cold.append(timed(lambda: render(engine)))
+            engine = make_engine()
+            warmup.append(timed(lambda: prewarm(engine)))
+            warm.append(timed(lambda: render(engine)))
+        steady = timed(
+            lambda: [render(engine) for _ in range(args.renders)]
+        ) / args.renders
+    rows = [
+        ("первый рендер без прогрева", f"{statistics.median(cold):.3f}"),
+        ("прогрев всех шаблонов", f"{statistics.median(warmup):.3f}"),
+        ("первый рендер после прогрева", f"{statistics.median(warm):.3f}"),
+        ("последующие рендеры", f"{steady:.3f}"),
+    ]
+    print_table(rows, ("замер", "мс (медиана)"))
+
+
+if __name__ == "__main__":
+    main()
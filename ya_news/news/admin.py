@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Comment, News
+from .models import ArchivedNews, BannedWord, Comment, News
 
 
 class CommentInline(admin.StackedInline):
@@ -13,3 +13,20 @@ class NewsAdmin(admin.ModelAdmin):
     inlines = [
         CommentInline,
     ]
+
+
+@admin.register(BannedWord)
+class BannedWordAdmin(admin.ModelAdmin):
+    search_fields = ("word",)
+
+
+@admin.register(ArchivedNews)
+class ArchivedNewsAdmin(admin.ModelAdmin):
+    list_display = ("title", "date", "archived")
+    search_fields = ("title",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
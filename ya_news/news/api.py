@@ -0,0 +1,172 @@
+"""
+JSON API новостей и комментариев только для чтения.
+
+Агрегаторы опрашивают ленту каждые несколько секунд, поэтому ответ
+строится по версиям из caching.py. ETag равен версии списка новостей
+(для комментариев — версии новости), и на If-None-Match с той же
+версией сразу отдаётся 304. Тело ответа хранится в кеше уже сжатым,
+если клиент принимает gzip, и не сжимается заново на каждый опрос.
+Когда меняется одна новость, заново сериализуется только она: JSON
+каждой новости кешируется по её id и версии.
+
+Страницы выбираются курсором по (date, id), как комментарии
+на странице новости.
+"""
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from django.utils.text import compress_string
+from django.views.decorators.http import require_safe
+
+from .caching import get_cache, get_versions, page_cache_key
+from .models import News
+from .pagination import KeysetPaginator
+from .views import comments_paginator, detail_etag, home_etag
+
+NEWS_ORDERING = ("-date", "-id")
+
+
+def dumps(data):
+    return json.dumps(
+        data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def page_body(name, items, cursor):
+    """Собирает страницу из готовых фрагментов JSON и курсора."""
+    return "".join(
+        ('{"', name, '":[', ",".join(items), '],"next":', dumps(cursor), "}")
+    ).encode()
+
+
+def news_data(news):
+    return {
+        "id": news.pk,
+        "title": news.title,
+        "text": news.text,
+        "date": news.date,
+        "comment_count": news.comment_count,
+        "url": reverse("news:detail", args=(news.pk,)),
+        "comments": reverse("news:api_comments", args=(news.pk,)),
+    }
+
+
+def comment_data(comment):
+    return {
+        "id": comment.pk,
+        "author": comment.author.username,
+        "text": comment.text,
+        "created": comment.created,
+    }
+
+
+def item_key(news_id, version):
+    return f"news:api:item:{news_id}:{version}"
+
+
+def serialized_news(news_ids):
+    """
+    JSON новостей в порядке news_ids.
+
+    Фрагменты читаются из кеша одним обращением; из базы одним
+    запросом загружаются только новости, версия которых изменилась.
+    Новость, удалённая между запросами, пропускается.
+    """
+    cache = get_cache()
+    versions = get_versions(news_ids)
+    keys = {
+        news_id: item_key(news_id, versions[news_id]) for news_id in news_ids
+    }
+    items = cache.get_many(keys.values())
+    missing = [news_id for news_id in news_ids if keys[news_id] not in items]
+    if missing:
+        fresh = {
+            keys[news.pk]: dumps(news_data(news))
+            for news in News.objects.with_comment_count().filter(
+                pk__in=missing
+            )
+        }
+        cache.set_many(fresh, settings.NEWS_CARD_CACHE_TIMEOUT)
+        items.update(fresh)
+    return [
+        items[keys[news_id]] for news_id in news_ids if keys[news_id] in items
+    ]
+
+
+def json_feed(version_func):
+    """
+    Ответ JSON с ETag по версии данных и телом из кеша.
+
+    version_func(request, *args, **kwargs) возвращает версию без
+    обращения к базе, как etag_func у anonymous_page_cache.
+    Представление возвращает тело ответа в байтах и вызывается,
+    только если готового тела для этой версии, адреса и сжатия
+    в кеше нет.
+    """
+    def decorator(view):
+        @wraps(view)
+        @require_safe
+        def wrapper(request, *args, **kwargs):
+            gzip = re_accepts_gzip.search(
+                request.META.get("HTTP_ACCEPT_ENCODING", "")
+            )
+            version = version_func(request, *args, **kwargs)
+            # У сжатого и несжатого тела разные ETag, как того требует
+            # RFC 9110 для разных представлений.
+            etag = quote_etag(f"{version}-gzip" if gzip else str(version))
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                key = page_cache_key(request, etag)
+                body = get_cache().get(key)
+                if body is None:
+                    body = view(request, *args, **kwargs)
+                    if gzip:
+                        body = compress_string(body)
+                    get_cache().set(
+                        key, body, settings.NEWS_PAGE_CACHE_TIMEOUT
+                    )
+                response = HttpResponse(
+                    body, content_type="application/json"
+                )
+                if gzip:
+                    response["Content-Encoding"] = "gzip"
+            response["ETag"] = etag
+            patch_vary_headers(response, ("Accept-Encoding",))
+            return response
+        return wrapper
+    return decorator
+
+
+@json_feed(home_etag)
+def news_feed(request):
+    """Лента новостей от свежих к старым."""
+    # Страница выбирается только по индексу news_date_id_idx,
+    # сами новости берутся из кеша фрагментов.
+    paginator = KeysetPaginator(
+        News.objects.only("id", "date"),
+        NEWS_ORDERING,
+        settings.NEWS_API_COUNT_ON_PAGE,
+    )
+    news, cursor = paginator.get_page(request.GET.get("cursor"))
+    return page_body(
+        "news", serialized_news([item.pk for item in news]), cursor
+    )
+
+
+@json_feed(detail_etag)
+def comments_feed(request, pk):
+    """Комментарии к новости в порядке публикации."""
+    news = get_object_or_404(News.objects.only("id"), pk=pk)
+    comments, cursor = comments_paginator(news.comment_set).get_page(
+        request.GET.get("cursor")
+    )
+    items = [dumps(comment_data(comment)) for comment in comments]
+    return page_body("comments", items, cursor)
@@ -0,0 +1,107 @@
+"""
+Перенос старых новостей и их комментариев в архивные таблицы.
+
+Каждая пачка переносится в своих коротких транзакциях: SQLite
+держит блокировку записи только на время одной пачки, и между
+пачками успевают пройти запросы пользователей. Размер пачки
+ограничен и для новостей, и для комментариев: у популярной новости
+комментариев могут быть десятки тысяч.
+
+Сначала новости пачки копируются в архив, затем их комментарии
+переносятся пачками по id, и в конце новости удаляются из ленты.
+Пока комментарии переносятся, новость остаётся в ленте. Если перенос
+прервался, следующий запуск продолжит его с того же места.
+"""
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ArchivedNews, News
+
+COMMENT_COLUMNS = "id, news_id, author_id, text, created"
+# Самые старые комментарии новости до batch_size штук. Индекс внешнего
+# ключа news_id упорядочен по id, поэтому запрос не сортирует
+# все комментарии новости.
+LAST_COMMENT_ID_SQL = """
+    SELECT MAX(id) FROM (
+        SELECT id FROM news_comment WHERE news_id = %s
+        ORDER BY id LIMIT %s
+    )
+"""
+MOVE_COMMENTS_SQL = f"""
+    INSERT INTO news_archivedcomment ({COMMENT_COLUMNS})
+    SELECT {COMMENT_COLUMNS} FROM news_comment
+    WHERE news_id = %s AND id <= %s
+"""
+DELETE_COMMENTS_SQL = """
+    DELETE FROM news_comment WHERE news_id = %s AND id <= %s
+"""
+
+
+def archive_horizon(days):
+    """Новости с датой раньше возвращённой попадают в архив."""
+    return timezone.localdate() - timedelta(days=days)
+
+
+def move_comments(cursor, news_id, last_id):
+    """Переносит комментарии новости с id не больше last_id."""
+    cursor.execute(MOVE_COMMENTS_SQL, [news_id, last_id])
+    cursor.execute(DELETE_COMMENTS_SQL, [news_id, last_id])
+    return cursor.rowcount
+
+
+def archive_comments(news_id, batch_size):
+    """
+    Переносит комментарии новости пачками по batch_size.
+
+    Строки не загружаются в память и удаляются без сигналов:
+    кеш страниц новости сбрасывается один раз, при удалении самой
+    новости. Возвращает число перенесённых комментариев.
+    """
+    moved = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(LAST_COMMENT_ID_SQL, [news_id, batch_size])
+            last_id = cursor.fetchone()[0]
+            if last_id is None:
+                return moved
+            moved += move_comments(cursor, news_id, last_id)
+
+
+def archive_batch(before, batch_size, comments_batch_size):
+    """
+    Переносит в архив до batch_size самых старых новостей.
+
+    Комментарии переносятся пачками по comments_batch_size.
+    Возвращает число перенесённых новостей и комментариев.
+    """
+    news = list(
+        News.objects.filter(date__lt=before).order_by("date", "id")[
+            :batch_size
+        ]
+    )
+    if not news:
+        return 0, 0
+    # Новости, скопированные прерванным запуском, уже есть в архиве.
+    ArchivedNews.objects.bulk_create(
+        (
+            ArchivedNews(
+                id=item.id, title=item.title, text=item.text, date=item.date
+            )
+            for item in news
+        ),
+        ignore_conflicts=True,
+    )
+    comments = sum(
+        archive_comments(item.pk, comments_batch_size) for item in news
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Комментарии, оставленные за время переноса, уходят в архив
+        # в одной транзакции с удалением новостей.
+        for item in news:
+            comments += move_comments(cursor, item.pk, 2**63 - 1)
+        # Удаление через ORM отправляет post_delete по разу на новость,
+        # и кеш страниц новости сбрасывается.
+        News.objects.filter(pk__in=[item.pk for item in news]).delete()
+    return len(news), comments
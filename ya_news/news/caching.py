@@ -0,0 +1,190 @@
+"""
+Версии новостей для кеширования отрисованных страниц и фрагментов.
+
+Версия новости меняется при любом изменении новости или её
+комментариев (см. signals.py), поэтому фрагмент, закешированный
+с прежней версией, больше не используется. Вместе с ней меняется
+версия списка новостей для главной страницы.
+
+Версии хранятся в кеше NEWS_VERSION_CACHE, общем для всех процессов
+сайта, а отрисованные фрагменты и страницы — в NEWS_CARD_CACHE,
+который может быть своим у каждого процесса: устаревший фрагмент
+там просто не найдётся по новой версии.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe, quote_etag
+
+LIST_VERSION = "list"
+
+
+def get_cache():
+    return caches[settings.NEWS_CARD_CACHE]
+
+
+def get_version_cache():
+    return caches[settings.NEWS_VERSION_CACHE]
+
+
+def version_key(news_id):
+    return f"news:version:{news_id}"
+
+
+def get_versions(news_ids):
+    """
+    Версии новостей по их id, известные читаются одним обращением к кешу.
+
+    Для новостей без версии создаётся новая по времени. Она
+    записывается через add и перечитывается: если другой процесс
+    успел записать свою версию, остаётся его версия.
+    """
+    cache = get_version_cache()
+    keys = {version_key(news_id): news_id for news_id in news_ids}
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        version = time.time_ns()
+        for key in missing:
+            cache.add(key, version, timeout=None)
+        versions.update(cache.get_many(missing))
+        # Ключ мог быть сразу вытеснен из кеша.
+        for key in missing:
+            versions.setdefault(key, version)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+# Кеш версий файловый: в асинхронном коде он читается в потоке,
+# чтобы не занимать цикл событий.
+aget_versions = sync_to_async(get_versions)
+
+
+def bump_version(news_id):
+    version = time.time_ns()
+    get_version_cache().set_many(
+        {version_key(news_id): version, version_key(LIST_VERSION): version},
+        timeout=None,
+    )
+
+
+def bump_list_version():
+    """Новая версия только для списка, например после массовой вставки."""
+    get_version_cache().set(
+        version_key(LIST_VERSION), time.time_ns(), timeout=None
+    )
+
+
+def page_cache_key(request, etag):
+    path_hash = hashlib.md5(
+        request.get_full_path().encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"news:page:{path_hash}:{etag}"
+
+
+def mark_page(etag, response):
+    """
+    Выставляет ETag и Vary страницы.
+
+    Возвращает, можно ли положить её в кеш: ответ без cookie.
+    """
+    response["ETag"] = etag
+    patch_vary_headers(response, ("Cookie",))
+    return response.status_code == 200 and not response.cookies
+
+
+def store_page(key, etag, response):
+    if mark_page(etag, response):
+        get_cache().set(key, response, settings.NEWS_PAGE_CACHE_TIMEOUT)
+
+
+async def astore_page(key, etag, response):
+    if mark_page(etag, response):
+        await get_cache().aset(
+            key, response, settings.NEWS_PAGE_CACHE_TIMEOUT
+        )
+
+
+def conditional_page(request, etag, response):
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=parse_http_date_safe(response.get("Last-Modified")),
+        response=response,
+    )
+
+
+def anonymous_page_cache(etag_func):
+    """
+    Кеширует страницу целиком для анонимных пользователей.
+
+    etag_func(request, *args, **kwargs) возвращает версию страницы
+    без обращения к базе. Если клиент прислал тот же ETag
+    в If-None-Match, сразу отдаётся 304; иначе страница берётся
+    из кеша или рендерится и сохраняется вместе с Last-Modified,
+    который выставило представление. Для авторизованных пользователей
+    и запросов кроме GET/HEAD представление вызывается как есть.
+    Асинхронное представление получает асинхронную обёртку.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            return async_page_cache(view, etag_func)
+        return sync_page_cache(view, etag_func)
+    return decorator
+
+
+def sync_page_cache(view, etag_func):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ("GET", "HEAD")
+            or request.user.is_authenticated
+        ):
+            return view(request, *args, **kwargs)
+        etag = quote_etag(str(etag_func(request, *args, **kwargs)))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        key = page_cache_key(request, etag)
+        response = get_cache().get(key)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+            store_page(key, etag, response)
+        return conditional_page(request, etag, response)
+    return wrapper
+
+
+def async_page_cache(view, etag_func):
+    """
+    Асинхронный вариант: кеш и etag_func, который читает кеш версий,
+    вызываются вне цикла событий.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ("GET", "HEAD")
+            or (await request.auser()).is_authenticated
+        ):
+            return await view(request, *args, **kwargs)
+        version = await sync_to_async(etag_func)(request, *args, **kwargs)
+        etag = quote_etag(str(version))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        key = page_cache_key(request, etag)
+        response = await get_cache().aget(key)
+        if response is None:
+            response = await view(request, *args, **kwargs)
+            if hasattr(response, "render"):
+                # Контекстные процессоры шаблона могут обращаться
+                # к базе, а это синхронный код.
+                await sync_to_async(response.render)()
+            await astore_page(key, etag, response)
+        return conditional_page(request, etag, response)
+    return wrapper
@@ -0,0 +1,202 @@
+"""
+Потоковый импорт новостей из JSON и NDJSON.
+
+Файл читается кусками и разбирается по одному объекту, поэтому
+память не зависит от размера ленты. Новости пишутся пачками через
+bulk_create, каждая пачка в своей транзакции. Смещение в файле после
+последней записанной пачки сохраняется, чтобы после сбоя продолжить
+импорт с того же места.
+"""
+import codecs
+import json
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import reset_queries, transaction
+
+from . import caching
+from .models import News
+
+CHUNK_SIZE = 64 * 1024
+# Между объектами допускаются пробелы, запятые и скобки массива:
+# так одинаково читаются массив JSON, NDJSON и формат фикстур Django.
+SEPARATORS = " \t\r\n,[]"
+# Оборванные на границе куска литерал, число или \uXXXX дают ошибку
+# разбора не дальше этого числа символов от конца буфера.
+TRUNCATION_MARGIN = 64
+# Больше стольких символов одна запись занимать не может: иначе
+# строка без закрывающей кавычки дочитывала бы в память весь файл.
+MAX_RECORD_SIZE = 4 * 1024 * 1024
+
+
+class FeedError(Exception):
+    """Ошибка в данных импортируемого файла."""
+
+
+class JsonStream:
+    """
+    Читает объекты верхнего уровня из бинарного файла по одному.
+
+    tell() возвращает смещение в байтах сразу за последним прочитанным
+    объектом, с него можно продолжить чтение в новом JsonStream.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.position = 0
+        self.offset = file.tell()
+        self.eof = False
+
+    def tell(self):
+        return self.offset + len(
+            self.buffer[:self.position].encode("utf-8")
+        )
+
+    def read_more(self):
+        self.offset = self.tell()
+        chunk = self.file.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position:] + self.text_decoder.decode(
+            chunk, final=self.eof
+        )
+        self.position = 0
+
+    def skip_separators(self):
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position] in SEPARATORS
+            ):
+                self.position += 1
+            if self.position < len(self.buffer) or self.eof:
+                return
+            self.read_more()
+
+    def may_be_truncated(self, error):
+        """
+        Могла ли ошибка возникнуть оттого, что запись ещё не дочитана.
+
+        Ошибка в середине буфера означает, что запись некорректна,
+        и остаток файла читать незачем. Незакрытая строка сообщается
+        с позиции её начала, поэтому дочитывается, пока запись
+        не превысит MAX_RECORD_SIZE.
+        """
+        if len(self.buffer) - self.position > MAX_RECORD_SIZE:
+            return False
+        return (
+            error.msg.startswith("Unterminated string")
+            or len(self.buffer) - error.pos <= TRUNCATION_MARGIN
+        )
+
+    def __iter__(self):
+        while True:
+            self.skip_separators()
+            if self.position == len(self.buffer):
+                return
+            try:
+                record, end = self.decoder.raw_decode(
+                    self.buffer, self.position
+                )
+            except json.JSONDecodeError as error:
+                if self.eof or not self.may_be_truncated(error):
+                    raise FeedError(
+                        f"Некорректный JSON на позиции {self.tell()}: "
+                        f"{error.msg}."
+                    )
+                self.read_more()
+                continue
+            if end == len(self.buffer) and not self.eof:
+                # Число или строка могли оборваться на границе куска.
+                self.read_more()
+                continue
+            self.position = end
+            yield record
+
+
+def build_news(record):
+    """Создаёт несохранённую новость из записи файла."""
+    if not isinstance(record, dict):
+        raise FeedError(f"Ожидался объект, получено: {record!r}.")
+    if "fields" in record:
+        if record.get("model", "news.news") != "news.news":
+            raise FeedError(f"Неизвестная модель: {record['model']}.")
+        record = record["fields"]
+    values = {}
+    for name in ("title", "text", "date"):
+        field = News._meta.get_field(name)
+        if name not in record:
+            raise FeedError(f"В записи нет поля {name}: {record!r}.")
+        try:
+            values[name] = field.clean(record[name], None)
+        except ValidationError as error:
+            raise FeedError(f"Поле {name}: {' '.join(error.messages)}")
+    return News(**values)
+
+
+class NewsImporter:
+    """
+    Записывает новости пачками по batch_size без дубликатов.
+
+    Дубликатом считается новость с теми же заголовком и датой,
+    что уже есть в базе или встретилась раньше в той же пачке.
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.read = 0
+        self.created = 0
+        self.duplicates = 0
+        self.started = time.perf_counter()
+
+    @property
+    def rows_per_second(self):
+        return self.read / max(time.perf_counter() - self.started, 1e-9)
+
+    def run(self, stream, on_batch=None):
+        """
+        Импортирует все записи потока.
+
+        После фиксации каждой пачки вызывается on_batch(offset),
+        где offset — позиция в файле для продолжения импорта.
+        """
+        batch = []
+        for record in stream:
+            batch.append(build_news(record))
+            if len(batch) == self.batch_size:
+                self.save_batch(batch)
+                batch = []
+                if on_batch:
+                    on_batch(stream.tell())
+        if batch:
+            self.save_batch(batch)
+        if on_batch:
+            on_batch(stream.tell())
+
+    def save_batch(self, batch):
+        unique = {}
+        for news in batch:
+            unique.setdefault((news.title, news.date), news)
+        with transaction.atomic():
+            existing = set(
+                News.objects.filter(
+                    title__in={title for title, _ in unique},
+                    date__in={date for _, date in unique},
+                ).values_list("title", "date")
+            )
+            new = [
+                news for key, news in unique.items() if key not in existing
+            ]
+            News.objects.bulk_create(new)
+            if new:
+                # bulk_create не отправляет сигналов post_save.
+                transaction.on_commit(caching.bump_list_version)
+        # При DEBUG=True Django хранит текст всех запросов, а запросы
+        # bulk_create с длинными текстами занимают много памяти.
+        reset_queries()
+        self.read += len(batch)
+        self.created += len(new)
+        self.duplicates += len(batch) - len(new)
@@ -0,0 +1,67 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from news.archiving import archive_batch, archive_horizon
+
+
+class Command(BaseCommand):
+    help = (
+        "Переносит новости старше заданного числа дней вместе "
+        "с комментариями в архив пачками в отдельных транзакциях."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.NEWS_ARCHIVE_AFTER_DAYS,
+            help="Архивировать новости старше этого числа дней.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.NEWS_ARCHIVE_BATCH_SIZE,
+            help="Сколько новостей переносить в одной пачке.",
+        )
+        parser.add_argument(
+            "--comments-batch-size",
+            type=int,
+            default=settings.NEWS_ARCHIVE_COMMENTS_BATCH_SIZE,
+            help="Сколько комментариев переносить в одной транзакции.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Пауза между пачками в секундах для других писателей.",
+        )
+
+    def handle(
+        self, days, batch_size, comments_batch_size, pause, **options
+    ):
+        if batch_size < 1 or comments_batch_size < 1:
+            raise CommandError("Размер пачки должен быть положительным.")
+        before = archive_horizon(days)
+        total_news = total_comments = 0
+        while True:
+            news, comments = archive_batch(
+                before, batch_size, comments_batch_size
+            )
+            if not news:
+                break
+            total_news += news
+            total_comments += comments
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"Перенесено новостей: {total_news}, "
+                    f"комментариев: {total_comments}."
+                )
+            if news < batch_size:
+                break
+            time.sleep(pause)
+        self.stdout.write(self.style.SUCCESS(
+            f"В архив перенесено новостей: {total_news}, "
+            f"комментариев: {total_comments} (с датой до {before})."
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from yanews.templating import compile_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Компилирует все шаблоны проекта и завершается с ошибкой, "
+        "если хотя бы один из них не компилируется."
+    )
+
+    def handle(self, *args, **options):
+        compiled, errors = compile_templates()
+        for name, error in errors.items():
+            self.stderr.write(f"{name}: {error}")
+        if errors:
+            raise CommandError(
+                f"Не удалось скомпилировать шаблонов: {len(errors)}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Скомпилировано шаблонов: {len(compiled)}.")
+        )
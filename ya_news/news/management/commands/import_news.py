@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from news.importing import FeedError, JsonStream, NewsImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Импортирует новости из файла JSON или NDJSON. Новости с уже "
+        "существующими заголовком и датой пропускаются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.NEWS_IMPORT_BATCH_SIZE,
+            help="Сколько новостей записывать в одной транзакции.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Продолжить с места, где остановился прошлый запуск.",
+        )
+        parser.add_argument(
+            "--state",
+            type=Path,
+            help="Файл с позицией импорта, по умолчанию <path>.progress.",
+        )
+
+    def handle(self, path, batch_size, resume, state, **options):
+        if batch_size < 1:
+            raise CommandError("Размер пачки должен быть положительным.")
+        state = state or path.with_name(f"{path.name}.progress")
+        offset = 0
+        if resume and state.exists():
+            offset = json.loads(state.read_text())["offset"]
+            self.stdout.write(f"Продолжение импорта с позиции {offset}.")
+
+        def save_offset(position):
+            state.write_text(json.dumps({"offset": position}))
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"Записано новостей: {importer.created}, "
+                    f"позиция {position}."
+                )
+
+        importer = NewsImporter(batch_size)
+        try:
+            with path.open("rb") as file:
+                file.seek(offset)
+                importer.run(JsonStream(file), on_batch=save_offset)
+        except (OSError, DatabaseError, FeedError) as error:
+            raise CommandError(
+                f"{error} Добавлено новостей: {importer.created}. "
+                f"Для продолжения запустите команду с --resume."
+            )
+        state.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"Прочитано записей: {importer.read}, "
+            f"добавлено: {importer.created}, "
+            f"дубликатов: {importer.duplicates}, "
+            f"{importer.rows_per_second:.0f} записей/с."
+        ))
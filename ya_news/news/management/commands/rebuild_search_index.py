@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from news.search import INDEXES, optimize, reindex_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Заново строит полнотекстовые индексы новостей и комментариев "
+        "пачками в отдельных транзакциях, не останавливая сайт."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--index",
+            choices=INDEXES,
+            action="append",
+            help="Какой индекс строить, по умолчанию все.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.NEWS_SEARCH_INDEX_BATCH_SIZE,
+            help="Сколько строк индексировать в одной транзакции.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Пауза между пачками в секундах для других писателей.",
+        )
+
+    def handle(self, index, batch_size, pause, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Полнотекстовый индекс есть только в SQLite.")
+        if batch_size < 1:
+            raise CommandError("Размер пачки должен быть положительным.")
+        for name in index or INDEXES:
+            started = time.perf_counter()
+            after = 0
+            batches = 0
+            while True:
+                last = reindex_batch(name, after, batch_size)
+                if last is None:
+                    break
+                after = last
+                batches += 1
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        f"{name}: проиндексировано до id {after}."
+                    )
+                time.sleep(pause)
+            optimize(name)
+            self.stdout.write(self.style.SUCCESS(
+                f"Индекс {name} построен: пачек {batches}, "
+                f"{time.perf_counter() - started:.1f} с."
+            ))
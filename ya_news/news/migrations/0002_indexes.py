@@ -0,0 +1,40 @@
+# Generated by Django 5.1.1 on 2026-10-17 10:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="comment",
+            options={"ordering": ("created", "id")},
+        ),
+        migrations.AlterModelOptions(
+            name="news",
+            options={
+                "ordering": ("-date", "-id"),
+                "verbose_name": "Новость",
+                "verbose_name_plural": "Новости",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["news", "created", "id"],
+                name="comment_news_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="news",
+            index=models.Index(
+                fields=["-date", "-id"], name="news_date_id_idx"
+            ),
+        ),
+    ]
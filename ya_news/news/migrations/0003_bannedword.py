@@ -0,0 +1,50 @@
+# Generated by Django 5.1.1 on 2026-10-17 10:44
+
+from django.db import migrations, models
+
+INITIAL_BAD_WORDS = ("редиска", "негодяй")
+
+
+def add_initial_bad_words(apps, schema_editor):
+    BannedWord = apps.get_model("news", "BannedWord")
+    BannedWord.objects.bulk_create(
+        BannedWord(word=word) for word in INITIAL_BAD_WORDS
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0002_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BannedWord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "word",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="Слово"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Запрещённое слово",
+                "verbose_name_plural": "Запрещённые слова",
+                "ordering": ("word",),
+            },
+        ),
+        migrations.RunPython(
+            add_initial_bad_words, migrations.RunPython.noop
+        ),
+    ]
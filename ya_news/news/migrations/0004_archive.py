@@ -0,0 +1,73 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0003_bannedword"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedNews",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=50)),
+                ("text", models.TextField()),
+                ("date", models.DateField()),
+                ("archived", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Архивная новость",
+                "verbose_name_plural": "Архивные новости",
+                "ordering": ("-date", "-id"),
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedComment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("text", models.TextField()),
+                ("created", models.DateTimeField()),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "news",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comments",
+                        to="news.archivednews",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("created", "id"),
+            },
+        ),
+    ]
@@ -0,0 +1,101 @@
+"""
+Полнотекстовые индексы FTS5 по новостям и комментариям.
+
+Индексы хранят свою копию текста, а не ссылаются на таблицы новостей
+и комментариев: тогда удаление записи из индекса по rowid безопасно,
+даже если её там нет, и команда rebuild_search_index может
+переиндексировать таблицу пачками, пока сайт работает. Триггеры
+поддерживают индексы при вставке, изменении и удалении.
+
+Индексы создаются только в SQLite, существующие строки в них
+добавляет миграция 0007_fill_search_index. SQLite меняет столбцы, пересоздавая таблицу,
+и триггеры при этом пропадают: миграция, которая пересоздаёт
+news_news или news_comment, должна создать их заново.
+"""
+from django.db import migrations
+
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE news_news_fts USING fts5(
+        title, text,
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE news_comment_fts USING fts5(
+        text, news_id UNINDEXED,
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER news_news_fts_insert AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_news_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER news_news_fts_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        DELETE FROM news_news_fts WHERE rowid = old.id;
+        INSERT INTO news_news_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER news_news_fts_delete AFTER DELETE ON news_news BEGIN
+        DELETE FROM news_news_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER news_comment_fts_insert
+    AFTER INSERT ON news_comment BEGIN
+        INSERT INTO news_comment_fts (rowid, text, news_id)
+        VALUES (new.id, new.text, new.news_id);
+    END
+    """,
+    """
+    CREATE TRIGGER news_comment_fts_update
+    AFTER UPDATE OF text, news_id ON news_comment BEGIN
+        DELETE FROM news_comment_fts WHERE rowid = old.id;
+        INSERT INTO news_comment_fts (rowid, text, news_id)
+        VALUES (new.id, new.text, new.news_id);
+    END
+    """,
+    """
+    CREATE TRIGGER news_comment_fts_delete
+    AFTER DELETE ON news_comment BEGIN
+        DELETE FROM news_comment_fts WHERE rowid = old.id;
+    END
+    """,
+)
+
+DROP_SQL = (
+    "DROP TRIGGER IF EXISTS news_news_fts_insert",
+    "DROP TRIGGER IF EXISTS news_news_fts_update",
+    "DROP TRIGGER IF EXISTS news_news_fts_delete",
+    "DROP TRIGGER IF EXISTS news_comment_fts_insert",
+    "DROP TRIGGER IF EXISTS news_comment_fts_update",
+    "DROP TRIGGER IF EXISTS news_comment_fts_delete",
+    "DROP TABLE IF EXISTS news_news_fts",
+    "DROP TABLE IF EXISTS news_comment_fts",
+)
+
+
+def run_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0004_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-17 12:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0005_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="archivedcomment",
+            index=models.Index(
+                fields=["news", "created", "id"],
+                name="archivedcomment_created_idx",
+            ),
+        ),
+    ]
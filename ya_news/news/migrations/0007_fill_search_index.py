@@ -0,0 +1,43 @@
+"""
+Заполнение полнотекстовых индексов существующими строками.
+
+Миграция 0005 создаёт пустые индексы, а триггеры добавляют в них
+только новые и изменённые строки, поэтому без заполнения поиск
+не находил старые новости. Строки, уже попавшие в индекс через
+триггеры, пропускаются, так что миграцию можно применить и к базе,
+где 0005 применена давно. Заполнение идёт одной транзакцией миграции;
+переиндексировать большую базу без остановки сайта можно командой
+rebuild_search_index.
+"""
+from django.db import migrations
+
+FILL_SQL = (
+    """
+    INSERT INTO news_news_fts (rowid, title, text)
+    SELECT id, title, text FROM news_news
+    WHERE id NOT IN (SELECT rowid FROM news_news_fts)
+    """,
+    """
+    INSERT INTO news_comment_fts (rowid, text, news_id)
+    SELECT id, text, news_id FROM news_comment
+    WHERE id NOT IN (SELECT rowid FROM news_comment_fts)
+    """,
+)
+
+
+def fill_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in FILL_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0006_archivedcomment_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_index, migrations.RunPython.noop),
+    ]
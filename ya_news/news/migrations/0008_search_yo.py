@@ -0,0 +1,102 @@
+"""
+Буква «ё» в полнотекстовых индексах заменяется на «е».
+
+Токенизатор unicode61 не сводит «ё» к «е» даже с remove_diacritics,
+и запрос «ежик» не находил «Ёжик в тумане». Триггеры из 0005_search
+пересоздаются так, чтобы записывать в индекс текст с «е», а индексы
+строятся заново из таблиц. Запрос приводится к тому же виду
+в news.search.match_expression.
+"""
+from django.db import migrations
+
+NEWS_COLUMNS = ("title", "text")
+COMMENT_COLUMNS = ("text", "news_id")
+# Столбцы с текстом; news_id остаётся числом.
+TEXT_COLUMNS = ("title", "text")
+
+
+def fold_yo(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def plain(column):
+    return column
+
+
+def values(prefix, columns, fold):
+    return ", ".join(
+        fold(f"{prefix}{column}") if column in TEXT_COLUMNS
+        else f"{prefix}{column}"
+        for column in columns
+    )
+
+
+def index_sql(fold):
+    """Триггеры и заполнение индексов, fold обрабатывает текст."""
+    return (
+        "DROP TRIGGER IF EXISTS news_news_fts_insert",
+        "DROP TRIGGER IF EXISTS news_news_fts_update",
+        "DROP TRIGGER IF EXISTS news_comment_fts_insert",
+        "DROP TRIGGER IF EXISTS news_comment_fts_update",
+        f"""
+        CREATE TRIGGER news_news_fts_insert AFTER INSERT ON news_news BEGIN
+            INSERT INTO news_news_fts (rowid, title, text)
+            VALUES (new.id, {values("new.", NEWS_COLUMNS, fold)});
+        END
+        """,
+        f"""
+        CREATE TRIGGER news_news_fts_update
+        AFTER UPDATE OF title, text ON news_news BEGIN
+            DELETE FROM news_news_fts WHERE rowid = old.id;
+            INSERT INTO news_news_fts (rowid, title, text)
+            VALUES (new.id, {values("new.", NEWS_COLUMNS, fold)});
+        END
+        """,
+        f"""
+        CREATE TRIGGER news_comment_fts_insert
+        AFTER INSERT ON news_comment BEGIN
+            INSERT INTO news_comment_fts (rowid, text, news_id)
+            VALUES (new.id, {values("new.", COMMENT_COLUMNS, fold)});
+        END
+        """,
+        f"""
+        CREATE TRIGGER news_comment_fts_update
+        AFTER UPDATE OF text, news_id ON news_comment BEGIN
+            DELETE FROM news_comment_fts WHERE rowid = old.id;
+            INSERT INTO news_comment_fts (rowid, text, news_id)
+            VALUES (new.id, {values("new.", COMMENT_COLUMNS, fold)});
+        END
+        """,
+        "DELETE FROM news_news_fts",
+        f"""
+        INSERT INTO news_news_fts (rowid, title, text)
+        SELECT id, {values("", NEWS_COLUMNS, fold)} FROM news_news
+        """,
+        "DELETE FROM news_comment_fts",
+        f"""
+        INSERT INTO news_comment_fts (rowid, text, news_id)
+        SELECT id, {values("", COMMENT_COLUMNS, fold)} FROM news_comment
+        """,
+    )
+
+
+def run_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0007_fill_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sqlite(index_sql(fold_yo)), run_sqlite(index_sql(plain))
+        ),
+    ]
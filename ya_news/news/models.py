@@ -2,6 +2,22 @@ from datetime import datetime
 
 from django.conf import settings
 from django.db import models
+from django.urls import reverse
+
+
+class NewsQuerySet(models.QuerySet):
+
+    def with_comment_count(self):
+        """
+        Добавляет к новостям количество комментариев.
+
+        Комментарии считаются в том же запросе и не загружаются в память.
+        """
+        return self.annotate(comment_count=models.Count("comment"))
+
+    def with_last_comment(self):
+        """Добавляет к новостям время последнего комментария."""
+        return self.annotate(last_comment=models.Max("comment__created"))
 
 
 class News(models.Model):
@@ -9,8 +25,13 @@ class News(models.Model):
     text = models.TextField()
     date = models.DateField(default=datetime.today)
 
+    objects = NewsQuerySet.as_manager()
+
     class Meta:
-        ordering = ("-date",)
+        ordering = ("-date", "-id")
+        indexes = (
+            models.Index(fields=("-date", "-id"), name="news_date_id_idx"),
+        )
         verbose_name_plural = "Новости"
         verbose_name = "Новость"
 
@@ -28,7 +49,74 @@ class Comment(models.Model):
     created = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ("created",)
+        ordering = ("created", "id")
+        indexes = (
+            models.Index(
+                fields=("news", "created", "id"),
+                name="comment_news_created_idx",
+            ),
+        )
+
+    def __str__(self):
+        return self.text[:50]
+
+
+class BannedWord(models.Model):
+    word = models.CharField("Слово", max_length=100, unique=True)
+
+    class Meta:
+        ordering = ("word",)
+        verbose_name_plural = "Запрещённые слова"
+        verbose_name = "Запрещённое слово"
+
+    def __str__(self):
+        return self.word
+
+
+class ArchivedNews(models.Model):
+    """
+    Новость, перенесённая из News командой archive_news.
+
+    id совпадает с id исходной новости, поэтому старые адреса
+    можно перенаправить в архив.
+    """
+
+    title = models.CharField(max_length=50)
+    text = models.TextField()
+    date = models.DateField()
+    archived = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("-date", "-id")
+        verbose_name_plural = "Архивные новости"
+        verbose_name = "Архивная новость"
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse("news:archive", kwargs={"pk": self.pk})
+
+
+class ArchivedComment(models.Model):
+    news = models.ForeignKey(
+        ArchivedNews, on_delete=models.CASCADE, related_name="comments"
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    text = models.TextField()
+    created = models.DateTimeField()
+
+    class Meta:
+        ordering = ("created", "id")
+        indexes = (
+            models.Index(
+                fields=("news", "created", "id"),
+                name="archivedcomment_created_idx",
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
@@ -0,0 +1,151 @@
+"""Поиск запрещённых слов в комментариях."""
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import BannedWord
+
+VERSION_CACHE_KEY = "news:banned-words-version"
+
+
+def normalize(text):
+    """
+    Приводит текст к виду для сравнения без учёта регистра.
+
+    casefold() корректно сворачивает регистр кириллицы,
+    а «ё» заменяется на «е», чтобы не обходить фильтр написанием.
+    """
+    return text.casefold().replace("ё", "е")
+
+
+class BadWordsMatcher:
+    """
+    Ищет в тексте любое слово из списка за один проход.
+
+    Слова собираются в префиксное дерево, которое компилируется
+    в одно регулярное выражение: общий префикс проверяется один раз,
+    поэтому время поиска почти не растёт с числом слов.
+    При whole_words=True слово должно стоять отдельно, иначе
+    (как и раньше) достаточно вхождения подстроки.
+    """
+
+    def __init__(self, words, whole_words=False):
+        self.whole_words = whole_words
+        self.words = frozenset(
+            normalize(word) for word in words if word.strip()
+        )
+        self.pattern = self._compile()
+
+    def search(self, text):
+        """Возвращает первое найденное запрещённое слово или None."""
+        if self.pattern is None:
+            return None
+        match = self.pattern.search(normalize(text))
+        return match.group() if match else None
+
+    def _compile(self):
+        if not self.words:
+            return None
+        trie = {}
+        for word in self.words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        pattern = self._trie_pattern(trie)
+        if self.whole_words:
+            pattern = rf"(?<!\w){pattern}(?!\w)"
+        return re.compile(pattern)
+
+    def _trie_pattern(self, node):
+        """
+        Регулярное выражение для поддерева префиксного дерева.
+
+        Ветви, состоящие из одного символа, объединяются в класс [...].
+        """
+        is_end = "" in node
+        if is_end and not self.whole_words:
+            # Для поиска подстроки достаточно самого короткого слова.
+            return ""
+        branches = []
+        chars = []
+        for char, child in sorted(node.items()):
+            if not char:
+                continue
+            tail = self._trie_pattern(child)
+            if tail:
+                branches.append(re.escape(char) + tail)
+            else:
+                chars.append(re.escape(char))
+        if chars:
+            branches.append(
+                chars[0] if len(chars) == 1 else f"[{''.join(chars)}]"
+            )
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        pattern = f"(?:{'|'.join(branches)})"
+        return pattern + "?" if is_end else pattern
+
+
+def get_cache():
+    return caches[settings.NEWS_VERSION_CACHE]
+
+
+def get_version():
+    """
+    Текущая версия словаря запрещённых слов.
+
+    Версия хранится в кеше NEWS_VERSION_CACHE, общем для всех
+    процессов сайта: в LocMemCache её изменение увидел бы только
+    процесс, сохранивший слово. Если ключ пропал, создаётся новая
+    версия по времени: она не совпадёт ни с одной загруженной ранее.
+    """
+    cache = get_cache()
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def bump_version():
+    """
+    Сообщает всем процессам, что словарь изменился.
+
+    Записывается новое значение, а не incr(): в файловом кеше incr —
+    это чтение и запись без блокировки, и два процесса могут записать
+    одно и то же число. Версия по времени от прежней не зависит.
+    """
+    get_cache().set(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+class BannedWordsCache:
+    """
+    Скомпилированный словарь запрещённых слов в памяти процесса.
+
+    На каждой проверке сравнивается только версия из кеша Django;
+    слова перечитываются из базы, лишь когда версия изменилась.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.matcher = None
+        self.lock = threading.Lock()
+
+    def get_matcher(self):
+        version = get_version()
+        if version != self.version:
+            with self.lock:
+                if version != self.version:
+                    words = BannedWord.objects.values_list("word", flat=True)
+                    self.matcher = BadWordsMatcher(words)
+                    self.version = version
+        return self.matcher
+
+
+banned_words = BannedWordsCache()
@@ -0,0 +1,97 @@
+"""
+Постраничный вывод по ключу (keyset pagination).
+
+Вместо OFFSET следующая страница выбирается условием «строго после
+последней записи предыдущей страницы» по упорядоченному набору полей,
+поэтому стоимость страницы не зависит от её номера.
+"""
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import BadRequest, ValidationError
+from django.db.models import Q
+
+
+class KeysetPaginator:
+    """
+    Делит queryset на страницы по набору полей ordering.
+
+    Поле с префиксом «-» сортируется по убыванию. Последним полем
+    должен идти первичный ключ, чтобы порядок был однозначным.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset.order_by(*ordering)
+        self.ordering = ordering
+        self.per_page = per_page
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip("-"))
+            for name in ordering
+        ]
+
+    def get_page(self, cursor=None):
+        """
+        Возвращает записи страницы и курсор следующей страницы.
+
+        Курсор равен None, если страница последняя.
+        """
+        return self._split(list(self.page_queryset(cursor)))
+
+    async def aget_page(self, cursor=None):
+        """Асинхронный вариант get_page."""
+        return self._split(
+            [item async for item in self.page_queryset(cursor)]
+        )
+
+    def _split(self, items):
+        if len(items) <= self.per_page:
+            return items, None
+        items = items[: self.per_page]
+        return items, self.encode(items[-1])
+
+    def page_queryset(self, cursor=None):
+        """
+        Запрос страницы после курсора.
+
+        Выбирается на одну запись больше, чтобы узнать о следующей странице.
+        """
+        queryset = self.queryset
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode(cursor)))
+        return queryset[: self.per_page + 1]
+
+    def encode(self, obj):
+        values = [
+            field.value_to_string(obj) for field in self.fields
+        ]
+        return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode(self, cursor):
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self.fields):
+                raise ValueError
+            return [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (
+            binascii.Error, TypeError, ValueError, ValidationError
+        ) as error:
+            raise BadRequest("Некорректный курсор.") from error
+
+    def _after(self, values):
+        """
+        Условие «после values» в порядке ordering.
+
+        Для полей (a, b) это a > x OR (a = x AND b > y).
+        """
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            step = Q(**{f"{name.lstrip('-')}__{lookup}": values[index]})
+            for previous, value in zip(self.ordering[:index], values):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+        return condition
@@ -1,58 +1,124 @@
+from copy import deepcopy
 from datetime import datetime, timedelta
 
 import pytest
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.urls import reverse
 from django.utils import timezone
 from django.test import Client
 
-from news.models import Comment, News
+from news.models import BannedWord, Comment, News
+from news.moderation import banned_words, bump_version
+from yanews.metrics import registry
+from yanews.testing import GoldenDatabase
 
 COMMENTS_COUNT = 3
+OLD_NEWS_COUNT = 2
+
+golden = GoldenDatabase()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Тестовая транзакция откатывается без сигналов об изменениях,
+    а id в базе переиспользуются, поэтому кеши очищаются перед тестом
+    """
+    for cache in caches.all():
+        cache.clear()
+
+
+def build_golden_data():
+    """
+    Строки, которые нужны большинству тестов: пользователи с открытыми
+    сессиями, отдельная новость и новости для главной. Отдельная
+    новость создаётся последней, чтобы на главной она шла первой
+    среди новостей за сегодня.
+    """
+    user_model = get_user_model()
+    author = user_model.objects.create(username="Автор")
+    reader = user_model.objects.create(username="Читатель")
+    sessions = {}
+    for user in (author, reader):
+        client = Client()
+        client.force_login(user)
+        sessions[user.pk] = client.cookies[settings.SESSION_COOKIE_NAME].value
+    all_news = News.objects.bulk_create(
+        News(
+            title=f"Новость {index}",
+            text="Текст",
+            date=datetime.today() - timedelta(days=index)
+        )
+        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
+    )
+    news = News.objects.create(title="Заголовок", text="Текст")
+    return {
+        "author": author,
+        "reader": reader,
+        "sessions": sessions,
+        "all_news": all_news,
+        "news": news,
+    }
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    """Эталонная база: общие строки создаются один раз за сессию."""
+    golden.build(build_golden_data, django_db_blocker)
+    yield
+    golden.close()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    yield
+    golden.restore_after(item)
 
 
 @pytest.fixture
-def author(django_user_model):
-    return django_user_model.objects.create(username="Автор")
+def golden_data(db):
+    return golden.data
 
 
 @pytest.fixture
-def reader(django_user_model):
-    return django_user_model.objects.create(username="Читатель")
+def author(golden_data):
+    return deepcopy(golden_data["author"])
 
 
 @pytest.fixture
-def auth_client(author):
+def reader(golden_data):
+    return deepcopy(golden_data["reader"])
+
+
+def logged_in_client(golden_data, user):
+    """Клиент с сессией, открытой при создании эталонной базы."""
     client = Client()
-    client.force_login(author)
+    client.cookies[settings.SESSION_COOKIE_NAME] = golden_data["sessions"][
+        user.pk
+    ]
     return client
 
 
 @pytest.fixture
-def reader_client(reader):
-    client = Client()
-    client.force_login(reader)
-    return client
+def auth_client(golden_data, author):
+    return logged_in_client(golden_data, author)
 
 
 @pytest.fixture
-def news():
-    return News.objects.create(
-        title='Заголовок',
-        text='Текст'
-    )
+def reader_client(golden_data, reader):
+    return logged_in_client(golden_data, reader)
 
 
 @pytest.fixture
-def all_news():
-    return News.objects.bulk_create(
-        News(
-            title=f"Новость {index}",
-            text="Текст",
-            date=datetime.today() - timedelta(days=index)
-        )
-        for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
-    )
+def news(golden_data):
+    return deepcopy(golden_data["news"])
+
+
+@pytest.fixture
+def all_news(golden_data):
+    return deepcopy(golden_data["all_news"])
 
 
 @pytest.fixture
@@ -90,6 +156,23 @@ def comments(author, news):
         comment.save()
 
 
+@pytest.fixture
+def old_news(author):
+    """Новости старше срока архивации, у каждой по комментарию."""
+    date = timezone.localdate() - timedelta(
+        days=settings.NEWS_ARCHIVE_AFTER_DAYS + 1
+    )
+    old_news = News.objects.bulk_create(
+        News(title=f"Старая новость {index}", text="Текст", date=date)
+        for index in range(OLD_NEWS_COUNT)
+    )
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text="Старый комментарий")
+        for news in old_news
+    )
+    return old_news
+
+
 @pytest.fixture
 def comment_form_data():
     return {"text": "Попытка редактирования"}
@@ -118,3 +201,40 @@ def url_logout():
 @pytest.fixture
 def url_signup():
     return reverse('users:signup')
+
+
+@pytest.fixture
+def search_url():
+    return reverse("news:search")
+
+
+@pytest.fixture
+def comments_url(news):
+    return reverse("news:comments", args=(news.pk,))
+
+
+@pytest.fixture
+def banned_words_loaded(db):
+    """Словарь запрещённых слов уже загружен в память процесса."""
+    return banned_words.get_matcher()
+
+
+@pytest.fixture
+def banned_word(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        word = BannedWord.objects.create(word="кабачок")
+    yield word
+    # Откат тестовой транзакции не вызывает сигналов.
+    bump_version()
+
+
+@pytest.fixture
+def stats_url():
+    return reverse('stats')
+
+
+@pytest.fixture
+def request_metrics():
+    registry.reset()
+    yield registry
+    registry.reset()
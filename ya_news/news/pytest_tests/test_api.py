@@ -0,0 +1,119 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_news_url():
+    return reverse('news:api_news')
+
+
+@pytest.fixture
+def api_comments_url(news):
+    return reverse('news:api_comments', args=(news.pk,))
+
+
+def read_pages(client, url, key):
+    """Проходит все страницы по курсору и собирает записи."""
+    items = []
+    cursor = None
+    while True:
+        response = client.get(url, {'cursor': cursor} if cursor else {})
+        data = response.json()
+        items += data[key]
+        cursor = data['next']
+        if cursor is None:
+            return items
+
+
+def test_news_feed_pages(client, all_news, api_news_url, settings):
+    """Лента новостей по курсору отдаёт все новости от свежих к старым"""
+    settings.NEWS_API_COUNT_ON_PAGE = 5
+    news = read_pages(client, api_news_url, 'news')
+    assert [item['id'] for item in news] == list(
+        News.objects.order_by('-date', '-id').values_list('id', flat=True)
+    )
+    assert news[0]['comment_count'] == 0
+    assert news[0]['comments'] == reverse(
+        'news:api_comments', args=(news[0]['id'],)
+    )
+
+
+def test_comments_feed_pages(
+    client, api_comments_url, comments, news, settings
+):
+    """Комментарии к новости по курсору отдаются в порядке публикации"""
+    settings.COMMENTS_COUNT_ON_PAGE = 2
+    comments = read_pages(client, api_comments_url, 'comments')
+    assert [item['id'] for item in comments] == list(
+        Comment.objects.filter(news=news)
+        .order_by('created', 'id')
+        .values_list('id', flat=True)
+    )
+    assert comments[0]['author'] == 'Автор'
+
+
+def test_comments_feed_not_found(client):
+    """Комментарии несуществующей новости отдают 404"""
+    url = reverse('news:api_comments', args=(0,))
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_bad_cursor(client, api_news_url):
+    """Некорректный курсор отклоняется с кодом 400"""
+    response = client.get(api_news_url, {'cursor': 'abc'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_feed_is_gzipped(client, api_news_url):
+    """Клиенту с gzip тело отдаётся сжатым и со своим ETag"""
+    plain = client.get(api_news_url)
+    response = client.get(api_news_url, headers={'accept-encoding': 'gzip'})
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response['Vary']
+    assert response['ETag'] != plain['ETag']
+    assert gzip.decompress(response.content) == plain.content
+
+
+def test_feed_not_modified_without_queries(
+    client, api_news_url, django_assert_num_queries
+):
+    """На совпадающий If-None-Match отдаётся 304 без запросов к базе"""
+    etag = client.get(api_news_url)['ETag']
+    with django_assert_num_queries(0):
+        response = client.get(api_news_url, headers={'if-none-match': etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_only_changed_news_is_serialized(
+    client, api_news_url, news, author, django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    """После изменения из базы читается только изменившаяся новость"""
+    client.get(api_news_url)
+    with django_capture_on_commit_callbacks(execute=True):
+        Comment.objects.create(news=news, author=author, text='Новый')
+    # Страница по индексу и одна изменившаяся новость.
+    with django_assert_num_queries(2):
+        response = client.get(api_news_url)
+    data = json.loads(response.content)
+    changed = next(item for item in data['news'] if item['id'] == news.pk)
+    assert changed['comment_count'] == 1
+    assert len(data['news']) == min(
+        settings.NEWS_API_COUNT_ON_PAGE, News.objects.count()
+    )
+
+
+def test_feed_is_read_only(client, api_news_url):
+    """Лента отвечает только на GET и HEAD"""
+    assert client.head(api_news_url).status_code == HTTPStatus.OK
+    response = client.post(api_news_url)
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
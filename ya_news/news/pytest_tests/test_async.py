@@ -0,0 +1,124 @@
+"""
+Главная страница и страница новости через AsyncClient.
+
+AsyncClient проходит асинхронную цепочку обработчиков, как под ASGI:
+асинхронные get представлений, асинхронный кеш страниц и асинхронный
+вызов RequestMetricsMiddleware. Тесты остаются синхронными, запрос
+выполняется через async_to_sync.
+"""
+import asyncio
+from http import HTTPStatus
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.core.management import call_command
+from django.urls import reverse
+from pytest_django.asserts import assertRedirects
+
+pytestmark = pytest.mark.django_db
+
+
+def aget(async_client, url, **kwargs):
+    """Выполняет запрос AsyncClient из синхронного теста."""
+    return async_to_sync(async_client.get)(url, **kwargs)
+
+
+def test_home_page(async_client, news, home_url):
+    """Главная страница отдаётся асинхронным представлением"""
+    response = aget(async_client, home_url)
+    assert response.status_code == HTTPStatus.OK
+    assert news in response.context['object_list']
+
+
+def test_detail_page(async_client, news, comments, detail_url, settings):
+    """Страница новости отдаёт первую страницу комментариев и курсор"""
+    settings.COMMENTS_COUNT_ON_PAGE = 2
+    response = aget(async_client, detail_url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['news'] == news
+    assert len(response.context['comments']) == 2
+    assert response.context['next_cursor'] is not None
+
+
+def test_detail_page_not_found(async_client):
+    """Несуществующая новость отдаёт 404"""
+    response = aget(async_client, reverse('news:detail', args=(0,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_archived_news_redirects_to_archive(async_client, old_news):
+    """Адрес новости из архива постоянно перенаправляет в архив"""
+    call_command('archive_news', stdout=StringIO())
+    news = old_news[0]
+    response = aget(async_client, reverse('news:detail', args=(news.pk,)))
+    assertRedirects(
+        response,
+        reverse('news:archive', args=(news.pk,)),
+        status_code=HTTPStatus.MOVED_PERMANENTLY,
+        fetch_redirect_response=False,
+    )
+
+
+@pytest.mark.parametrize(
+    'url', (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url'))
+)
+def test_anonymous_not_modified(
+    async_client, news, comment, url, django_assert_num_queries
+):
+    """Анонимный пользователь получает 304 из кеша без запросов к базе"""
+    etag = aget(async_client, url)['ETag']
+    with django_assert_num_queries(0):
+        response = aget(async_client, url, headers={'if-none-match': etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize(
+    'url', (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url'))
+)
+def test_cache_is_not_used_on_event_loop(async_client, news, comment, url):
+    """
+    Кеш версий и страниц, который может быть файловым,
+    читается и пишется не в цикле событий
+    """
+    loop_calls = []
+
+    def outside_loop(method):
+        def wrapper(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                loop_calls.append(method.__name__)
+            except RuntimeError:
+                pass
+            return method(*args, **kwargs)
+        return wrapper
+
+    with patch.multiple(
+        caches['default'].__class__,
+        **{
+            name: outside_loop(getattr(caches['default'].__class__, name))
+            for name in ('get', 'set', 'add', 'get_many', 'set_many')
+        },
+    ):
+        etag = aget(async_client, url)['ETag']
+        aget(async_client, url)
+        aget(async_client, url, headers={'if-none-match': etag})
+    assert loop_calls == []
+
+
+def test_request_metrics_count_queries(
+    async_client, news, comments, detail_url, request_metrics,
+    django_assert_num_queries
+):
+    """
+    Асинхронный вызов middleware записывает запросы, которые
+    асинхронный ORM выполняет в потоке sync_to_async
+    """
+    with django_assert_num_queries(2):
+        aget(async_client, detail_url)
+    detail_metrics = request_metrics.snapshot()['news:detail']
+    assert detail_metrics['queries']['count'] == 1
+    assert detail_metrics['queries']['max'] == 2
+    assert detail_metrics['template_ms']['count'] == 1
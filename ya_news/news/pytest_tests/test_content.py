@@ -1,7 +1,18 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+from unittest.mock import patch
+
 import pytest
 from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.urls import reverse
 
+from news.caching import bump_version, get_versions, version_key
 from news.forms import CommentForm
+from news.models import Comment, News
+from news.pytest_tests.conftest import COMMENTS_COUNT
 
 
 @pytest.mark.django_db
@@ -71,3 +82,249 @@ def test_authorized_client_has_form(auth_client, news, detail_url):
 
     assert "form" in response.context
     assert isinstance(response.context["form"], CommentForm)
+
+
+@pytest.mark.django_db
+def test_news_comment_count(client, news, comments, home_url):
+    """
+    На главной странице у новости выводится число комментариев,
+    посчитанное в запросе без загрузки самих комментариев
+    """
+    response = client.get(home_url)
+
+    news_item = response.context["object_list"][0]
+    assert news_item.comment_count == COMMENTS_COUNT
+
+
+@pytest.mark.django_db
+def test_home_page_queries_dont_depend_on_comments(
+    client, all_news, home_url, django_assert_max_num_queries
+):
+    """Главная страница загружается одним запросом к новостям"""
+    with django_assert_max_num_queries(1):
+        client.get(home_url)
+
+
+@pytest.mark.django_db
+def test_comments_are_paginated(
+    client, news, comments, detail_url, comments_url, settings
+):
+    """
+    На странице новости выводится только первая страница комментариев,
+    остальные подгружаются по курсору в хронологическом порядке
+    """
+    settings.COMMENTS_COUNT_ON_PAGE = 2
+    response = client.get(detail_url)
+    first_page = response.context["comments"]
+    next_cursor = response.context["next_cursor"]
+    assert len(first_page) == 2
+    assert next_cursor is not None
+
+    response = client.get(comments_url, {"cursor": next_cursor})
+    second_page = response.context["comments"]
+    assert len(second_page) == COMMENTS_COUNT - 2
+    assert response.context["next_cursor"] is None
+
+    all_comments = [*first_page, *second_page]
+    assert all_comments == list(news.comment_set.order_by("created", "id"))
+
+
+@pytest.mark.django_db
+def test_comments_page_queries_dont_depend_on_cursor(
+    client, comments, comments_url, settings, django_assert_num_queries
+):
+    """Каждая страница комментариев стоит одинаковое число запросов"""
+    settings.COMMENTS_COUNT_ON_PAGE = 1
+    cursor = None
+    for _ in range(COMMENTS_COUNT):
+        with django_assert_num_queries(2):
+            response = client.get(comments_url, {"cursor": cursor or ""})
+        cursor = response.context["next_cursor"]
+    assert cursor is None
+
+
+@pytest.mark.django_db
+def test_invalid_comments_cursor(client, news, comments_url):
+    """Некорректный курсор даёт ответ 400"""
+    response = client.get(comments_url, {"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_request_metrics_by_url_name(
+    client, admin_client, news, comments, detail_url, stats_url,
+    request_metrics, django_assert_num_queries
+):
+    """
+    Для каждого имени URL собираются число SQL-запросов,
+    время SQL, рендеринга шаблона и ответа целиком
+    """
+    with django_assert_num_queries(2):
+        client.get(detail_url)
+
+    views = admin_client.get(stats_url).json()['views']
+    detail_metrics = views['news:detail']
+    assert detail_metrics['queries']['count'] == 1
+    assert detail_metrics['queries']['max'] == 2
+    for metric in ('sql_ms', 'template_ms', 'total_ms'):
+        assert detail_metrics[metric]['count'] == 1
+    assert (
+        detail_metrics['template_ms']['max']
+        <= detail_metrics['total_ms']['max']
+    )
+
+
+@pytest.mark.django_db
+def test_request_metrics_sampling(
+    client, home_url, request_metrics, settings
+):
+    """Запросы вне выборки не записываются"""
+    settings.REQUEST_METRICS_SAMPLE_RATE = 0
+    client.get(home_url)
+    assert request_metrics.snapshot() == {}
+
+
+@pytest.mark.django_db
+def test_news_cards_are_cached(
+    auth_client, news, author, home_url, django_capture_on_commit_callbacks
+):
+    """
+    Карточка новости на главной берётся из кеша, пока новость
+    и её комментарии не менялись; изменения сбрасывают кеш
+    """
+    auth_client.get(home_url)
+    # update() не отправляет сигналов, поэтому версия карточки прежняя.
+    News.objects.filter(pk=news.pk).update(title='Новый заголовок')
+    content = auth_client.get(home_url).content.decode()
+    assert 'Новый заголовок' not in content
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Comment.objects.create(news=news, author=author, text='Текст')
+    content = auth_client.get(home_url).content.decode()
+    assert 'Новый заголовок' in content
+    assert 'Комментариев: 1' in content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url', (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url'))
+)
+def test_anonymous_page_cache(
+    client, news, comment, url, django_assert_num_queries
+):
+    """
+    Анонимный пользователь получает страницу из кеша без запросов
+    к базе, а на совпадающий If-None-Match — ответ 304
+    """
+    response = client.get(url)
+    assert response.has_header('Last-Modified')
+    etag = response['ETag']
+
+    with django_assert_num_queries(0):
+        cached_response = client.get(url)
+    assert cached_response.content == response.content
+
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_anonymous_page_cache_is_invalidated(
+    client, news, author, detail_url, django_capture_on_commit_callbacks
+):
+    """Новый комментарий меняет ETag и содержимое страницы"""
+    etag = client.get(detail_url)['ETag']
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Comment.objects.create(news=news, author=author, text='Свежий')
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+    assert 'Свежий' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_page_cache_sees_version_from_other_worker(client, news, detail_url):
+    """
+    Версия новости хранится в общем для процессов кеше: изменение,
+    записанное туда другим процессом, сбрасывает закешированную страницу
+    """
+    etag = client.get(detail_url)['ETag']
+    assert caches['default'].get(version_key(news.pk)) is None
+
+    caches[settings.NEWS_VERSION_CACHE].set(
+        version_key(news.pk), 1, timeout=None
+    )
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] == '"1"'
+
+
+def test_new_version_does_not_overwrite_concurrent_bump(news):
+    """
+    Версия, которую другой процесс записал между чтением и созданием
+    версии, не затирается
+    """
+    cache = caches[settings.NEWS_VERSION_CACHE]
+    get_many = cache.get_many
+    bumped = []
+
+    def get_many_then_bump(keys):
+        versions = get_many(keys)
+        if not bumped:
+            bump_version(news.pk)
+            bumped.append(cache.get(version_key(news.pk)))
+        return versions
+
+    with patch.object(cache, 'get_many', get_many_then_bump):
+        versions = get_versions((news.pk,))
+    assert cache.get(version_key(news.pk)) == bumped[0]
+    assert versions == {news.pk: bumped[0]}
+
+
+def test_authorized_client_bypasses_page_cache(
+    client, auth_client, news, detail_url
+):
+    """
+    Авторизованный пользователь не получает закешированную
+    для анонимов страницу и видит форму комментария
+    """
+    client.get(detail_url)
+    response = auth_client.get(detail_url)
+    assert not response.has_header('ETag')
+    assert isinstance(response.context['form'], CommentForm)
+
+
+@pytest.mark.django_db
+def test_archived_comments_are_paginated(
+    auth_client, news, comments, settings
+):
+    """
+    В архиве комментарии выводятся по странице, как у живой новости,
+    и подгружаются по курсору без ссылок на редактирование
+    """
+    comment_ids = list(
+        news.comment_set.order_by("created", "id").values_list("pk", flat=True)
+    )
+    News.objects.filter(pk=news.pk).update(
+        date=news.date - timedelta(days=settings.NEWS_ARCHIVE_AFTER_DAYS + 1)
+    )
+    call_command("archive_news", stdout=StringIO())
+    settings.COMMENTS_COUNT_ON_PAGE = 2
+    response = auth_client.get(reverse("news:archive", args=(news.pk,)))
+    first_page = response.context["comments"]
+    assert len(first_page) == 2
+
+    response = auth_client.get(
+        reverse("news:archive_comments", args=(news.pk,)),
+        {"cursor": response.context["next_cursor"]},
+    )
+    second_page = response.context["comments"]
+    assert response.context["next_cursor"] is None
+    assert [
+        comment.pk for comment in [*first_page, *second_page]
+    ] == comment_ids
+    assert reverse("news:edit", args=(comment_ids[-1],)) not in (
+        response.content.decode()
+    )
@@ -0,0 +1,122 @@
+import json
+from io import BytesIO, StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+
+from news import importing
+from news.importing import FeedError, JsonStream, NewsImporter
+from news.models import News
+
+pytestmark = pytest.mark.django_db
+
+RECORDS = [
+    {'title': f'Лента {index}', 'text': 'Текст', 'date': '2022-11-01'}
+    for index in range(6)
+]
+
+
+def write_ndjson(path, records):
+    path.write_text(
+        ''.join(json.dumps(record) + '\n' for record in records),
+        encoding='utf-8',
+    )
+    return path
+
+
+def test_stream_reads_objects_across_chunks():
+    """Объекты, разорванные границей куска, читаются целиком"""
+    data = json.dumps(RECORDS, ensure_ascii=False).encode()
+    stream = JsonStream(BytesIO(data), chunk_size=7)
+    assert list(stream) == RECORDS
+    assert stream.tell() == len(data)
+
+
+@pytest.mark.parametrize('chunk_size', (1, 5, 64))
+def test_stream_reads_escapes_across_chunks(chunk_size):
+    """Экранирование юникода, разорванное границей куска, дочитывается"""
+    data = json.dumps(RECORDS).encode()
+    assert list(JsonStream(BytesIO(data), chunk_size=chunk_size)) == RECORDS
+
+
+def test_stream_stops_at_invalid_record():
+    """Некорректная запись прерывает чтение, не дочитывая файл до конца"""
+    file = BytesIO(b'{"title": oops}\n' + json.dumps(RECORDS).encode() * 500)
+    with pytest.raises(FeedError, match='Некорректный JSON'):
+        list(JsonStream(file, chunk_size=64))
+    assert file.tell() <= 256
+
+
+def test_stream_limits_unterminated_string(monkeypatch):
+    """Строка без закрывающей кавычки читается не дальше MAX_RECORD_SIZE"""
+    monkeypatch.setattr(importing, 'MAX_RECORD_SIZE', 1000)
+    file = BytesIO(b'{"title": "' + b'x' * 100_000)
+    with pytest.raises(FeedError, match='Unterminated string'):
+        list(JsonStream(file, chunk_size=64))
+    assert file.tell() <= 2000
+
+
+def test_import_fixture_format(tmp_path):
+    """Импортируется файл в формате фикстур Django"""
+    path = tmp_path / 'news.json'
+    path.write_text(json.dumps(
+        [{'model': 'news.news', 'fields': record} for record in RECORDS]
+    ))
+    call_command('import_news', path, stdout=StringIO())
+    assert News.objects.filter(title__startswith='Лента').count() == 6
+    assert not (tmp_path / 'news.json.progress').exists()
+
+
+def test_import_skips_duplicates(tmp_path, news):
+    """Новости с теми же заголовком и датой не импортируются повторно"""
+    path = write_ndjson(tmp_path / 'news.ndjson', [
+        *RECORDS,
+        RECORDS[0],
+        {
+            'title': news.title,
+            'text': 'Другой текст',
+            'date': f'{news.date:%Y-%m-%d}',
+        },
+    ])
+    count = News.objects.count()
+    stdout = StringIO()
+    call_command('import_news', path, batch_size=4, stdout=stdout)
+    assert News.objects.count() == count + len(RECORDS)
+    assert 'дубликатов: 2' in stdout.getvalue()
+
+
+def test_import_rejects_invalid_record(tmp_path):
+    """Запись без обязательного поля останавливает импорт"""
+    path = write_ndjson(
+        tmp_path / 'news.ndjson', [*RECORDS[:2], {'title': 'Без даты'}]
+    )
+    with pytest.raises(CommandError, match='нет поля text'):
+        call_command('import_news', path, batch_size=2, stdout=StringIO())
+    assert News.objects.filter(title__startswith='Лента').count() == 2
+
+
+def test_import_resumes_after_failure(tmp_path):
+    """После сбоя импорт продолжается с последней записанной пачки"""
+    path = write_ndjson(tmp_path / 'news.ndjson', RECORDS)
+    save_batch = NewsImporter.save_batch
+    calls = []
+
+    def failing_save_batch(importer, batch):
+        calls.append(len(batch))
+        if len(calls) == 2:
+            raise OperationalError('disk I/O error')
+        save_batch(importer, batch)
+
+    with mock.patch.object(NewsImporter, 'save_batch', failing_save_batch):
+        with pytest.raises(CommandError, match='--resume'):
+            call_command('import_news', path, batch_size=2, stdout=StringIO())
+    assert News.objects.filter(title__startswith='Лента').count() == 2
+
+    stdout = StringIO()
+    call_command(
+        'import_news', path, batch_size=2, resume=True, stdout=stdout
+    )
+    assert 'Прочитано записей: 4' in stdout.getvalue()
+    assert News.objects.filter(title__startswith='Лента').count() == 6
@@ -0,0 +1,63 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from news.models import ArchivedComment, Comment, News
+from news.pagination import KeysetPaginator
+from news.views import COMMENTS_ORDERING
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='План запроса проверяется через EXPLAIN QUERY PLAN SQLite',
+    ),
+]
+
+
+def assert_uses_index(queryset, index_name):
+    """
+    План запроса использует индекс index_name
+    и не сортирует строки во временном B-дереве
+    """
+    plan = queryset.explain()
+    assert index_name in plan, plan
+    assert 'TEMP B-TREE' not in plan, plan
+
+
+def test_home_page_uses_date_index():
+    """Главная страница читает новости по индексу (-date, -id)"""
+    queryset = News.objects.with_comment_count()[
+        :settings.NEWS_COUNT_ON_HOME_PAGE
+    ]
+    assert_uses_index(queryset, 'news_date_id_idx')
+
+
+def test_comments_page_uses_news_created_index(news, comment):
+    """Страница комментариев читается по индексу (news, created, id)"""
+    paginator = KeysetPaginator(
+        news.comment_set.all(), COMMENTS_ORDERING, per_page=10
+    )
+    queryset = paginator.page_queryset(paginator.encode(comment))
+    assert_uses_index(queryset, 'comment_news_created_idx')
+
+
+def test_archived_comments_page_uses_news_created_index():
+    """Архивные комментарии читаются по индексу (news, created, id)"""
+    paginator = KeysetPaginator(
+        ArchivedComment.objects.filter(news=1), COMMENTS_ORDERING, per_page=10
+    )
+    queryset = paginator.page_queryset(
+        paginator.encode(ArchivedComment(created=timezone.now(), id=1))
+    )
+    assert_uses_index(queryset, 'archivedcomment_created_idx')
+
+
+def test_author_comments_use_author_index(author):
+    """
+    Комментарии автора ищутся по индексу внешнего ключа author,
+    который Django создаёт для ForeignKey
+    """
+    plan = Comment.objects.filter(author=author).explain()
+    assert 'news_comment_author_id' in plan, plan
@@ -1,10 +1,17 @@
 from http import HTTPStatus
+from io import StringIO
+from unittest.mock import patch
 
 import pytest
+from django.core.cache import caches
+from django.core.management import call_command
 from pytest_django.asserts import assertFormError, assertRedirects
 
 from news.forms import BAD_WORDS, WARNING
-from news.models import Comment
+from news.models import ArchivedComment, ArchivedNews, Comment, News
+from news.moderation import (
+    VERSION_CACHE_KEY, BadWordsMatcher, banned_words, bump_version
+)
 
 
 @pytest.mark.django_db
@@ -51,6 +58,91 @@ def test_user_cant_use_bad_words(auth_client, news, detail_url, bad_text):
     assert Comment.objects.count() == 0
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize('bad_text', ('РЕДИСКА', 'Редисками', 'НегоДяй'))
+def test_bad_words_ignore_case_and_endings(
+    auth_client, news, detail_url, bad_text
+):
+    """
+    Запрещённые слова находятся без учёта регистра,
+    в том числе внутри других слов
+    """
+    response = auth_client.post(detail_url, data={'text': bad_text})
+    assertFormError(response.context['form'], 'text', WARNING)
+    assert Comment.objects.count() == 0
+
+
+@pytest.mark.parametrize(
+    'text, whole_words, expected',
+    (
+        ('Ёжик в тумане', False, 'ежик'),
+        ('ЕЖИКИ в тумане', False, 'ежик'),
+        ('ЕЖИКИ в тумане', True, None),
+        ('Ну и ёжик!', True, 'ежик'),
+        ('Без ругательств', False, None),
+    )
+)
+def test_bad_words_matcher(text, whole_words, expected):
+    """
+    Поиск сворачивает регистр кириллицы и «ё»,
+    а при whole_words учитывает границы слов
+    """
+    matcher = BadWordsMatcher(('ёжик', 'туманность'), whole_words)
+    assert matcher.search(text) == expected
+
+
+def test_banned_word_applies_without_restart(
+    auth_client, detail_url, banned_words_loaded, banned_word,
+    django_capture_on_commit_callbacks
+):
+    """
+    Слово, добавленное в словарь, сразу запрещено,
+    а после удаления из словаря снова разрешено
+    """
+    data = {'text': f'Какой-то текст, {banned_word.word.upper()}'}
+    response = auth_client.post(detail_url, data=data)
+    assertFormError(response.context['form'], 'text', WARNING)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        banned_word.delete()
+    response = auth_client.post(detail_url, data=data)
+    assert Comment.objects.count() == 1
+
+
+def test_banned_words_are_not_reloaded_on_every_comment(
+    auth_client, detail_url, banned_words_loaded
+):
+    """Пока словарь не менялся, используется уже скомпилированный"""
+    auth_client.post(detail_url, data={'text': 'Текст'})
+    assert banned_words.get_matcher() is banned_words_loaded
+
+
+def test_banned_words_version_is_shared(settings, banned_words_loaded):
+    """Версия словаря хранится в кеше, общем для всех процессов"""
+    bump_version()
+    shared = caches[settings.NEWS_VERSION_CACHE]
+    assert settings.NEWS_VERSION_CACHE != 'default'
+    assert shared.get(VERSION_CACHE_KEY) != banned_words.version
+    assert caches['default'].get(VERSION_CACHE_KEY) is None
+
+
+def test_banned_words_version_is_not_incremented(settings):
+    """
+    Новая версия записывается целиком: incr() в файловом кеше
+    не атомарен, и два процесса могли бы записать одно число
+    """
+    shared = caches[settings.NEWS_VERSION_CACHE]
+    shared.set(VERSION_CACHE_KEY, 1, timeout=None)
+    with patch.object(
+        shared, 'incr', side_effect=AssertionError('incr() не атомарен')
+    ):
+        bump_version()
+        first = shared.get(VERSION_CACHE_KEY)
+        bump_version()
+    assert first not in (1, 2)
+    assert shared.get(VERSION_CACHE_KEY) not in (1, first)
+
+
 @pytest.mark.django_db
 def test_author_can_delete_comment(
     auth_client, comment, detail_url,
@@ -89,3 +181,85 @@ def test_user_cant_delete_comment_of_another_user(
     """Авторизованный пользователь не может удалять чужие комментарии"""
     response = reader_client.delete(url_comment_delete)
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_create_comment_queries(
+    auth_client, comment_form_data, detail_url, banned_words_loaded,
+    django_assert_num_queries
+):
+    """
+    Создание комментария: сессия, пользователь,
+    новость и вставка комментария
+    """
+    with django_assert_num_queries(4):
+        auth_client.post(detail_url, data=comment_form_data)
+
+
+def test_edit_comment_queries(
+    auth_client, comment_form_data, url_comment_edit, banned_words_loaded,
+    django_assert_num_queries
+):
+    """
+    Редактирование комментария: сессия, пользователь,
+    комментарий вместе с новостью и обновление
+    """
+    with django_assert_num_queries(4):
+        auth_client.post(url_comment_edit, data=comment_form_data)
+
+
+def test_delete_comment_queries(
+    auth_client, url_comment_delete, django_assert_num_queries
+):
+    """
+    Удаление комментария: сессия, пользователь,
+    комментарий вместе с новостью и удаление
+    """
+    with django_assert_num_queries(4):
+        auth_client.post(url_comment_delete)
+
+
+def test_old_news_are_archived_with_comments(old_news, news, comment):
+    """Старые новости и их комментарии переносятся в архив пачками"""
+    call_command('archive_news', batch_size=1, stdout=StringIO())
+    old_ids = [item.pk for item in old_news]
+    assert not News.objects.filter(pk__in=old_ids).exists()
+    assert not Comment.objects.filter(news__in=old_ids).exists()
+    assert set(
+        ArchivedNews.objects.values_list('pk', flat=True)
+    ) == set(old_ids)
+    assert ArchivedComment.objects.filter(news__in=old_ids).count() == len(
+        old_ids
+    )
+    assert News.objects.filter(pk=news.pk).exists()
+    assert Comment.objects.filter(pk=comment.pk).exists()
+
+
+def test_archive_moves_comments_in_batches(
+    old_news, author, django_capture_on_commit_callbacks
+):
+    """
+    Комментарии переносятся пачками без сигналов на каждый комментарий,
+    кеш новости сбрасывается один раз
+    """
+    Comment.objects.bulk_create(
+        Comment(news=old_news[0], author=author, text=f'Ещё {index}')
+        for index in range(5)
+    )
+    with django_capture_on_commit_callbacks() as callbacks:
+        call_command(
+            'archive_news', comments_batch_size=2, stdout=StringIO()
+        )
+    assert not Comment.objects.filter(news__in=old_news).exists()
+    assert ArchivedComment.objects.filter(news=old_news[0].pk).count() == 6
+    assert len(callbacks) == len(old_news)
+
+
+def test_archive_resumes_interrupted_run(old_news):
+    """Новость, уже скопированная прерванным запуском, переносится"""
+    ArchivedNews.objects.create(
+        id=old_news[0].pk, title='Старая новость 0', text='Текст',
+        date=old_news[0].date,
+    )
+    call_command('archive_news', stdout=StringIO())
+    assert not News.objects.filter(pk__in=[n.pk for n in old_news]).exists()
+    assert ArchivedComment.objects.count() == len(old_news)
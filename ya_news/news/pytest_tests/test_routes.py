@@ -1,6 +1,8 @@
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from pytest_django.asserts import assertRedirects
 
@@ -10,12 +12,14 @@ URL_NEWS_DETAIL = pytest.lazy_fixture('detail_url')
 URL_LOGIN = pytest.lazy_fixture('url_login')
 URL_SIGNUP = pytest.lazy_fixture('url_signup')
 URL_HOME = pytest.lazy_fixture('home_url')
+URL_SEARCH = pytest.lazy_fixture('search_url')
 URL_LOGOUT = pytest.lazy_fixture('url_logout')
 AUTHOR_CLIENT = pytest.lazy_fixture('auth_client')
 READER_CLIENT = pytest.lazy_fixture('reader_client')
 URL_COMMENT_EDIT = pytest.lazy_fixture('url_comment_edit')
 URL_COMMENT_DELETE = pytest.lazy_fixture('url_comment_delete')
 ANONYMOUS_CLIENT = pytest.lazy_fixture('client')
+ADMIN_CLIENT = pytest.lazy_fixture('admin_client')
 
 
 @pytest.mark.parametrize(
@@ -25,6 +29,7 @@ ANONYMOUS_CLIENT = pytest.lazy_fixture('client')
         URL_LOGIN,
         URL_HOME,
         URL_SIGNUP,
+        URL_SEARCH,
     )
 )
 def test_pages_availability_for_anonymous_user(client, url):
@@ -69,3 +74,34 @@ def test_availability_pages_edit_delete_for_anonymous_user(
     expected_url = f'{reverse("users:login")}?next={url}'
     response = client.get(url)
     assertRedirects(response, expected_url)
+
+
+@pytest.mark.parametrize(
+    'parametrized_client, expected_status',
+    (
+        (ADMIN_CLIENT, HTTPStatus.OK),
+        (AUTHOR_CLIENT, HTTPStatus.FOUND),
+        (ANONYMOUS_CLIENT, HTTPStatus.FOUND),
+    )
+)
+def test_stats_available_only_for_staff(
+    parametrized_client, expected_status, stats_url
+):
+    """Страница метрик запросов доступна только персоналу"""
+    response = parametrized_client.get(stats_url)
+    assert response.status_code == expected_status
+
+
+def test_archived_news_url_redirects_to_archive(client, old_news):
+    """
+    Адрес новости, перенесённой в архив, постоянно перенаправляет
+    на доступную анонимному пользователю страницу архива
+    """
+    call_command('archive_news', stdout=StringIO())
+    news = old_news[0]
+    response = client.get(reverse('news:detail', args=(news.pk,)))
+    assertRedirects(
+        response,
+        reverse('news:archive', args=(news.pk,)),
+        status_code=HTTPStatus.MOVED_PERMANENTLY,
+    )
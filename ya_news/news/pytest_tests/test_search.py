@@ -0,0 +1,156 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from news.models import Comment, News
+from news.search import INDEXES, match_expression, search_news
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def soup_news(author):
+    title_news = News.objects.create(
+        title='Рецепт борща', text='Свёкла, капуста'
+    )
+    text_news = News.objects.create(
+        title='Обед', text='В столовой подают борщ'
+    )
+    comment_news = News.objects.create(title='Погода', text='Дождь')
+    Comment.objects.create(
+        news=comment_news, author=author, text='Хорошо бы борща'
+    )
+    return title_news, text_news, comment_news
+
+
+def index_rows(index):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT rowid FROM {index} ORDER BY rowid')
+        return [rowid for rowid, in cursor.fetchall()]
+
+
+def test_match_expression_ignores_fts_syntax():
+    """Операторы FTS5 в запросе пользователя не действуют"""
+    assert match_expression('борщ OR "обед" NEAR(') == (
+        '"борщ"* "OR"* "обед"* "NEAR"*'
+    )
+    assert match_expression('-*"()') == ''
+
+
+def test_search_ranks_title_above_text(soup_news):
+    """Совпадение в заголовке выше совпадения в тексте"""
+    title_news, text_news, _ = soup_news
+    assert search_news('борщ', limit=10) == [title_news, text_news]
+
+
+def test_search_in_comments(soup_news):
+    """С комментариями новость находится и по их тексту"""
+    title_news, text_news, comment_news = soup_news
+    assert search_news('борщ', limit=10, with_comments=True) == [
+        title_news, text_news, comment_news,
+    ]
+    assert search_news('хорошо', limit=10, with_comments=True) == [
+        comment_news
+    ]
+
+
+def test_search_ignores_yo(author):
+    """«ё» и «е» в запросе и в тексте не различаются"""
+    news = News.objects.create(title='Ёжик в тумане', text='Мультфильм')
+    Comment.objects.create(news=news, author=author, text='Ещё смотрю')
+    for query in ('ежик', 'ёжик', 'ЕЖИК'):
+        assert search_news(query, limit=10) == [news]
+    assert search_news('еще', limit=10, with_comments=True) == [news]
+    assert match_expression('Ёлка ёж') == '"Елка"* "еж"*'
+
+
+def test_index_follows_changes(soup_news, author):
+    """Индекс следует за изменением и удалением новостей и комментариев"""
+    title_news, text_news, comment_news = soup_news
+    title_news.title = 'Рецепт щей'
+    title_news.text = 'Капуста'
+    title_news.save()
+    News.objects.filter(pk=text_news.pk).delete()
+    Comment.objects.filter(news=comment_news).update(text='Без супа')
+    assert search_news('борщ', limit=10, with_comments=True) == []
+    assert search_news('щей', limit=10) == [title_news]
+    assert search_news('супа', limit=10, with_comments=True) == [
+        comment_news
+    ]
+
+
+def test_rebuild_search_index(soup_news, author):
+    """Команда rebuild_search_index заново строит оба индекса"""
+    title_news, text_news, comment_news = soup_news
+    with connection.cursor() as cursor:
+        for index in INDEXES:
+            cursor.execute(f'DELETE FROM {index}')
+        # Запись индекса без строки в таблице должна исчезнуть.
+        cursor.execute(
+            "INSERT INTO news_news_fts (rowid, title, text) "
+            "VALUES (1000000, 'борщ', '')"
+        )
+    assert search_news('борщ', limit=10) == []
+
+    call_command('rebuild_search_index', batch_size=2, stdout=StringIO())
+
+    assert index_rows('news_news_fts') == list(
+        News.objects.order_by('id').values_list('id', flat=True)
+    )
+    assert index_rows('news_comment_fts') == list(
+        Comment.objects.order_by('id').values_list('id', flat=True)
+    )
+    assert search_news('борщ', limit=10, with_comments=True) == [
+        title_news, text_news, comment_news,
+    ]
+    assert search_news('свекла', limit=10) == [title_news]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_fills_index_with_existing_rows(author):
+    """
+    Новости и комментарии, созданные до миграции поиска,
+    попадают в индекс при миграции
+    """
+    executor = MigrationExecutor(connection)
+    executor.migrate([('news', '0004_archive')])
+    news = News.objects.create(title='Рецепт борща', text='Свёкла')
+    Comment.objects.create(news=news, author=author, text='Ещё бы борща')
+
+    executor.loader.build_graph()
+    executor.migrate(executor.loader.graph.leaf_nodes('news'))
+
+    assert index_rows('news_news_fts') == list(
+        News.objects.order_by('id').values_list('id', flat=True)
+    )
+    assert index_rows('news_comment_fts') == list(
+        Comment.objects.order_by('id').values_list('id', flat=True)
+    )
+    assert search_news('борщ', limit=10, with_comments=True) == [news]
+    assert search_news('свекла', limit=10) == [news]
+    assert search_news('еще', limit=10, with_comments=True) == [news]
+
+
+def test_search_view_pages(client, search_url, soup_news, settings):
+    """Результаты поиска разбиты на страницы"""
+    title_news, text_news, comment_news = soup_news
+    settings.NEWS_SEARCH_COUNT_ON_PAGE = 2
+    response = client.get(search_url, {'q': 'борщ', 'comments': 'on'})
+    assert list(response.context['object_list']) == [title_news, text_news]
+    assert response.context['next_page'] == 2
+    response = client.get(
+        search_url, {'q': 'борщ', 'comments': 'on', 'page': 2}
+    )
+    assert list(response.context['object_list']) == [comment_news]
+    assert response.context['next_page'] is None
+
+
+@pytest.mark.parametrize('page', ('abc', '0'))
+def test_search_view_rejects_bad_page(client, search_url, page):
+    """Некорректный номер страницы отклоняется с кодом 400"""
+    response = client.get(search_url, {'q': 'борщ', 'page': page})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
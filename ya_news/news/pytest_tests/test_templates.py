@@ -0,0 +1,23 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+def test_all_templates_compile():
+    """Все шаблоны проекта компилируются командой compile_templates"""
+    stdout = StringIO()
+    call_command('compile_templates', stdout=stdout)
+    assert 'Скомпилировано шаблонов' in stdout.getvalue()
+
+
+def test_broken_template_fails_command(settings, tmp_path):
+    """Команда называет шаблон с ошибкой и завершается с ошибкой"""
+    (tmp_path / 'broken.html').write_text('{% if %}{% endif %}')
+    settings.TEMPLATES = [
+        {**settings.TEMPLATES[0], 'DIRS': [tmp_path]},
+    ]
+    stderr = StringIO()
+    with pytest.raises(CommandError):
+        call_command('compile_templates', stderr=stderr)
+    assert 'broken.html' in stderr.getvalue()
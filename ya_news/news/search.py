@@ -0,0 +1,159 @@
+"""
+Полнотекстовый поиск по новостям и комментариям.
+
+Индексы FTS5 news_news_fts и news_comment_fts создаёт миграция
+0005_search, триггеры (сейчас из 0008_search_yo) обновляют их вместе
+с данными, а команда rebuild_search_index переиндексирует таблицы
+пачками. Токенизатор не сводит «ё» к «е», поэтому в индекс попадает
+текст с «е», а запрос приводится к тому же виду.
+
+Новости, найденные по заголовку или тексту, упорядочены по bm25,
+совпадение в заголовке весит больше совпадения в тексте. За ними
+идут новости, найденные только по комментариям, от самого свежего
+подходящего комментария: bm25 по всем совпавшим комментариям
+частого слова стоил бы дороже всего остального поиска, а так
+комментарии читаются, только пока не заполнится страница.
+На базах без FTS5 новости ищутся через icontains.
+"""
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import News
+
+TERM = re.compile(r"\w+")
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+YO = str.maketrans("ёЁ", "еЕ")
+
+# Индекс: таблица с данными и индексируемые столбцы.
+INDEXES = {
+    "news_news_fts": ("news_news", ("title", "text")),
+    "news_comment_fts": ("news_comment", ("text", "news_id")),
+}
+# Столбцы с текстом, в которых «ё» заменяется на «е».
+TEXT_COLUMNS = ("title", "text")
+
+NEWS_SQL = f"""
+    SELECT rowid FROM news_news_fts
+    WHERE news_news_fts MATCH %s
+    ORDER BY bm25(news_news_fts, {TITLE_WEIGHT}, {TEXT_WEIGHT}), rowid DESC
+    LIMIT %s OFFSET %s
+"""
+MATCHED_NEWS_SQL = """
+    SELECT rowid FROM news_news_fts WHERE news_news_fts MATCH %s
+"""
+COMMENTS_SQL = """
+    SELECT news_id FROM news_comment_fts
+    WHERE news_comment_fts MATCH %s
+    ORDER BY rowid DESC
+"""
+
+
+def match_expression(query):
+    """
+    Запрос FTS5 из строки пользователя.
+
+    Каждое слово берётся в кавычки и ищется как префикс, слова
+    объединяются через AND. Операторы FTS5 в строке пользователя
+    не действуют, поэтому запрос не может быть синтаксически неверным.
+    """
+    return " ".join(
+        f'"{term}"*' for term in TERM.findall(query.translate(YO))
+    )
+
+
+def fold_yo(column):
+    """Выражение SQL: столбец с «е» вместо «ё», как в индексе."""
+    if column not in TEXT_COLUMNS:
+        return column
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def ranked_news_ids(expression, with_comments, limit, offset):
+    with connection.cursor() as cursor:
+        cursor.execute(NEWS_SQL, [expression, limit, offset])
+        news_ids = [news_id for news_id, in cursor.fetchall()]
+        if not with_comments or len(news_ids) == limit:
+            return news_ids
+        cursor.execute(MATCHED_NEWS_SQL, [expression])
+        seen = {news_id for news_id, in cursor.fetchall()}
+        # Сколько новостей, найденных только по комментариям,
+        # пришлось на предыдущие страницы.
+        skip = max(offset - len(seen), 0)
+        cursor.execute(COMMENTS_SQL, [expression])
+        for news_id, in cursor:
+            if news_id in seen:
+                continue
+            seen.add(news_id)
+            if skip:
+                skip -= 1
+                continue
+            news_ids.append(news_id)
+            if len(news_ids) == limit:
+                break
+    return news_ids
+
+
+def search_news(query, limit, offset=0, with_comments=False):
+    """
+    Новости, подходящие под запрос, от limit и offset.
+
+    С with_comments новость находится и по тексту комментариев к ней.
+    """
+    expression = match_expression(query)
+    if not expression:
+        return []
+    if connection.vendor != "sqlite":
+        condition = Q(title__icontains=query) | Q(text__icontains=query)
+        if with_comments:
+            condition |= Q(comment__text__icontains=query)
+        return list(
+            News.objects.filter(condition).distinct()[offset:offset + limit]
+        )
+    news_ids = ranked_news_ids(expression, with_comments, limit, offset)
+    news = News.objects.in_bulk(news_ids)
+    return [news[news_id] for news_id in news_ids if news_id in news]
+
+
+def reindex_batch(index, after, batch_size):
+    """
+    Переиндексирует до batch_size строк с id больше after.
+
+    Записи индекса в обработанном диапазоне удаляются и строятся
+    заново в одной транзакции, поэтому пачка не мешает триггерам
+    и её можно повторить. Возвращает id последней строки пачки
+    или None, если строк не осталось; в последней пачке удаляются
+    и записи индекса за концом таблицы.
+    """
+    table, columns = INDEXES[index]
+    values = ", ".join(fold_yo(column) for column in columns)
+    columns = ", ".join(columns)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT MAX(id) FROM (SELECT id FROM {table} WHERE id > %s "
+            f"ORDER BY id LIMIT %s)",
+            [after, batch_size],
+        )
+        last = cursor.fetchone()[0]
+        if last is None:
+            cursor.execute(f"DELETE FROM {index} WHERE rowid > %s", [after])
+            return None
+        cursor.execute(
+            f"DELETE FROM {index} WHERE rowid > %s AND rowid <= %s",
+            [after, last],
+        )
+        cursor.execute(
+            f"INSERT INTO {index} (rowid, {columns}) "
+            f"SELECT id, {values} FROM {table} "
+            f"WHERE id > %s AND id <= %s",
+            [after, last],
+        )
+    return last
+
+
+def optimize(index):
+    """Сливает сегменты индекса в один после массовых изменений."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {index} ({index}) VALUES ('optimize')")
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import caching, moderation
+from .models import BannedWord, Comment, News
+
+
+@receiver(post_save, sender=BannedWord)
+@receiver(post_delete, sender=BannedWord)
+def banned_words_changed(**kwargs):
+    """Новую версию словаря объявляем только после фиксации транзакции."""
+    transaction.on_commit(moderation.bump_version)
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def news_changed(instance, **kwargs):
+    news_id = instance.pk
+    transaction.on_commit(lambda: caching.bump_version(news_id))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(instance, **kwargs):
+    """Число комментариев входит в карточку новости."""
+    news_id = instance.news_id
+    transaction.on_commit(lambda: caching.bump_version(news_id))
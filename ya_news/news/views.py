@@ -1,18 +1,79 @@
+from datetime import datetime, time
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.core.exceptions import BadRequest
+from django.http import Http404
+from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
 from django.views import generic
 
+from .caching import (
+    LIST_VERSION,
+    aget_versions,
+    anonymous_page_cache,
+    get_versions,
+)
 from .forms import CommentForm
-from .models import Comment, News
+from .models import ArchivedNews, Comment, News
+from .pagination import KeysetPaginator
+from .search import search_news
+
+COMMENTS_ORDERING = ("created", "id")
+
+
+def home_etag(request):
+    return get_versions((LIST_VERSION,))[LIST_VERSION]
+
+
+def detail_etag(request, pk):
+    return get_versions((pk,))[pk]
+
+
+class LastModifiedMixin:
+    """
+    Выставляет Last-Modified по последней новости или комментарию.
+
+    Время берётся из данных самой страницы, без отдельного запроса.
+    """
+
+    def get_last_modified(self):
+        """Время последнего изменения страницы или None без заголовка."""
+        return None
 
+    @staticmethod
+    def news_modified(news):
+        modified = timezone.make_aware(datetime.combine(news.date, time.min))
+        if news.last_comment:
+            return max(modified, news.last_comment)
+        return modified
 
-class NewsList(generic.ListView):
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        last_modified = self.get_last_modified()
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+
+class NewsList(LastModifiedMixin, generic.ListView):
     """Список новостей."""
 
     model = News
     template_name = "news/home.html"
+    # Версии карточек; асинхронный get читает их заранее.
+    versions = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # method_decorator в Django 5.1 делает из асинхронного
+        # метода синхронный, поэтому оборачиваем готовое представление.
+        return anonymous_page_cache(home_etag)(
+            super().as_view(**initkwargs)
+        )
 
     def get_queryset(self):
         """
@@ -20,31 +81,142 @@ class NewsList(generic.ListView):
 
         Их количество определяется в настройках проекта.
         """
-        return self.model.objects.prefetch_related("comment_set")[
+        return self.model.objects.with_comment_count().with_last_comment()[
             : settings.NEWS_COUNT_ON_HOME_PAGE
         ]
 
+    async def get(self, request, *args, **kwargs):
+        """
+        Асинхронный вариант ListView.get.
 
-class NewsDetail(generic.DetailView):
-    model = News
-    template_name = "news/detail.html"
-
-    def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related("comment_set__author"),
-            pk=self.kwargs["pk"],
+        Новости читаются через async for, контекст и шаблон
+        строятся по уже загруженному списку.
+        """
+        self.object_list = self.get_queryset()
+        # async for загружает весь QuerySet в его кеш результатов,
+        # дальше он работает как обычный вычисленный QuerySet.
+        async for _ in self.object_list:
+            pass
+        self.versions = await aget_versions(
+            news.pk for news in self.object_list
         )
-        return obj
+        return self.render_to_response(self.get_context_data())
+
+    def get_last_modified(self):
+        return max(map(self.news_modified, self.object_list), default=None)
 
     def get_context_data(self, **kwargs):
+        """
+        Карточки новостей кешируются по id и версии новости.
+
+        Версии всех карточек читаются из кеша одним запросом.
+        """
         context = super().get_context_data(**kwargs)
-        if self.request.user.is_authenticated:
-            context["form"] = CommentForm()
+        if self.versions is None:
+            self.versions = get_versions(
+                news.pk for news in self.object_list
+            )
+        for news in self.object_list:
+            news.version = self.versions[news.pk]
+        context["card_cache"] = settings.NEWS_CARD_CACHE
+        context["card_cache_timeout"] = settings.NEWS_CARD_CACHE_TIMEOUT
         return context
 
 
+def comments_paginator(comments):
+    """Страницы комментариев новости: живой или из архива."""
+    return KeysetPaginator(
+        comments.select_related("author"),
+        COMMENTS_ORDERING,
+        settings.COMMENTS_COUNT_ON_PAGE,
+    )
+
+
+class CommentsPageMixin:
+    """
+    Добавляет в контекст страницу комментариев к новости.
+
+    Страница выбирается по курсору из параметра cursor, поэтому её
+    стоимость не зависит от длины обсуждения.
+    """
+
+    def get_comments(self):
+        return self.object.comment_set
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["comments"], context["next_cursor"] = comments_paginator(
+            self.get_comments()
+        ).get_page(self.request.GET.get("cursor"))
+        return context
+
+
+class NewsDetail(LastModifiedMixin, generic.DetailView):
+    model = News
+    template_name = "news/detail.html"
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Асинхронный вариант DetailView.get.
+
+        Новость, страница комментариев и пользователь читаются через
+        асинхронный ORM. Адрес новости, перенесённой в архив,
+        ведёт в архив.
+        """
+        try:
+            self.object = await self.model.objects.with_last_comment().aget(
+                pk=kwargs["pk"]
+            )
+        except self.model.DoesNotExist:
+            archived = await ArchivedNews.objects.only("pk").filter(
+                pk=kwargs["pk"]
+            ).afirst()
+            if archived is None:
+                raise Http404("Новость не найдена.")
+            return redirect(archived, permanent=True)
+        comments, next_cursor = await comments_paginator(
+            self.object.comment_set
+        ).aget_page(request.GET.get("cursor"))
+        context = self.get_context_data(
+            comments=comments, next_cursor=next_cursor
+        )
+        if (await request.auser()).is_authenticated:
+            context["form"] = CommentForm()
+        return self.render_to_response(context)
+
+    def get_last_modified(self):
+        return self.news_modified(self.object)
+
+
+class ArchivedNewsDetail(CommentsPageMixin, generic.DetailView):
+    """Новость из архива: только чтение, без формы комментария."""
+
+    model = ArchivedNews
+    template_name = "news/archive_detail.html"
+    context_object_name = "news"
+
+    def get_comments(self):
+        return self.object.comments
+
+
+class ArchivedNewsComments(ArchivedNewsDetail):
+    """Следующая страница комментариев архивной новости."""
+
+    template_name = "news/archive_comments.html"
+
+
+class NewsComments(CommentsPageMixin, generic.DetailView):
+    """Следующая страница комментариев для кнопки «Показать ещё»."""
+
+    model = News
+    template_name = "news/comments.html"
+
+
 class NewsComment(
-    LoginRequiredMixin, generic.detail.SingleObjectMixin, generic.FormView
+    LoginRequiredMixin,
+    CommentsPageMixin,
+    generic.detail.SingleObjectMixin,
+    generic.FormView,
 ):
     model = News
     form_class = CommentForm
@@ -62,19 +234,71 @@ class NewsComment(
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse("news:detail", kwargs={"pk": post.pk}) + "#comments"
+        return (
+            reverse("news:detail", kwargs={"pk": self.object.pk})
+            + "#comments"
+        )
 
 
 class NewsDetailView(generic.View):
 
-    def get(self, request, *args, **kwargs):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return anonymous_page_cache(detail_etag)(
+            super().as_view(**initkwargs)
+        )
+
+    async def get(self, request, *args, **kwargs):
         view = NewsDetail.as_view()
-        return view(request, *args, **kwargs)
+        return await view(request, *args, **kwargs)
 
-    def post(self, request, *args, **kwargs):
-        view = NewsComment.as_view()
-        return view(request, *args, **kwargs)
+    async def post(self, request, *args, **kwargs):
+        """Добавление комментария остаётся синхронным."""
+        view = sync_to_async(NewsComment.as_view())
+        return await view(request, *args, **kwargs)
+
+
+class NewsSearch(generic.ListView):
+    """
+    Поиск по новостям и, по желанию, комментариям к ним.
+
+    Результаты упорядочены по релевантности и разбиты на страницы
+    номером из параметра page.
+    """
+
+    template_name = "news/search.html"
+
+    def get_page_number(self):
+        try:
+            page = int(self.request.GET.get("page", 1))
+        except ValueError as error:
+            raise BadRequest("Некорректный параметр page.") from error
+        if page < 1:
+            raise BadRequest("Некорректный параметр page.")
+        return page
+
+    def get_queryset(self):
+        self.page = self.get_page_number()
+        # Одна лишняя новость показывает, есть ли следующая страница.
+        return search_news(
+            self.request.GET.get("q", ""),
+            limit=settings.NEWS_SEARCH_COUNT_ON_PAGE + 1,
+            offset=(self.page - 1) * settings.NEWS_SEARCH_COUNT_ON_PAGE,
+            with_comments="comments" in self.request.GET,
+        )
+
+    def get_context_data(self, **kwargs):
+        news = self.object_list[: settings.NEWS_SEARCH_COUNT_ON_PAGE]
+        next_page = None
+        if len(self.object_list) > settings.NEWS_SEARCH_COUNT_ON_PAGE:
+            next_page = self.page + 1
+        return super().get_context_data(
+            object_list=news,
+            query=self.request.GET.get("q", ""),
+            with_comments="comments" in self.request.GET,
+            next_page=next_page,
+            **kwargs,
+        )
 
 
 class CommentBase(LoginRequiredMixin):
@@ -83,15 +307,22 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        """
+        Адрес новости берём из уже загруженного комментария.
+
+        При удалении он вычисляется до удаления строки, поэтому
+        повторно запрашивать комментарий и новость не нужно.
+        """
         return (
-            reverse("news:detail", kwargs={"pk": comment.news.pk})
+            reverse("news:detail", kwargs={"pk": self.object.news_id})
             + "#comments"
         )
 
     def get_queryset(self):
         """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        return self.model.objects.filter(
+            author=self.request.user
+        ).select_related("news")
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
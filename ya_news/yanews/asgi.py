@@ -11,6 +11,12 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from yanews.templating import compile_templates
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yanews.settings")
+os.environ.setdefault("DJANGO_DB_CONNECTIONS", "pool")
 
 application = get_asgi_application()
+
+# Шаблоны компилируются до первого запроса.
+compile_templates()
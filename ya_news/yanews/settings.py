@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -23,6 +24,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "yanews.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -53,13 +55,62 @@ TEMPLATES = [
 WSGI_APPLICATION = "yanews.wsgi.application"
 
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "filebased": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache",
+    },
+}
+
+# Прагмы выполняются при открытии каждого соединения с SQLite.
+# WAL позволяет читать во время записи, busy_timeout задаёт, сколько
+# миллисекунд ждать освобождения блокировки записи вместо ошибки
+# «database is locked». mmap_size в байтах, cache_size < 0 — в КиБ.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -20000,
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}"
+                for name, value in SQLITE_PRAGMAS.items()
+            ),
+            # Транзакция сразу берёт блокировку записи. При отложенной
+            # транзакции, которая сначала читает, а потом пишет, SQLite
+            # возвращает «database is locked» без ожидания busy_timeout.
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
+# Режим соединений с базой задаётся переменной окружения
+# DJANGO_DB_CONNECTIONS, wsgi.py и asgi.py выбирают свой по умолчанию:
+#   "persistent" — соединение потока живёт между запросами
+#   и проверяется перед повторным использованием;
+#   "pool" — общий ограниченный пул соединений для ASGI;
+#   не задано — новое соединение на каждый запрос.
+DB_CONNECTIONS = os.environ.get("DJANGO_DB_CONNECTIONS", "")
+DB_CONN_MAX_AGE = 600
+DB_POOL = {"max_size": 8, "timeout": 10}
+
+if DB_CONNECTIONS == "persistent":
+    DATABASES["default"]["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+elif DB_CONNECTIONS == "pool":
+    DATABASES["default"]["ENGINE"] = "yanews.sqlite_pool"
+    DATABASES["default"]["OPTIONS"]["pool"] = DB_POOL
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -82,3 +133,35 @@ LOGIN_URL = reverse_lazy("users:login")
 LOGIN_REDIRECT_URL = reverse_lazy("news:home")
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_COUNT_ON_PAGE = 50
+
+# Кеш версий, общий для всех процессов сайта: по версии каждый
+# процесс узнаёт об изменении словаря запрещённых слов и новостей.
+NEWS_VERSION_CACHE = "filebased"
+
+# Доля запросов, для которых RequestMetricsMiddleware собирает метрики.
+REQUEST_METRICS_SAMPLE_RATE = 1.0
+
+# Кеш отрисованных карточек новостей на главной странице.
+NEWS_CARD_CACHE = "default"
+NEWS_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Срок хранения страниц для анонимных пользователей в том же кеше.
+NEWS_PAGE_CACHE_TIMEOUT = 10 * 60
+
+# Размер пачки bulk_create в команде import_news.
+NEWS_IMPORT_BATCH_SIZE = 1000
+
+# Новости старше этого числа дней переносит в архив команда archive_news.
+NEWS_ARCHIVE_AFTER_DAYS = 365
+NEWS_ARCHIVE_BATCH_SIZE = 500
+# Комментарии архивируемой новости переносятся пачками по столько штук.
+NEWS_ARCHIVE_COMMENTS_BATCH_SIZE = 2000
+
+NEWS_SEARCH_COUNT_ON_PAGE = 20
+# Размер пачки в команде rebuild_search_index.
+NEWS_SEARCH_INDEX_BATCH_SIZE = 2000
+
+# Новостей на странице JSON-ленты api/news/.
+NEWS_API_COUNT_ON_PAGE = 20
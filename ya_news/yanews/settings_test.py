@@ -0,0 +1,39 @@
+"""
+Настройки для запуска тестов.
+
+Отличаются от настроек разработки тем, что ускоряют тесты:
+быстрый хешер паролей, база в памяти, шаблоны без отладочной
+информации и только те middleware, на которые опираются тесты.
+"""
+from yanews.settings import *  # noqa: F401, F403
+
+DEBUG = False
+
+DATABASES = {
+    "default": {**DATABASES["default"], "NAME": ":memory:"},  # noqa: F405
+}
+
+# MD5 небезопасен, но хеширование паролей в тестах проверять не нужно.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Без SecurityMiddleware, CommonMiddleware и XFrameOptionsMiddleware:
+# тесты не проверяют их заголовки и перенаправления. Сессии,
+# аутентификация и сообщения нужны приложению admin.
+MIDDLEWARE = [
+    "yanews.metrics.RequestMetricsMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+]
+
+# Файловый кеш заменён кешем в памяти, чтобы тесты не писали на диск.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "filebased": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "filebased",
+    },
+}
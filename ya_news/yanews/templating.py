@@ -0,0 +1,60 @@
+"""
+Предварительная компиляция шаблонов проекта.
+
+Шаблоны из DIRS и из каталогов templates приложений проекта
+загружаются через движок Django. Если loaders не заданы, Django
+сам оборачивает загрузчики в кеширующий, и скомпилированные
+шаблоны остаются в памяти процесса; прогрев при запуске переносит
+их разбор с первых запросов на старт процесса.
+
+Копия модуля есть в другом проекте репозитория, см. check_mirrors.py.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+
+def template_dirs(engine):
+    """
+    Каталоги шаблонов проекта: DIRS движка и каталоги приложений
+    проекта. Шаблоны admin и других сторонних приложений пропускаются.
+    """
+    base_dir = Path(settings.BASE_DIR).resolve()
+    app_dirs = [
+        directory
+        for directory in get_app_template_dirs("templates")
+        if Path(directory).resolve().is_relative_to(base_dir)
+    ]
+    return [Path(directory) for directory in (*engine.engine.dirs, *app_dirs)]
+
+
+def project_template_names(engine):
+    names = set()
+    for directory in template_dirs(engine):
+        names.update(
+            path.relative_to(directory).as_posix()
+            for path in directory.rglob("*")
+            if path.is_file() and not path.name.startswith(".")
+        )
+    return sorted(names)
+
+
+def compile_templates():
+    """
+    Компилирует все шаблоны проекта.
+
+    Возвращает список скомпилированных шаблонов и словарь ошибок
+    вида {имя шаблона: текст ошибки}.
+    """
+    compiled, errors = [], {}
+    for engine in engines.all():
+        for name in project_template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                errors[name] = str(error)
+            else:
+                compiled.append(name)
+    return compiled, errors
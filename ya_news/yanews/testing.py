@@ -0,0 +1,61 @@
+"""
+Эталонная тестовая база для pytest.
+
+Строки, общие для большинства тестов, создаются один раз за сессию.
+Обычный тест работает внутри транзакции, которая откатывается, и видит
+эталонные строки без изменений. Транзакционный тест очищает таблицы,
+поэтому после него база восстанавливается из снимка через backup API
+SQLite.
+
+Копия модуля есть в другом проекте репозитория, см. check_mirrors.py.
+"""
+import sqlite3
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+
+def is_transactional(item):
+    """Тест очищает таблицы вместо отката транзакции."""
+    if item.cls is not None and issubclass(item.cls, TransactionTestCase):
+        return not issubclass(item.cls, TestCase)
+    marker = item.get_closest_marker("django_db")
+    return (
+        "transactional_db" in item.fixturenames
+        or "live_server" in item.fixturenames
+        or bool(marker and marker.kwargs.get("transaction"))
+    )
+
+
+class GoldenDatabase:
+    """Эталонные строки тестовой базы и её снимок в памяти."""
+
+    def __init__(self):
+        self.data = None
+        self.snapshot = None
+        self.blocker = None
+
+    def build(self, build_data, blocker):
+        """Создаёт строки функцией build_data и снимает копию базы."""
+        self.blocker = blocker
+        with blocker.unblock():
+            self.data = build_data()
+            if connection.vendor == "sqlite":
+                connection.ensure_connection()
+                self.snapshot = sqlite3.connect(
+                    ":memory:", check_same_thread=False
+                )
+                connection.connection.backup(self.snapshot)
+
+    def restore_after(self, item):
+        """Возвращает базу к снимку после транзакционного теста."""
+        if self.snapshot is None or not is_transactional(item):
+            return
+        with self.blocker.unblock():
+            connection.ensure_connection()
+            self.snapshot.backup(connection.connection)
+
+    def close(self):
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.__init__()
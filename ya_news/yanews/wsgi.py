@@ -11,6 +11,12 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from yanews.templating import compile_templates
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yanews.settings")
+os.environ.setdefault("DJANGO_DB_CONNECTIONS", "persistent")
 
 application = get_wsgi_application()
+
+# Шаблоны компилируются до первого запроса.
+compile_templates()
@@ -0,0 +1,69 @@
+"""
+Общие помощники для бенчмарков проекта YaNote.
+
+Бенчмарки запускаются из директории ya_note как модули:
+
+    python -m benchmarks.<модуль>
+
+Копия модуля есть в другом проекте репозитория, см. check_mirrors.py.
+"""
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django(settings_module="yanote.settings"):
+    """Настраивает Django для запуска вне manage.py."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Создаёт временную тестовую базу и удаляет её по завершении."""
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def measure(func, repeat=5):
+    """
+    Выполняет func несколько раз.
+
+    Возвращает лучшее время в миллисекундах, пик выделенной памяти
+    в килобайтах и число SQL-запросов за один вызов.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024, len(queries)
+
+
+def print_table(rows, headers):
+    """Печатает результаты в виде простой таблицы."""
+    widths = [
+        max(len(str(row[index])) for row in (headers, *rows))
+        for index in range(len(headers))
+    ]
+    for row in (headers, *rows):
+        print("  ".join(
+            str(value).ljust(width) for value, width in zip(row, widths)
+        ))
@@ -0,0 +1,132 @@
+"""
+Поиск по заметкам: индекс FTS5 против icontains.
+
+Во временную файловую базу записывается --notes заметок
+от --authors авторов из случайных слов, после чего для одного автора
+выполняются одинаковые запросы через search_notes и через фильтр
+icontains по заголовку и тексту. Частые слова встречаются почти
+в каждой заметке, редкие — в единицах, отсутствующее слово заставляет
+icontains просмотреть все заметки автора.
+
+    python -m benchmarks.notes_search --notes 1000000 --authors 100
+"""
+import argparse
+import random
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+
+from .common import measure, print_table, setup_django
+
+SYLLABLES = (
+    "ба", "ве", "го", "ду", "же", "зи", "ко", "ла", "ми", "но",
+    "пу", "ро", "си", "ту", "фа", "хе", "це", "чо", "ша", "ю",
+)
+VOCABULARY_SIZE = 20000
+BATCH_SIZE = 10000
+
+
+def make_vocabulary(rng):
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    # Порядок задаёт частоту: первые слова встречаются чаще всего.
+    return sorted(words)
+
+
+def fill(notes, authors, vocabulary, rng):
+    """Пишет заметки пачками в обход ORM, индекс ведут триггеры."""
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+
+    users = get_user_model().objects.bulk_create(
+        get_user_model()(username=f"author{index}")
+        for index in range(authors)
+    )
+    # Распределение Ципфа: несколько слов частые, остальные редкие.
+    weights = list(
+        accumulate(1 / rank for rank in range(1, len(vocabulary) + 1))
+    )
+    start = time.perf_counter()
+    for first in range(0, notes, BATCH_SIZE):
+        rows = []
+        for index in range(first, min(first + BATCH_SIZE, notes)):
+            words = rng.choices(vocabulary, cum_weights=weights, k=33)
+            rows.append((
+                " ".join(words[:3]),
+                " ".join(words[3:]),
+                f"note-{index}",
+                users[index % authors].pk,
+            ))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO notes_note (title, text, slug, author_id) "
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+    print(
+        f"Записано {notes} заметок за {time.perf_counter() - start:.1f} с."
+    )
+    return users[0]
+
+
+def icontains_search(author, query, limit):
+    from django.db.models import Q
+
+    from notes.models import Note
+
+    return list(
+        Note.objects.filter(author=author)
+        .filter(Q(title__icontains=query) | Q(text__icontains=query))
+        .only("id", "title", "slug")
+        .order_by("-id")[:limit]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=1_000_000)
+    parser.add_argument("--authors", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from django.conf import settings
+
+    directory = tempfile.mkdtemp()
+    setup_django()
+    settings.DATABASES["default"]["NAME"] = Path(directory, "db.sqlite3")
+    from django.core.management import call_command
+
+    from notes.search import search_notes
+
+    call_command("migrate", verbosity=0)
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng)
+    author = fill(args.notes, args.authors, vocabulary, rng)
+    queries = (
+        ("частое слово", vocabulary[0]),
+        ("среднее слово", vocabulary[200]),
+        ("редкое слово", vocabulary[-1]),
+        ("два слова", f"{vocabulary[0]} {vocabulary[200]}"),
+        ("нет совпадений", "щщщ"),
+    )
+    rows = []
+    for name, query in queries:
+        for method, search in (
+            ("fts5", search_notes),
+            ("icontains", icontains_search),
+        ):
+            found = len(search(author, query, args.limit))
+            time_ms, memory_kb, _ = measure(
+                lambda: search(author, query, args.limit)
+            )
+            rows.append((
+                name, method, found, f"{time_ms:.2f}", f"{memory_kb:.0f}",
+            ))
+    print_table(rows, ("запрос", "поиск", "найдено", "мс", "КБ"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+JSON API заметок для мобильных и настольных клиентов.
+
+Заметки адресуются по slug, пользователь видит только свои, как
+в NoteBase. Каждое изменение выдаёт заметке ревизию, удаление
+оставляет отметку с ревизией (см. models.next_revision). Клиент
+запоминает ревизию из ответа списка и в следующий раз запрашивает
+?since=<ревизия>: приходят только изменённые заметки и slug удалённых,
+которые не заняты существующими заметками.
+Список и заметка отдаются с ETag по ревизии, поэтому If-None-Match
+без изменений стоит одного запроса к базе и ответа 304.
+"""
+import json
+
+from django.core.exceptions import BadRequest
+from django.db import models
+from django.forms.models import model_to_dict
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views import generic
+
+from .forms import NoteForm
+from .models import Note, NoteTombstone
+from .views import NoteBase
+
+FIELDS = ("slug", "title", "text", "revision")
+
+
+def note_data(note):
+    return {field: getattr(note, field) for field in FIELDS}
+
+
+def author_revision(author):
+    """Последняя ревизия среди заметок и отметок об удалении автора."""
+    revisions = [
+        model.objects.filter(author=author).aggregate(
+            revision=models.Max("revision")
+        )["revision"]
+        for model in (Note, NoteTombstone)
+    ]
+    return max(filter(None, revisions), default=0)
+
+
+def revision_etag(revision):
+    return quote_etag(str(revision))
+
+
+def json_response(data, status=200, revision=None):
+    response = JsonResponse(
+        data, status=status, json_dumps_params={"ensure_ascii": False}
+    )
+    if revision is not None:
+        response["ETag"] = revision_etag(revision)
+    return response
+
+
+class ApiBase(NoteBase):
+    """Ошибки доступа и данных отдаются в JSON."""
+
+    def handle_no_permission(self):
+        return json_response({"error": "Требуется вход."}, status=401)
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except BadRequest as error:
+            return json_response({"error": str(error)}, status=400)
+
+    def get_body(self):
+        try:
+            body = json.loads(self.request.body)
+        except ValueError as error:
+            raise BadRequest("Тело запроса не JSON.") from error
+        if not isinstance(body, dict):
+            raise BadRequest("Ожидался объект JSON.")
+        return body
+
+    def save_form(self, form, status):
+        if not form.is_valid():
+            return json_response(
+                {"errors": form.errors.get_json_data()}, status=400
+            )
+        note = form.save(commit=False)
+        note.author = self.request.user
+        note.save()
+        response = json_response(
+            note_data(note), status=status, revision=note.revision
+        )
+        response["Location"] = reverse("notes:api_note", args=(note.slug,))
+        return response
+
+
+class NotesApi(ApiBase, generic.View):
+    """Список заметок с синхронизацией по ревизии и создание заметки."""
+
+    def get_since(self):
+        try:
+            since = int(self.request.GET.get("since", 0))
+        except ValueError as error:
+            raise BadRequest("Некорректный параметр since.") from error
+        if since < 0:
+            raise BadRequest("Некорректный параметр since.")
+        return since
+
+    def get(self, request, *args, **kwargs):
+        since = self.get_since()
+        # Ревизия читается до заметок: изменение, записанное между
+        # запросами, придёт ещё раз при следующей синхронизации,
+        # но не потеряется.
+        revision = author_revision(request.user)
+        etag = revision_etag(revision)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        notes = self.get_queryset().order_by("revision", "id")
+        deleted = []
+        if since:
+            notes = notes.filter(revision__gt=since)
+            # Slug, который снова занят заметкой (удалённой и созданной
+            # заново или переименованной обратно), не удалён: заметка
+            # придёт в notes. Сортировка только по slug, иначе поля
+            # ORDER BY попадают в SELECT DISTINCT и повторы остаются.
+            deleted = list(
+                NoteTombstone.objects.filter(
+                    author=request.user, revision__gt=since
+                )
+                .exclude(slug__in=self.get_queryset().values("slug"))
+                .order_by("slug")
+                .values_list("slug", flat=True)
+                .distinct()
+            )
+        return json_response(
+            {
+                "revision": revision,
+                "notes": list(notes.values(*FIELDS)),
+                "deleted": deleted,
+            },
+            revision=revision,
+        )
+
+    def post(self, request, *args, **kwargs):
+        return self.save_form(NoteForm(self.get_body()), status=201)
+
+
+class NoteApi(ApiBase, generic.View):
+    """
+    Заметка: чтение, замена (PUT), изменение части полей (PATCH)
+    и удаление.
+
+    С If-Match запись выполняется, только если заметка не менялась
+    с указанной ревизии, иначе ответ 412.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        self.object = self.get_queryset().filter(slug=kwargs["slug"]).first()
+        if self.object is None:
+            return json_response({"error": "Заметка не найдена."}, 404)
+        not_modified = get_conditional_response(
+            request, etag=revision_etag(self.object.revision)
+        )
+        if not_modified is not None:
+            return not_modified
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        return json_response(
+            note_data(self.object), revision=self.object.revision
+        )
+
+    def put(self, request, *args, **kwargs):
+        form = NoteForm(self.get_body(), instance=self.object)
+        return self.save_form(form, status=200)
+
+    def patch(self, request, *args, **kwargs):
+        data = {
+            **model_to_dict(self.object, fields=NoteForm.Meta.fields),
+            **self.get_body(),
+        }
+        return self.save_form(
+            NoteForm(data, instance=self.object), status=200
+        )
+
+    def delete(self, request, *args, **kwargs):
+        self.object.delete()
+        return HttpResponse(status=204)
@@ -1,5 +1,3 @@
-from pytils.translit import slugify
-
 from django import forms
 from django.core.exceptions import ValidationError
 
@@ -16,12 +14,16 @@ class NoteForm(forms.ModelForm):
         fields = ("title", "text", "slug")
 
     def clean_slug(self):
-        """Обрабатывает случай, если slug не уникален."""
+        """
+        Обрабатывает случай, если slug не уникален.
+
+        Пустой slug подбирает модель при сохранении: к slug из заголовка
+        при необходимости добавляется свободный суффикс «-N».
+        """
         cleaned_data = super().clean()
         slug = cleaned_data.get("slug")
         if not slug:
-            title = cleaned_data.get("title")
-            slug = slugify(title)[:100]
+            return slug
         if (
             Note.objects.filter(slug=slug)
             .exclude(id=self.instance.pk)
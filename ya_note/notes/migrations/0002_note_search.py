@@ -0,0 +1,80 @@
+"""
+Полнотекстовый индекс FTS5 по заголовку и тексту заметок.
+
+Автор тоже индексируется: условие на автора в MATCH сужает поиск
+до его заметок ещё до ранжирования. Слова запроса ищутся как префиксы,
+а короткий префикс раскрывается в тысячи слов словаря, поэтому для
+префиксов из 2-4 символов FTS5 строит отдельные индексы.
+
+Таблица notes_note_fts хранит только индекс, содержимое берётся
+из notes_note по rowid. Триггеры обновляют индекс при вставке,
+изменении и удалении заметки. Индекс создаётся только в SQLite,
+на других базах поиск работает через icontains.
+
+SQLite меняет столбцы, пересоздавая таблицу, и триггеры при этом
+пропадают: миграция, которая пересоздаёт notes_note, должна создать
+их заново.
+"""
+from django.db import migrations
+
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE notes_note_fts USING fts5(
+        title, text, author_id,
+        content='notes_note', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER notes_note_fts_insert AFTER INSERT ON notes_note BEGIN
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER notes_note_fts_delete AFTER DELETE ON notes_note BEGIN
+        INSERT INTO notes_note_fts (
+            notes_note_fts, rowid, title, text, author_id
+        ) VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER notes_note_fts_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO notes_note_fts (
+            notes_note_fts, rowid, title, text, author_id
+        ) VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    # Индекс для уже существующих заметок.
+    "INSERT INTO notes_note_fts (notes_note_fts) VALUES ('rebuild')",
+)
+
+DROP_SQL = (
+    "DROP TRIGGER IF EXISTS notes_note_fts_insert",
+    "DROP TRIGGER IF EXISTS notes_note_fts_delete",
+    "DROP TRIGGER IF EXISTS notes_note_fts_update",
+    "DROP TABLE IF EXISTS notes_note_fts",
+)
+
+
+def run_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
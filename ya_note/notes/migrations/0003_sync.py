@@ -0,0 +1,101 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# SQLite добавляет столбец revision, пересоздавая таблицу notes_note,
+# и триггеры индекса поиска из 0002_note_search при этом пропадают.
+TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_insert
+    AFTER INSERT ON notes_note BEGIN
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_delete
+    AFTER DELETE ON notes_note BEGIN
+        INSERT INTO notes_note_fts (
+            notes_note_fts, rowid, title, text, author_id
+        ) VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO notes_note_fts (
+            notes_note_fts, rowid, title, text, author_id
+        ) VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+)
+
+
+def create_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in TRIGGERS_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notes", "0002_note_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # При откате таблица пересоздаётся ещё раз, после этого
+        # триггеры тоже нужно вернуть.
+        migrations.RunPython(migrations.RunPython.noop, create_triggers),
+        migrations.CreateModel(
+            name="NoteTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("slug", models.SlugField(max_length=100)),
+                ("revision", models.PositiveBigIntegerField(db_index=True)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["author", "revision"],
+                        name="tombstone_author_revision_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="note",
+            name="revision",
+            field=models.PositiveBigIntegerField(
+                db_index=True, default=0, verbose_name="Ревизия"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(
+                fields=["author", "revision"], name="note_author_revision_idx"
+            ),
+        ),
+        migrations.RunPython(create_triggers, migrations.RunPython.noop),
+    ]
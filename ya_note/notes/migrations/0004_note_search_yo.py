@@ -0,0 +1,91 @@
+"""
+Буква «ё» в полнотекстовом индексе заметок заменяется на «е».
+
+Токенизатор unicode61 не сводит «ё» к «е» даже с remove_diacritics,
+и запрос «елка» не находил «ёлка». Триггеры из 0002_note_search
+пересоздаются так, чтобы записывать в индекс и удалять из него
+заголовок и текст с «е», а индекс строится заново. Запрос приводится
+к тому же виду в notes.search.match_expression.
+
+Индекс по-прежнему берёт содержимое из notes_note, где «ё» осталась,
+поэтому команда 'rebuild' FTS5 построила бы его без замены: строить
+индекс заново нужно вставкой, как здесь. Представление с заменой
+в качестве содержимого не подходит: SQLite не даст переименовать
+таблицу, на которую ссылается представление, а Django так меняет
+столбцы.
+"""
+from django.db import migrations
+
+
+def fold_yo(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def plain(column):
+    return column
+
+
+def values(prefix, fold):
+    return (
+        f"{prefix}id, {fold(prefix + 'title')}, {fold(prefix + 'text')}, "
+        f"{prefix}author_id"
+    )
+
+
+def index_sql(fold):
+    """Триггеры и заполнение индекса, fold обрабатывает текст."""
+    return (
+        "DROP TRIGGER IF EXISTS notes_note_fts_insert",
+        "DROP TRIGGER IF EXISTS notes_note_fts_delete",
+        "DROP TRIGGER IF EXISTS notes_note_fts_update",
+        f"""
+        CREATE TRIGGER notes_note_fts_insert AFTER INSERT ON notes_note BEGIN
+            INSERT INTO notes_note_fts (rowid, title, text, author_id)
+            VALUES ({values("new.", fold)});
+        END
+        """,
+        f"""
+        CREATE TRIGGER notes_note_fts_delete AFTER DELETE ON notes_note BEGIN
+            INSERT INTO notes_note_fts (
+                notes_note_fts, rowid, title, text, author_id
+            ) VALUES ('delete', {values("old.", fold)});
+        END
+        """,
+        f"""
+        CREATE TRIGGER notes_note_fts_update
+        AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+            INSERT INTO notes_note_fts (
+                notes_note_fts, rowid, title, text, author_id
+            ) VALUES ('delete', {values("old.", fold)});
+            INSERT INTO notes_note_fts (rowid, title, text, author_id)
+            VALUES ({values("new.", fold)});
+        END
+        """,
+        "INSERT INTO notes_note_fts (notes_note_fts) VALUES ('delete-all')",
+        f"""
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        SELECT {values("", fold)} FROM notes_note
+        """,
+    )
+
+
+def run_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notes", "0003_sync"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sqlite(index_sql(fold_yo)), run_sqlite(index_sql(plain))
+        ),
+    ]
@@ -1,11 +1,71 @@
+import re
+
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth import get_user_model
 
 from pytils.translit import slugify
 
 User = get_user_model()
 
+# Место под суффикс «-N» при усечении длинного slug.
+SLUG_SUFFIX_LENGTH = 7
+SLUG_SAVE_ATTEMPTS = 10
+
+
+def next_revision():
+    """
+    Следующая ревизия для синхронизации клиентов.
+
+    Ревизия на единицу больше последней среди заметок и отметок
+    об удалении. Функция вызывается внутри транзакции записи:
+    транзакции SQLite начинаются с BEGIN IMMEDIATE и идут по одной,
+    поэтому ревизии растут в порядке фиксации и клиент, запомнивший
+    ревизию, не пропустит изменение, зафиксированное позже.
+    """
+    revisions = [
+        Note.objects.aggregate(revision=models.Max("revision"))["revision"],
+        NoteTombstone.objects.aggregate(
+            revision=models.Max("revision")
+        )["revision"],
+    ]
+    return max(filter(None, revisions), default=0) + 1
+
+
+class NoteQuerySet(models.QuerySet):
+    """Массовые операции тоже выдают заметкам новую ревизию."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            revision = next_revision()
+            for obj in objs:
+                obj.revision = revision
+            return super().bulk_create(objs, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if "revision" in kwargs:
+            raise TypeError(
+                "Ревизия выдаётся при обновлении и не передаётся в update()."
+            )
+        with transaction.atomic(using=self.db):
+            return super().update(revision=next_revision(), **kwargs)
+
+    def delete(self):
+        """Удаляет заметки, оставляя отметки об удалении."""
+        with transaction.atomic(using=self.db):
+            revision = next_revision()
+            NoteTombstone.objects.bulk_create(
+                NoteTombstone(
+                    author_id=author_id, slug=slug, revision=revision
+                )
+                for author_id, slug in self.values_list("author_id", "slug")
+            )
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
 class Note(models.Model):
     title = models.CharField(
@@ -29,12 +89,135 @@ class Note(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    revision = models.PositiveBigIntegerField(
+        "Ревизия", default=0, db_index=True
+    )
+
+    objects = NoteQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=("author", "revision"), name="note_author_revision_idx"
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        note = super().from_db(db, field_names, values)
+        if "slug" in field_names:
+            note.loaded_slug = values[field_names.index("slug")]
+        return note
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field("slug").max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """
+        Сохраняет заметку с новой ревизией.
+
+        Ревизия записывается и при сохранении части полей через
+        update_fields. Если slug изменился, для прежнего остаётся
+        отметка об удалении: клиенты находят заметки по slug.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            if not update_fields:
+                # Как и Django, с пустым update_fields ничего не пишем.
+                return
+            kwargs["update_fields"] = {*update_fields, "revision"}
+        with transaction.atomic():
+            self.revision = next_revision()
+            self.save_with_slug(*args, **kwargs)
+            if update_fields is not None and "slug" not in update_fields:
+                return
+            loaded_slug = getattr(self, "loaded_slug", None)
+            if loaded_slug and loaded_slug != self.slug:
+                NoteTombstone.objects.create(
+                    author_id=self.author_id,
+                    slug=loaded_slug,
+                    revision=self.revision,
+                )
+            self.loaded_slug = self.slug
+
+    save.alters_data = True
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            NoteTombstone.objects.create(
+                author_id=self.author_id,
+                slug=self.slug,
+                revision=next_revision(),
+            )
+            return super().delete(*args, **kwargs)
+
+    delete.alters_data = True
+
+    def save_with_slug(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        # Параллельная запись может занять найденный slug раньше нас:
+        # тогда откатываем точку сохранения и ищем следующий.
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            self.slug = self.get_free_slug()
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt + 1 == SLUG_SAVE_ATTEMPTS or not (
+                    Note.objects.filter(slug=self.slug).exists()
+                ):
+                    self.slug = ""
+                    raise
+
+    def get_free_slug(self):
+        """
+        Свободный slug из заголовка: сам slug или slug с суффиксом «-N».
+
+        Занятые варианты выбираются одним запросом по уникальному индексу:
+        точное совпадение и диапазон «slug-0» ... «slug-9…».
+        """
+        max_slug_length = self._meta.get_field("slug").max_length
+        slug = slugify(self.title)[:max_slug_length] or "note"
+        stem = slug[: max_slug_length - SLUG_SUFFIX_LENGTH]
+        taken = set(
+            Note.objects.filter(
+                models.Q(slug=slug)
+                | models.Q(slug__gte=f"{stem}-0", slug__lt=f"{stem}-:")
+            )
+            .exclude(pk=self.pk)
+            .values_list("slug", flat=True)
+        )
+        if slug not in taken:
+            return slug
+        suffix = re.compile(rf"{re.escape(stem)}-(\d+)")
+        numbers = [
+            int(match[1])
+            for match in map(suffix.fullmatch, taken)
+            if match
+        ]
+        return f"{stem}-{max(numbers, default=1) + 1}"
+
+
+class NoteTombstone(models.Model):
+    """
+    Отметка об удалённой заметке.
+
+    По отметкам клиент, синхронизирующийся с ревизии, узнаёт, какие
+    заметки удалить у себя.
+    """
+
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    slug = models.SlugField(max_length=100)
+    revision = models.PositiveBigIntegerField(db_index=True)
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=("author", "revision"),
+                name="tombstone_author_revision_idx",
+            ),
+        )
@@ -0,0 +1,69 @@
+"""
+Полнотекстовый поиск по заметкам автора.
+
+В SQLite поиск идёт по индексу FTS5 notes_note_fts (см. миграцию
+0002_note_search), результаты упорядочены по bm25, совпадение
+в заголовке весит больше совпадения в тексте. Условие на автора
+входит в сам запрос MATCH, поэтому ранжируются только его заметки.
+Токенизатор не сводит «ё» к «е», поэтому триггеры индекса (сейчас
+из 0004_note_search_yo) записывают текст с «е», а запрос приводится
+к тому же виду.
+На других базах заметки ищутся через icontains и упорядочены
+от новых к старым.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Note
+
+TERM = re.compile(r"\w+")
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+YO = str.maketrans("ёЁ", "еЕ")
+
+SEARCH_SQL = f"""
+    SELECT notes_note.id, notes_note.title, notes_note.slug
+    FROM notes_note_fts
+    JOIN notes_note ON notes_note.id = notes_note_fts.rowid
+    WHERE notes_note_fts MATCH %s AND notes_note.author_id = %s
+    ORDER BY bm25(notes_note_fts, {TITLE_WEIGHT}, {TEXT_WEIGHT}, 0),
+        notes_note.id
+    LIMIT %s OFFSET %s
+"""
+
+
+def match_expression(query):
+    """
+    Запрос FTS5 из строки пользователя.
+
+    Каждое слово берётся в кавычки и ищется как префикс, слова
+    объединяются через AND. Операторы FTS5 в строке пользователя
+    не действуют, поэтому запрос не может быть синтаксически неверным.
+    """
+    return " ".join(
+        f'"{term}"*' for term in TERM.findall(query.translate(YO))
+    )
+
+
+def search_notes(author, query, limit, offset=0):
+    """
+    Заметки автора, подходящие под запрос, от limit и offset.
+
+    У заметок загружены только id, title и slug.
+    """
+    expression = match_expression(query)
+    if not expression:
+        return []
+    if connection.vendor != "sqlite":
+        return list(
+            Note.objects.filter(author=author)
+            .filter(Q(title__icontains=query) | Q(text__icontains=query))
+            .only("id", "title", "slug")
+            .order_by("-id")[offset:offset + limit]
+        )
+    expression = f"author_id:{author.pk} AND {{title text}}:({expression})"
+    return list(
+        Note.objects.raw(SEARCH_SQL, [expression, author.pk, limit, offset])
+    )
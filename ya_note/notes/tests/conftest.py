@@ -0,0 +1,20 @@
+import pytest
+
+from notes.tests import golden
+from yanote.testing import GoldenDatabase
+
+golden_db = GoldenDatabase()
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    """Эталонные пользователи создаются один раз за сессию."""
+    golden_db.build(golden.build, django_db_blocker)
+    yield
+    golden_db.close()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    yield
+    golden_db.restore_after(item)
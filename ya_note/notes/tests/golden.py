@@ -0,0 +1,39 @@
+"""
+Эталонные пользователи тестовой базы.
+
+Под pytest они создаются один раз за сессию вместе с сессиями входа
+(см. conftest.py), а setUpTestData классов только читает их. Без
+эталонной базы, например в manage.py test, пользователи создаются
+в транзакции класса, а клиент входит через force_login.
+"""
+from django.conf import settings
+from django.test import Client
+
+from notes.models import User
+
+AUTHOR = 'Я'
+READER = 'Читатель'
+# Ключи сессий эталонных пользователей по username.
+SESSIONS = {}
+
+
+def build():
+    """Создаёт эталонных пользователей и открывает им сессии."""
+    for username in (AUTHOR, READER):
+        client = Client()
+        client.force_login(User.objects.create(username=username))
+        SESSIONS[username] = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+def get_user(username):
+    return User.objects.get_or_create(username=username)[0]
+
+
+def logged_in_client(user):
+    """Клиент пользователя, по возможности с готовой сессией."""
+    client = Client()
+    if user.username in SESSIONS:
+        client.cookies[settings.SESSION_COOKIE_NAME] = SESSIONS[user.username]
+    else:
+        client.force_login(user)
+    return client
@@ -0,0 +1,277 @@
+import json
+from http import HTTPStatus
+
+from django.test import TestCase
+from django.urls import reverse
+
+from notes.models import Note, NoteTombstone
+from notes.tests import golden
+
+
+class TestNotesApi(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = golden.get_user(golden.AUTHOR)
+        cls.reader = golden.get_user(golden.READER)
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст', slug='note', author=cls.author
+        )
+        cls.other_note = Note.objects.create(
+            title='Чужая', text='Текст', slug='other', author=cls.reader
+        )
+        cls.list_url = reverse('notes:api_notes')
+        cls.note_url = reverse('notes:api_note', args=(cls.note.slug,))
+
+    def setUp(self):
+        self.author_client = golden.logged_in_client(self.author)
+
+    def send(self, method, url, data, **headers):
+        return getattr(self.author_client, method)(
+            url,
+            json.dumps(data),
+            content_type='application/json',
+            headers=headers,
+        )
+
+    def test_anonymous_gets_unauthorized(self):
+        """Аноним получает 401 в JSON, а не перенаправление на вход"""
+        for url in (self.list_url, self.note_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+                self.assertIn('error', response.json())
+
+    def test_list_returns_only_own_notes(self):
+        """Список содержит только заметки пользователя и ревизию"""
+        response = self.author_client.get(self.list_url)
+        data = response.json()
+        self.assertEqual([note['slug'] for note in data['notes']], ['note'])
+        self.assertEqual(data['revision'], self.note.revision)
+        self.assertEqual(data['deleted'], [])
+        self.assertEqual(response['ETag'], f'"{self.note.revision}"')
+
+    def test_other_users_note_not_found(self):
+        """Чужая заметка недоступна ни для чтения, ни для удаления"""
+        url = reverse('notes:api_note', args=(self.other_note.slug,))
+        for method in ('get', 'delete'):
+            with self.subTest(method=method):
+                response = getattr(self.author_client, method)(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertTrue(Note.objects.filter(pk=self.other_note.pk).exists())
+
+    def test_since_returns_changes_and_deletions(self):
+        """С since приходят только изменения после ревизии и удаления"""
+        since = self.author_client.get(self.list_url).json()['revision']
+        changed = Note.objects.create(
+            title='Новая', text='Текст', slug='new', author=self.author
+        )
+        self.note.delete()
+        response = self.author_client.get(self.list_url, {'since': since})
+        data = response.json()
+        self.assertEqual([note['slug'] for note in data['notes']], ['new'])
+        self.assertEqual(data['deleted'], ['note'])
+        self.assertGreater(data['revision'], changed.revision)
+
+        response = self.author_client.get(
+            self.list_url, {'since': data['revision']}
+        )
+        self.assertEqual(response.json()['notes'], [])
+        self.assertEqual(response.json()['deleted'], [])
+
+    def test_list_not_modified(self):
+        """If-None-Match без изменений даёт 304, после изменения — 200"""
+        etag = self.author_client.get(self.list_url)['ETag']
+        response = self.author_client.get(
+            self.list_url, headers={'if-none-match': etag}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Note.objects.filter(pk=self.note.pk).update(text='Другой текст')
+        response = self.author_client.get(
+            self.list_url, headers={'if-none-match': etag}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_create_note(self):
+        """POST создаёт заметку и отдаёт её адрес"""
+        response = self.send(
+            'post', self.list_url, {'title': 'Новая', 'text': 'Текст'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        note = Note.objects.get(slug=response.json()['slug'])
+        self.assertEqual(note.author, self.author)
+        self.assertEqual(
+            response['Location'], reverse('notes:api_note', args=(note.slug,))
+        )
+        self.assertEqual(response.json()['revision'], note.revision)
+
+    def test_create_invalid_note(self):
+        """Ошибки формы и неверный JSON возвращаются с кодом 400"""
+        response = self.send(
+            'post', self.list_url, {'title': 'Дубль', 'slug': 'note'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn('slug', response.json()['errors'])
+        for body in ('{', '[]'):
+            with self.subTest(body=body):
+                response = self.author_client.post(
+                    self.list_url, body, content_type='application/json'
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST
+                )
+
+    def test_bad_since(self):
+        """Некорректный since отклоняется с кодом 400"""
+        for since in ('abc', '-1'):
+            with self.subTest(since=since):
+                response = self.author_client.get(
+                    self.list_url, {'since': since}
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST
+                )
+
+    def test_note_not_modified(self):
+        """Заметка с прежней ревизией в If-None-Match не передаётся"""
+        response = self.author_client.get(
+            self.note_url, headers={'if-none-match': f'"{self.note.revision}"'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_put_and_patch(self):
+        """PUT заменяет заметку, PATCH меняет только переданные поля"""
+        response = self.send(
+            'put', self.note_url,
+            {'title': 'Новый', 'text': 'Новый текст', 'slug': 'note'},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        response = self.send('patch', self.note_url, {'text': 'Правка'})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        note = Note.objects.get(pk=self.note.pk)
+        self.assertEqual((note.title, note.text), ('Новый', 'Правка'))
+        self.assertEqual(response.json()['revision'], note.revision)
+        self.assertGreater(note.revision, self.note.revision)
+
+    def test_if_match_conflict(self):
+        """Запись по устаревшей ревизии отклоняется с кодом 412"""
+        etag = f'"{self.note.revision}"'
+        Note.objects.filter(pk=self.note.pk).update(text='Чужая правка')
+        response = self.send(
+            'patch', self.note_url, {'text': 'Моя правка'}, if_match=etag
+        )
+        self.assertEqual(
+            response.status_code, HTTPStatus.PRECONDITION_FAILED
+        )
+        self.assertEqual(
+            Note.objects.get(pk=self.note.pk).text, 'Чужая правка'
+        )
+
+    def test_slug_change_leaves_tombstone(self):
+        """Переименованный slug попадает в список удалённых"""
+        since = self.note.revision
+        self.send('patch', self.note_url, {'slug': 'renamed'})
+        data = self.author_client.get(
+            self.list_url, {'since': since}
+        ).json()
+        self.assertEqual(
+            [note['slug'] for note in data['notes']], ['renamed']
+        )
+        self.assertEqual(data['deleted'], ['note'])
+
+    def test_recreated_note_is_not_deleted(self):
+        """Удалённая и созданная заново заметка не попадает в удалённые"""
+        since = self.note.revision
+        self.author_client.delete(self.note_url)
+        self.send('post', self.list_url, {
+            'title': 'Заново', 'text': 'Текст', 'slug': 'note'
+        })
+        data = self.author_client.get(
+            self.list_url, {'since': since}
+        ).json()
+        self.assertEqual([note['slug'] for note in data['notes']], ['note'])
+        self.assertEqual(data['deleted'], [])
+
+    def test_slug_renamed_back_is_not_deleted(self):
+        """
+        После переименования a → b → a в удалённых только b,
+        а заметка a приходит в списке изменённых
+        """
+        since = self.note.revision
+        self.send('patch', self.note_url, {'slug': 'renamed'})
+        self.send(
+            'patch',
+            reverse('notes:api_note', args=('renamed',)),
+            {'slug': 'note'},
+        )
+        data = self.author_client.get(
+            self.list_url, {'since': since}
+        ).json()
+        self.assertEqual([note['slug'] for note in data['notes']], ['note'])
+        self.assertEqual(data['deleted'], ['renamed'])
+
+    def test_deleted_slugs_are_distinct(self):
+        """Slug, удалённый несколько раз, приходит один раз"""
+        since = self.note.revision
+        for _ in range(2):
+            self.author_client.delete(self.note_url)
+            self.send('post', self.list_url, {
+                'title': 'Заново', 'text': 'Текст', 'slug': 'note'
+            })
+        self.author_client.delete(self.note_url)
+        data = self.author_client.get(
+            self.list_url, {'since': since}
+        ).json()
+        self.assertEqual(data['notes'], [])
+        self.assertEqual(data['deleted'], ['note'])
+
+    def test_save_with_update_fields_writes_revision(self):
+        """
+        Сохранение части полей тоже выдаёт ревизию,
+        и изменение приходит при синхронизации
+        """
+        since = self.note.revision
+        note = Note.objects.get(pk=self.note.pk)
+        note.text = 'Новый текст'
+        note.save(update_fields=['text'])
+        self.assertGreater(
+            Note.objects.get(pk=note.pk).revision, since
+        )
+        data = self.author_client.get(
+            self.list_url, {'since': since}
+        ).json()
+        self.assertEqual(
+            [item['text'] for item in data['notes']], ['Новый текст']
+        )
+
+    def test_update_rejects_revision(self):
+        """Ревизию нельзя передать в update() вручную"""
+        with self.assertRaisesMessage(TypeError, 'Ревизия'):
+            Note.objects.filter(pk=self.note.pk).update(revision=1)
+
+    def test_delete_note(self):
+        """DELETE удаляет заметку и оставляет отметку об удалении"""
+        response = self.author_client.delete(self.note_url)
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertFalse(Note.objects.filter(pk=self.note.pk).exists())
+        self.assertTrue(
+            NoteTombstone.objects.filter(
+                author=self.author, slug='note'
+            ).exists()
+        )
+
+    def test_bulk_delete_leaves_tombstones(self):
+        """Массовое удаление тоже оставляет отметки с одной ревизией"""
+        Note.objects.bulk_create(
+            Note(title=str(i), text='Текст', slug=f's{i}', author=self.author)
+            for i in range(3)
+        )
+        Note.objects.filter(author=self.author).delete()
+        tombstones = NoteTombstone.objects.filter(author=self.author)
+        self.assertEqual(
+            sorted(tombstones.values_list('slug', flat=True)),
+            ['note', 's0', 's1', 's2'],
+        )
+        self.assertEqual(
+            len(set(tombstones.values_list('revision', flat=True))), 1
+        )
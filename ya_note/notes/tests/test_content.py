@@ -1,18 +1,21 @@
+import json
 from http import HTTPStatus
 
-from django.test import Client, TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from notes.forms import NoteForm
-from notes.models import Note, User
+from notes.models import Note
+from notes.tests import golden
+from yanote.metrics import registry
 
 
 class TestContent(TestCase):
 
     @classmethod
     def setUpTestData(cls):
-        cls.author = User.objects.create(username='Я')
-        cls.reader = User.objects.create(username='Читатель')
+        cls.author = golden.get_user(golden.AUTHOR)
+        cls.reader = golden.get_user(golden.READER)
 
         cls.note = Note.objects.create(
             title='Заголовок',
@@ -24,12 +27,11 @@ class TestContent(TestCase):
         cls.list_url = reverse('notes:list')
         cls.add_url = reverse('notes:add')
         cls.edit_url = reverse('notes:edit', args=(cls.note.slug,))
+        cls.export_url = reverse('notes:export_all')
 
-        cls.author_client = Client()
-        cls.author_client.force_login(cls.author)
+        cls.author_client = golden.logged_in_client(cls.author)
 
-        cls.reader_client = Client()
-        cls.reader_client.force_login(cls.reader)
+        cls.reader_client = golden.logged_in_client(cls.reader)
 
     def test_notes_list_for_different_users(self):
         """
@@ -75,3 +77,82 @@ class TestContent(TestCase):
                     "Переданный 'form' не явл. экз. NoteForm "
                     f"для URL: {current_url}"
                 )
+
+    @override_settings(NOTES_COUNT_ON_PAGE=2)
+    def test_notes_list_is_paginated_by_id(self):
+        """
+        Список заметок выводится страницами по id,
+        следующая страница начинается после последней заметки
+        """
+        Note.objects.bulk_create(
+            Note(title=f'Заметка {index}', slug=f'note-{index}',
+                 author=self.author)
+            for index in range(3)
+        )
+        expected_ids = list(
+            Note.objects.filter(author=self.author)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+
+        shown_ids = []
+        response = self.author_client.get(self.list_url)
+        while True:
+            shown_ids += [note.id for note in response.context['object_list']]
+            next_after = response.context['next_after']
+            if next_after is None:
+                break
+            response = self.author_client.get(
+                self.list_url, {'after': next_after}
+            )
+        self.assertEqual(shown_ids, expected_ids)
+
+    def test_notes_list_does_not_load_text(self):
+        """Для списка заметок текст из базы не загружается"""
+        object_list = self.author_client.get(self.list_url).context[
+            'object_list'
+        ]
+        for note in object_list:
+            self.assertIn('text', note.get_deferred_fields())
+
+    def test_export_notes(self):
+        """
+        Выгрузка в NDJSON и JSON отдаётся потоком
+        и содержит только заметки автора
+        """
+        Note.objects.create(
+            title='Чужая', text='Текст', slug='other', author=self.reader
+        )
+        expected = [
+            {'title': self.note.title, 'slug': self.note.slug,
+             'text': self.note.text},
+        ]
+        for export_format, parse in (
+            ('ndjson', lambda body: [
+                json.loads(line) for line in body.splitlines()
+            ]),
+            ('json', json.loads),
+        ):
+            with self.subTest(export_format=export_format):
+                response = self.author_client.get(
+                    self.export_url, {'format': export_format}
+                )
+                self.assertTrue(response.streaming)
+                body = b''.join(response.streaming_content).decode()
+                self.assertEqual(parse(body), expected)
+
+    def test_request_metrics_by_url_name(self):
+        """
+        Для каждого имени URL собираются число SQL-запросов,
+        время SQL, рендеринга шаблона и ответа целиком
+        """
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.author_client.get(self.list_url)
+
+        list_metrics = registry.snapshot()['notes:list']
+        self.assertEqual(list_metrics['queries']['count'], 1)
+        self.assertGreater(list_metrics['queries']['max'], 0)
+        for metric in ('sql_ms', 'template_ms', 'total_ms'):
+            with self.subTest(metric=metric):
+                self.assertEqual(list_metrics[metric]['count'], 1)
@@ -0,0 +1,31 @@
+from unittest import skipIf
+
+from django.db import connection
+from django.test import TestCase
+
+from notes.models import Note
+from notes.tests import golden
+
+
+@skipIf(
+    connection.vendor != 'sqlite',
+    'План запроса проверяется через EXPLAIN QUERY PLAN SQLite'
+)
+class TestIndexes(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = golden.get_user(golden.AUTHOR)
+
+    def test_notes_list_uses_author_index(self):
+        """
+        Заметки пользователя выбираются по индексу внешнего ключа author.
+
+        В SQLite индекс хранит rowid, поэтому он же упорядочивает заметки
+        по id без сортировки во временном B-дереве
+        """
+        plan = (
+            Note.objects.filter(author=self.author).order_by('id').explain()
+        )
+        self.assertIn('notes_note_author_id', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
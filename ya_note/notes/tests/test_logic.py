@@ -1,20 +1,32 @@
+import json
+import threading
+import time
 from http import HTTPStatus
+from unittest.mock import patch
 
-from django.test import Client, TestCase
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytils.translit import slugify
 
 from notes.forms import WARNING
-from notes.models import Note, User
+from notes.models import Note
+from notes.tests import golden
+
+THREADS_COUNT = 16
+# Сколько раз поток повторяет запись в заблокированную базу и пауза
+# между попытками: вместе не больше десяти секунд ожидания.
+LOCKED_ATTEMPTS = 1000
+LOCKED_PAUSE = 0.01
 
 
 class TestNoteCreation(TestCase):
 
     @classmethod
     def setUpTestData(cls):
-        cls.user = User.objects.create(username='Я')
-        cls.user_client = Client()
-        cls.user_client.force_login(cls.user)
+        cls.user = golden.get_user(golden.AUTHOR)
+        cls.user_client = golden.logged_in_client(cls.user)
 
         cls.add_url = reverse('notes:add')
         cls.done_url = reverse('notes:success')
@@ -67,20 +79,110 @@ class TestNoteCreation(TestCase):
         expected_slug = slugify(self.form_data_creation['title'])
         self.assertEqual(new_note.slug, expected_slug)
 
+    def test_empty_slug_with_used_title(self):
+        """
+        Если slug из заголовка уже занят, к нему
+        автоматически добавляется свободный суффикс
+        """
+        form_data_copy = self.form_data_creation.copy()
+        form_data_copy.pop('slug')
+        expected_slug = slugify(self.form_data_creation['title'])
+
+        for suffix in ('', '-2', '-3'):
+            with self.subTest(suffix=suffix):
+                response = self.user_client.post(
+                    self.add_url, data=form_data_copy
+                )
+                self.assertRedirects(response, self.done_url)
+                self.assertTrue(
+                    Note.objects.filter(slug=expected_slug + suffix).exists()
+                )
+
+    def test_free_slug_is_found_in_one_query(self):
+        """Свободный суффикс ищется одним запросом"""
+        for _ in range(3):
+            Note.objects.create(title='Заголовок', author=self.user)
+        note = Note(title='Заголовок', author=self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(note.get_free_slug(), 'zagolovok-4')
+
+    def test_slug_taken_concurrently_is_reallocated(self):
+        """
+        Если найденный slug успели занять, заметка сохраняется
+        со следующим свободным slug, а не падает с IntegrityError
+        """
+        taken = Note.objects.create(title='Заголовок', author=self.user)
+        get_free_slug = Note.get_free_slug
+        stale_slugs = iter((taken.slug,))
+
+        def stale_first(note):
+            return next(stale_slugs, None) or get_free_slug(note)
+
+        with patch.object(
+            Note, 'get_free_slug', autospec=True, side_effect=stale_first
+        ):
+            note = Note.objects.create(title='Заголовок', author=self.user)
+        self.assertEqual(note.slug, taken.slug + '-2')
+
+
+class TestNoteSlugConcurrency(TransactionTestCase):
+
+    def test_concurrent_notes_with_same_title(self):
+        """
+        Заметки с одинаковым заголовком, создаваемые
+        из разных потоков, получают разные slug
+        """
+        author = golden.get_user(golden.AUTHOR)
+        barrier = threading.Barrier(THREADS_COUNT)
+        errors = []
+
+        def create_note():
+            barrier.wait()
+            try:
+                for _ in range(LOCKED_ATTEMPTS):
+                    try:
+                        Note.objects.create(title='Заголовок', author=author)
+                        return
+                    except OperationalError as error:
+                        # Тестовая база SQLite в памяти с общим кешем
+                        # блокирует таблицу без ожидания; это не гонка
+                        # за slug, поэтому повторяем запись.
+                        if 'locked' not in str(error):
+                            raise
+                    time.sleep(LOCKED_PAUSE)
+                raise AssertionError(
+                    f'База оставалась заблокированной после '
+                    f'{LOCKED_ATTEMPTS} попыток записи.'
+                )
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=create_note)
+            for _ in range(THREADS_COUNT)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        slugs = set(Note.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), THREADS_COUNT)
+        self.assertIn('zagolovok', slugs)
+
 
 class TestNoteEditDelete(TestCase):
 
     @classmethod
     def setUpTestData(cls):
-        cls.author = User.objects.create(
-            username='Test author'
-        )
-        cls.author_client = Client()
-        cls.author_client.force_login(cls.author)
+        cls.author = golden.get_user(golden.AUTHOR)
+        cls.author_client = golden.logged_in_client(cls.author)
 
-        cls.reader = User.objects.create(username='Пользователь')
-        cls.reader_client = Client()
-        cls.reader_client.force_login(cls.reader)
+        cls.reader = golden.get_user(golden.READER)
+        cls.reader_client = golden.logged_in_client(cls.reader)
 
         cls.note = Note.objects.create(
             title='Оригинальный заголовок',
@@ -158,3 +260,119 @@ class TestNoteEditDelete(TestCase):
             form, 'slug', form_data_duplicate_slug['slug'] + WARNING
         )
         self.assertEqual(Note.objects.count(), 1)
+
+
+class TestNotesBulk(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = golden.get_user(golden.AUTHOR)
+        cls.author_client = golden.logged_in_client(cls.author)
+
+        cls.reader = golden.get_user(golden.READER)
+        cls.reader_note = Note.objects.create(
+            title='Чужая', text='Текст', slug='other', author=cls.reader
+        )
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {index}',
+                text='Текст',
+                slug=f'note-{index}',
+                author=cls.author,
+            )
+            for index in range(10)
+        )
+        cls.delete_url = reverse('notes:bulk_delete')
+        cls.export_url = reverse('notes:export')
+        cls.done_url = reverse('notes:success')
+
+    def slugs(self, count):
+        return [f'note-{index}' for index in range(count)]
+
+    def test_author_deletes_selected_notes(self):
+        """Выбранные заметки удаляются, остальные остаются"""
+        response = self.author_client.post(
+            self.delete_url, {'slug': self.slugs(3)}
+        )
+        self.assertRedirects(response, self.done_url)
+        self.assertEqual(
+            set(Note.objects.values_list('slug', flat=True)),
+            {'other', *self.slugs(10)[3:]},
+        )
+
+    def test_other_users_notes_are_not_deleted(self):
+        """Чужие заметки в выборке не удаляются и не показываются"""
+        data = {'slug': [self.reader_note.slug, 'note-0']}
+        response = self.author_client.get(self.delete_url, data)
+        self.assertEqual(
+            [note.slug for note in response.context['object_list']],
+            ['note-0'],
+        )
+        self.author_client.post(self.delete_url, data)
+        self.assertTrue(Note.objects.filter(slug='other').exists())
+        self.assertFalse(Note.objects.filter(slug='note-0').exists())
+
+    def test_export_selected_notes(self):
+        """Выгружаются только выбранные заметки автора"""
+        response = self.author_client.get(
+            self.export_url,
+            {'format': 'json', 'slug': ['note-1', 'note-2', 'other']},
+        )
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(
+            [note['slug'] for note in json.loads(body)], ['note-1', 'note-2']
+        )
+
+    def test_export_without_selection(self):
+        """
+        Пустая выборка не выгружает все заметки,
+        для этого есть отдельный адрес
+        """
+        response = self.author_client.get(self.export_url, {'format': 'json'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        response = self.author_client.get(
+            reverse('notes:export_all'), {'format': 'json', 'slug': 'note-1'}
+        )
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(
+            [note['slug'] for note in json.loads(body)], self.slugs(10)
+        )
+
+    def test_bulk_queries_do_not_depend_on_selection_size(self):
+        """
+        Подтверждение, удаление и выгрузка выполняют одно и то же число
+        запросов для одной и для десяти заметок
+        """
+        requests = (
+            ('get', self.delete_url, {}),
+            ('get', self.export_url, {'format': 'ndjson'}),
+            ('post', self.delete_url, {}),
+        )
+        for method, url, params in requests:
+            counts = []
+            for count in (1, 10):
+                with self.subTest(method=method, url=url, count=count):
+                    request = getattr(self.author_client, method)
+                    with CaptureQueriesContext(connection) as queries:
+                        response = request(
+                            url, {**params, 'slug': self.slugs(count)}
+                        )
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                    counts.append(len(queries))
+            self.assertEqual(counts[0], counts[1], (method, url))
+
+    @override_settings(NOTES_BULK_MAX_SIZE=5)
+    def test_selection_size_is_capped(self):
+        """Слишком большая выборка отклоняется целиком"""
+        for method, url in (
+            ('get', self.delete_url),
+            ('post', self.delete_url),
+            ('get', self.export_url),
+        ):
+            with self.subTest(method=method, url=url):
+                response = getattr(self.author_client, method)(
+                    url, {'slug': self.slugs(6)}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(Note.objects.filter(author=self.author).count(), 10)
@@ -5,6 +5,7 @@ from django.test import Client, TestCase
 from django.urls import reverse
 
 from notes.models import Note
+from notes.tests import golden
 
 User = get_user_model()
 
@@ -13,13 +14,15 @@ class TestRoutes(TestCase):
 
     @classmethod
     def setUpTestData(cls):
-        cls.author = User.objects.create(username='Я')
-        cls.author_client = Client()
-        cls.author_client.force_login(cls.author)
+        cls.author = golden.get_user(golden.AUTHOR)
+        cls.author_client = golden.logged_in_client(cls.author)
 
-        cls.reader = User.objects.create(username='Читатель')
-        cls.reader_client = Client()
-        cls.reader_client.force_login(cls.reader)
+        cls.reader = golden.get_user(golden.READER)
+        cls.reader_client = golden.logged_in_client(cls.reader)
+
+        cls.staff = User.objects.create(username='Персонал', is_staff=True)
+        cls.staff_client = Client()
+        cls.staff_client.force_login(cls.staff)
 
         cls.note = Note.objects.create(
             title='Заголовок',
@@ -29,12 +32,17 @@ class TestRoutes(TestCase):
         )
 
         cls.home_url = reverse('notes:home')
+        cls.stats_url = reverse('stats')
         cls.login_url = reverse('users:login')
         cls.signup_url = reverse('users:signup')
 
         cls.notes_list_url = reverse('notes:list')
         cls.notes_success_url = reverse('notes:success')
         cls.notes_add_url = reverse('notes:add')
+        cls.notes_export_url = reverse('notes:export')
+        cls.notes_export_all_url = reverse('notes:export_all')
+        cls.notes_search_url = reverse('notes:search')
+        cls.notes_bulk_delete_url = reverse('notes:bulk_delete')
 
         cls.note_detail_url = reverse('notes:detail', args=(cls.note.slug,))
         cls.note_edit_url = reverse('notes:edit', args=(cls.note.slug,))
@@ -68,6 +76,9 @@ class TestRoutes(TestCase):
             self.notes_list_url,
             self.notes_success_url,
             self.notes_add_url,
+            self.notes_export_all_url,
+            self.notes_search_url,
+            self.notes_bulk_delete_url,
         )
 
         for url in urls_to_check:
@@ -109,6 +120,10 @@ class TestRoutes(TestCase):
             self.notes_list_url,
             self.notes_success_url,
             self.notes_add_url,
+            self.notes_export_url,
+            self.notes_export_all_url,
+            self.notes_search_url,
+            self.notes_bulk_delete_url,
             self.note_detail_url,
             self.note_edit_url,
             self.note_delete_url,
@@ -119,3 +134,15 @@ class TestRoutes(TestCase):
                 redirect_url = f'{self.login_url}?next={url}'
                 response = self.client.get(url)
                 self.assertRedirects(response, redirect_url)
+
+    def test_stats_available_only_for_staff(self):
+        """Страница метрик запросов доступна только персоналу"""
+        clients_statuses = (
+            (self.staff_client, HTTPStatus.OK),
+            (self.author_client, HTTPStatus.FOUND),
+            (self.client, HTTPStatus.FOUND),
+        )
+        for client, status in clients_statuses:
+            with self.subTest(client=client):
+                response = client.get(self.stats_url)
+                self.assertEqual(response.status_code, status)
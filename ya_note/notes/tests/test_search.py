@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from notes.search import match_expression, search_notes
+from notes.tests import golden
+
+
+class TestSearch(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = golden.get_user(golden.AUTHOR)
+        cls.reader = golden.get_user(golden.READER)
+        cls.title_note = Note.objects.create(
+            title='Рецепт борща',
+            text='Свёкла, капуста, картофель',
+            author=cls.author,
+        )
+        cls.text_note = Note.objects.create(
+            title='Покупки',
+            text='Купить продукты для борща',
+            author=cls.author,
+        )
+        cls.reader_note = Note.objects.create(
+            title='Борщ читателя',
+            text='Свой рецепт',
+            author=cls.reader,
+        )
+        cls.url = reverse('notes:search')
+        cls.author_client = golden.logged_in_client(cls.author)
+
+    def search(self, query, author=None):
+        return search_notes(author or self.author, query, limit=10)
+
+    def test_match_expression_ignores_fts_syntax(self):
+        """Операторы FTS5 из запроса превращаются в обычные слова"""
+        self.assertEqual(
+            match_expression('борщ OR "рецепт" NEAR(a*'),
+            '"борщ"* "OR"* "рецепт"* "NEAR"* "a"*',
+        )
+        self.assertEqual(match_expression(' -*"() '), '')
+
+    def test_search_by_title_and_text_ranks_title_first(self):
+        """
+        Заметка находится по заголовку и по тексту,
+        совпадение в заголовке выше совпадения в тексте
+        """
+        self.assertEqual(
+            self.search('борщ'), [self.title_note, self.text_note]
+        )
+
+    def test_search_is_scoped_to_author(self):
+        """Заметки другого пользователя в результаты не попадают"""
+        self.assertEqual(
+            self.search('борщ', author=self.reader), [self.reader_note]
+        )
+
+    def test_search_by_prefix_and_case(self):
+        """Слова ищутся без учёта регистра и как префиксы"""
+        self.assertEqual(self.search('КАПУСТ'), [self.title_note])
+        self.assertEqual(self.search('картоф'), [self.title_note])
+
+    def test_all_words_must_match(self):
+        """Заметка должна содержать все слова запроса"""
+        self.assertEqual(self.search('купить борщ'), [self.text_note])
+        self.assertEqual(self.search('купить капуста'), [])
+
+    def test_search_ignores_yo(self):
+        """«ё» и «е» в запросе и в тексте не различаются"""
+        note = Note.objects.create(
+            title='Ёлка', text='Игрушки на ёлку', author=self.author
+        )
+        for query in ('елка', 'ёлка', 'ЕЛК', 'игрушки ёлку'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query), [note])
+        self.assertEqual(self.search('свекла'), [self.title_note])
+        note.title = 'Ёж'
+        note.save()
+        self.assertEqual(self.search('еж'), [note])
+        note.delete()
+        self.assertEqual(self.search('игрушки'), [])
+        self.assertEqual(
+            match_expression('Ёлка ёж'), '"Елка"* "еж"*'
+        )
+
+    def test_index_follows_note_changes(self):
+        """Индекс обновляется при изменении и удалении заметки"""
+        self.title_note.title = 'Рецепт щей'
+        self.title_note.text = 'Капуста'
+        self.title_note.save()
+        self.assertEqual(self.search('борщ'), [self.text_note])
+        self.assertEqual(self.search('щей'), [self.title_note])
+
+        self.text_note.delete()
+        self.assertEqual(self.search('борщ'), [])
+
+    def test_index_follows_bulk_changes(self):
+        """Массовые update и delete тоже обновляют индекс"""
+        Note.objects.filter(author=self.author).update(text='Пусто')
+        self.assertEqual(self.search('капуста'), [])
+        Note.objects.filter(author=self.author).delete()
+        self.assertEqual(self.search('рецепт'), [])
+
+    @override_settings(NOTES_SEARCH_COUNT_ON_PAGE=1)
+    def test_search_view_pages(self):
+        """Результаты разбиты на страницы по номеру из параметра page"""
+        response = self.author_client.get(self.url, {'q': 'борщ'})
+        self.assertEqual(
+            list(response.context['object_list']), [self.title_note]
+        )
+        self.assertEqual(response.context['next_page'], 2)
+
+        response = self.author_client.get(self.url, {'q': 'борщ', 'page': 2})
+        self.assertEqual(
+            list(response.context['object_list']), [self.text_note]
+        )
+        self.assertIsNone(response.context['next_page'])
+
+    def test_search_view_without_query(self):
+        """Без запроса страница поиска пуста и не обращается к индексу"""
+        with self.assertNumQueries(2):
+            response = self.author_client.get(self.url)
+        self.assertEqual(list(response.context['object_list']), [])
+
+    def test_search_view_rejects_bad_page(self):
+        """Некорректный номер страницы - ошибка 400"""
+        for page in ('abc', '0'):
+            with self.subTest(page=page):
+                response = self.author_client.get(
+                    self.url, {'q': 'борщ', 'page': page}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import skipIf
+
+from django.conf import settings
+from django.db import OperationalError, connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from yanote.sqlite_pool.base import ConnectionPool
+
+STRESS_ALIAS = 'sqlite_stress'
+WRITERS_COUNT = 8
+WRITES_PER_WRITER = 25
+
+
+@skipIf(connection.vendor != 'sqlite', 'Проверяются настройки SQLite')
+class TestSqlitePragmas(TestCase):
+
+    def test_pragmas_are_applied_to_connection(self):
+        """Прагмы из SQLITE_PRAGMAS выполняются при открытии соединения"""
+        with connection.cursor() as cursor:
+            for name in ('busy_timeout', 'cache_size', 'synchronous'):
+                with self.subTest(name=name):
+                    cursor.execute(f'PRAGMA {name}')
+                    self.assertEqual(
+                        str(cursor.fetchone()[0]),
+                        str(settings.SQLITE_PRAGMAS[name]).replace(
+                            'NORMAL', '1'
+                        ),
+                    )
+
+
+@skipIf(connection.vendor != 'sqlite', 'Проверяются настройки SQLite')
+class TestSqliteConcurrentWriters(TransactionTestCase):
+    """
+    Писатели в файловую базу с настройками проекта: каждый читает
+    последнее значение и записывает следующее в одной транзакции.
+    """
+
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # Отдельная файловая база с настройками соединения проекта.
+        # Псевдоним добавляется после проверки databases в setUpClass,
+        # поэтому разрешаем его классу вручную.
+        databases = type(self).databases
+        self.addCleanup(setattr, type(self), 'databases', databases)
+        type(self).databases = databases | {STRESS_ALIAS}
+        connections.settings[STRESS_ALIAS] = {
+            **connections.settings['default'],
+            'NAME': str(Path(directory.name, 'stress.sqlite3')),
+        }
+        self.addCleanup(connections.settings.pop, STRESS_ALIAS)
+        stress = connections[STRESS_ALIAS]
+        self.addCleanup(connections.__delitem__, STRESS_ALIAS)
+        self.addCleanup(stress.close)
+        with stress.cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE counter (id INTEGER PRIMARY KEY, value INTEGER)'
+            )
+
+    def test_writers_wait_for_lock_instead_of_failing(self):
+        """Параллельные писатели ждут блокировку, а не получают ошибку"""
+        barrier = threading.Barrier(WRITERS_COUNT)
+        errors = []
+
+        def write():
+            barrier.wait()
+            try:
+                for _ in range(WRITES_PER_WRITER):
+                    with transaction.atomic(using=STRESS_ALIAS):
+                        with connections[STRESS_ALIAS].cursor() as cursor:
+                            cursor.execute(
+                                'SELECT COALESCE(MAX(value), 0) FROM counter'
+                            )
+                            value = cursor.fetchone()[0] + 1
+                            cursor.execute(
+                                'INSERT INTO counter (value) VALUES (%s)',
+                                [value],
+                            )
+            except OperationalError as error:
+                errors.append(error)
+            finally:
+                connections[STRESS_ALIAS].close()
+
+        threads = [
+            threading.Thread(target=write) for _ in range(WRITERS_COUNT)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        with connections[STRESS_ALIAS].cursor() as cursor:
+            cursor.execute('SELECT COUNT(DISTINCT value) FROM counter')
+            self.assertEqual(
+                cursor.fetchone()[0], WRITERS_COUNT * WRITES_PER_WRITER
+            )
+
+
+class TestSqliteConnectionPool(SimpleTestCase):
+
+    def setUp(self):
+        self.opened = []
+        self.pool = ConnectionPool(self.connect, max_size=2, timeout=0.01)
+
+    def connect(self):
+        self.opened.append(sqlite3.connect(':memory:'))
+        return self.opened[-1]
+
+    def test_released_connection_is_reused(self):
+        """Возвращённое в пул соединение выдаётся снова"""
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.assertIs(self.pool.acquire(), connection)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_pool_is_bounded(self):
+        """Сверх max_size соединений пул не открывает"""
+        self.pool.acquire()
+        self.pool.acquire()
+        with self.assertRaises(sqlite3.OperationalError):
+            self.pool.acquire()
+
+    def test_broken_connection_is_replaced(self):
+        """Закрытое соединение из пула заменяется новым"""
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        connection.close()
+        self.assertIsNot(self.pool.acquire(), connection)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_open_transaction_is_rolled_back_on_release(self):
+        """Незавершённая транзакция откатывается при возврате в пул"""
+        connection = self.pool.acquire()
+        connection.execute('CREATE TABLE counter (value INTEGER)')
+        connection.commit()
+        connection.execute('INSERT INTO counter VALUES (1)')
+        self.pool.release(connection)
+        connection = self.pool.acquire()
+        self.assertEqual(
+            connection.execute('SELECT COUNT(*) FROM counter').fetchone(),
+            (0,),
+        )
@@ -0,0 +1,27 @@
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+
+class TestCompileTemplates(SimpleTestCase):
+
+    def test_all_templates_compile(self):
+        """Все шаблоны проекта компилируются командой compile_templates"""
+        stdout = StringIO()
+        call_command('compile_templates', stdout=stdout)
+        self.assertIn('Скомпилировано шаблонов', stdout.getvalue())
+
+    def test_broken_template_fails_command(self):
+        """Команда называет шаблон с ошибкой и завершается с ошибкой"""
+        with TemporaryDirectory() as directory:
+            Path(directory, 'broken.html').write_text('{% if %}{% endif %}')
+            templates = [{**settings.TEMPLATES[0], 'DIRS': [directory]}]
+            stderr = StringIO()
+            with override_settings(TEMPLATES=templates):
+                with self.assertRaises(CommandError):
+                    call_command('compile_templates', stderr=stderr)
+        self.assertIn('broken.html', stderr.getvalue())
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from notes import views
+from notes import api, views
 
 app_name = "notes"
 
@@ -11,5 +11,17 @@ urlpatterns = [
     path("note/<slug:slug>/", views.NoteDetail.as_view(), name="detail"),
     path("delete/<slug:slug>/", views.NoteDelete.as_view(), name="delete"),
     path("notes/", views.NotesList.as_view(), name="list"),
+    path(
+        "notes/delete/", views.NotesBulkDelete.as_view(), name="bulk_delete"
+    ),
+    path("notes/search/", views.NoteSearch.as_view(), name="search"),
+    path("notes/export/", views.NotesExport.as_view(), name="export"),
+    path(
+        "notes/export/all/",
+        views.NotesExport.as_view(export_all=True),
+        name="export_all",
+    ),
     path("done/", views.NoteSuccess.as_view(), name="success"),
+    path("api/notes/", api.NotesApi.as_view(), name="api_notes"),
+    path("api/notes/<slug:slug>/", api.NoteApi.as_view(), name="api_note"),
 ]
@@ -1,9 +1,16 @@
+import json
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import BadRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.views import generic
 
 from .forms import NoteForm
 from .models import Note
+from .search import search_notes
 
 
 class Home(generic.TemplateView):
@@ -29,6 +36,22 @@ class NoteBase(LoginRequiredMixin):
         return self.model.objects.filter(author=self.request.user)
 
 
+def selected_slugs(request):
+    """
+    Slug выбранных заметок из параметров slug запроса.
+
+    Число заметок в одной операции ограничено NOTES_BULK_MAX_SIZE.
+    """
+    data = request.POST if request.method == "POST" else request.GET
+    slugs = set(data.getlist("slug"))
+    if len(slugs) > settings.NOTES_BULK_MAX_SIZE:
+        raise BadRequest(
+            f"За раз можно выбрать не больше "
+            f"{settings.NOTES_BULK_MAX_SIZE} заметок."
+        )
+    return slugs
+
+
 class NoteCreate(NoteBase, generic.CreateView):
     """Добавление заметки."""
 
@@ -56,10 +79,163 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """
+    Список заметок пользователя по страницам.
+
+    Следующая страница начинается после id из параметра after,
+    текст заметок для списка не загружается.
+    """
 
     template_name = "notes/list.html"
 
+    def get_queryset(self):
+        queryset = (
+            super().get_queryset().only("id", "title", "slug").order_by("id")
+        )
+        after = self.request.GET.get("after")
+        if after:
+            try:
+                queryset = queryset.filter(id__gt=int(after))
+            except ValueError as error:
+                raise BadRequest("Некорректный параметр after.") from error
+        # Одна лишняя заметка показывает, есть ли следующая страница.
+        return queryset[: settings.NOTES_COUNT_ON_PAGE + 1]
+
+    def get_context_data(self, **kwargs):
+        notes = list(self.object_list)
+        next_after = None
+        if len(notes) > settings.NOTES_COUNT_ON_PAGE:
+            notes = notes[: settings.NOTES_COUNT_ON_PAGE]
+            next_after = notes[-1].id
+        return super().get_context_data(
+            object_list=notes, next_after=next_after, **kwargs
+        )
+
+
+class NotesBulkDelete(NoteBase, generic.ListView):
+    """
+    Удаление нескольких заметок после одного подтверждения.
+
+    Выбранные заметки показываются и удаляются одним запросом
+    filter(author=..., slug__in=...), чужие slug просто не находятся.
+    """
+
+    template_name = "notes/bulk_delete.html"
+
+    def get_queryset(self):
+        return (
+            super().get_queryset()
+            .filter(slug__in=selected_slugs(self.request))
+            .only("id", "title", "slug")
+            .order_by("id")
+        )
+
+    def post(self, request, *args, **kwargs):
+        self.get_queryset().delete()
+        return redirect(self.success_url)
+
+
+class NoteSearch(NoteBase, generic.ListView):
+    """
+    Поиск по заголовкам и текстам заметок пользователя.
+
+    Результаты упорядочены по релевантности и разбиты на страницы
+    номером из параметра page.
+    """
+
+    template_name = "notes/search.html"
+
+    def get_page_number(self):
+        try:
+            page = int(self.request.GET.get("page", 1))
+        except ValueError as error:
+            raise BadRequest("Некорректный параметр page.") from error
+        if page < 1:
+            raise BadRequest("Некорректный параметр page.")
+        return page
+
+    def get_queryset(self):
+        self.page = self.get_page_number()
+        # Одна лишняя заметка показывает, есть ли следующая страница.
+        return search_notes(
+            self.request.user,
+            self.request.GET.get("q", ""),
+            limit=settings.NOTES_SEARCH_COUNT_ON_PAGE + 1,
+            offset=(self.page - 1) * settings.NOTES_SEARCH_COUNT_ON_PAGE,
+        )
+
+    def get_context_data(self, **kwargs):
+        notes = self.object_list[: settings.NOTES_SEARCH_COUNT_ON_PAGE]
+        next_page = None
+        if len(self.object_list) > settings.NOTES_SEARCH_COUNT_ON_PAGE:
+            next_page = self.page + 1
+        return super().get_context_data(
+            object_list=notes,
+            query=self.request.GET.get("q", ""),
+            next_page=next_page,
+            **kwargs,
+        )
+
+
+class NotesExport(NoteBase, generic.View):
+    """
+    Выгрузка заметок пользователя в NDJSON или JSON.
+
+    Выгружаются заметки, выбранные параметрами slug; пустая выборка
+    отклоняется, а не превращается в выгрузку всего. Все заметки
+    выгружаются отдельным адресом, где export_all=True и параметры
+    slug не читаются. Заметки читаются из базы порциями и сразу
+    отдаются клиенту, поэтому память не зависит от их количества.
+    """
+
+    export_all = False
+    fields = ("title", "slug", "text")
+    formats = {
+        "ndjson": ("application/x-ndjson", "notes.ndjson"),
+        "json": ("application/json", "notes.json"),
+    }
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("format", "ndjson")
+        if export_format not in self.formats:
+            raise BadRequest("Неизвестный формат выгрузки.")
+        content_type, filename = self.formats[export_format]
+        queryset = self.get_queryset()
+        if not self.export_all:
+            slugs = selected_slugs(request)
+            if not slugs:
+                raise BadRequest("Не выбрано ни одной заметки.")
+            queryset = queryset.filter(slug__in=slugs)
+        rows = (
+            queryset
+            .order_by("id")
+            .values(*self.fields)
+            .iterator(chunk_size=settings.NOTES_EXPORT_CHUNK_SIZE)
+        )
+        stream = (
+            self.as_ndjson(rows)
+            if export_format == "ndjson"
+            else self.as_json(rows)
+        )
+        response = StreamingHttpResponse(
+            stream, content_type=f"{content_type}; charset=utf-8"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    def as_ndjson(rows):
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    @staticmethod
+    def as_json(rows):
+        separator = "["
+        for row in rows:
+            yield separator + json.dumps(row, ensure_ascii=False)
+            separator = ","
+        yield "[]" if separator == "[" else "]"
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
@@ -0,0 +1,233 @@
+"""
+Метрики стоимости запросов по именам URL.
+
+RequestMetricsMiddleware для выборки запросов считает число и время
+SQL-запросов, время рендеринга шаблона и общее время ответа.
+Значения складываются в гистограммы в памяти процесса, сводка
+доступна персоналу по адресу stats_view.
+
+Копия модуля есть в другом проекте репозитория, см. check_mirrors.py.
+"""
+import bisect
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.http import JsonResponse
+
+# Верхние границы корзин: миллисекунды для времени, штуки для запросов.
+TIME_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+METRICS = {
+    "queries": COUNT_BUCKETS,
+    "sql_ms": TIME_BUCKETS,
+    "template_ms": TIME_BUCKETS,
+    "total_ms": TIME_BUCKETS,
+}
+PERCENTILES = (50, 90, 99)
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами: O(1) памяти на значение."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent):
+        """Верхняя граница корзины, в которую попал перцентиль."""
+        rank = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0,
+            "max": round(self.max, 2),
+            **{
+                f"p{percent}": self.percentile(percent)
+                for percent in PERCENTILES
+            },
+        }
+
+
+class MetricsRegistry:
+    """Гистограммы метрик по именам URL, общие для потоков процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view_name, values):
+        with self.lock:
+            histograms = self.views.get(view_name)
+            if histograms is None:
+                histograms = self.views[view_name] = {
+                    metric: Histogram(bounds)
+                    for metric, bounds in METRICS.items()
+                }
+            for metric, value in values.items():
+                histograms[metric].add(value)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                view_name: {
+                    metric: histogram.as_dict()
+                    for metric, histogram in histograms.items()
+                }
+                for view_name, histograms in sorted(self.views.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+
+registry = MetricsRegistry()
+
+
+class QueryTimer:
+    """Обёртка execute_wrapper: считает SQL-запросы и их время."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def wrap_connections(timer):
+    """Подключает timer к соединениям текущего потока."""
+    for connection in connections.all():
+        connection.execute_wrappers.append(timer)
+
+
+def unwrap_connections(timer):
+    for connection in connections.all():
+        connection.execute_wrappers.remove(timer)
+
+
+class RequestMetricsMiddleware:
+    """
+    Записывает метрики для доли запросов REQUEST_METRICS_SAMPLE_RATE.
+
+    Запросы вне выборки проходят без обёрток, поэтому при малой доле
+    middleware можно держать включённым в продакшене. Работает и
+    в асинхронной цепочке, чтобы под ASGI не занимать поток на запрос.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(
+            settings, "REQUEST_METRICS_SAMPLE_RATE", 1.0
+        )
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        with self.measure(request):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        # Соединения Django привязаны к потоку, а асинхронный ORM
+        # выполняет запросы в потоке sync_to_async, общем для всего
+        # запроса. Обёртку ставим на соединения этого потока.
+        timer = QueryTimer()
+        await sync_to_async(wrap_connections)(timer)
+        try:
+            with self.record(request, timer):
+                return await self.get_response(request)
+        finally:
+            await sync_to_async(unwrap_connections)(timer)
+
+    @contextmanager
+    def measure(self, request):
+        timer = QueryTimer()
+        wrap_connections(timer)
+        try:
+            with self.record(request, timer):
+                yield
+        finally:
+            unwrap_connections(timer)
+
+    @contextmanager
+    def record(self, request, timer):
+        """Замеряет ответ целиком и записывает метрики по имени URL."""
+        request.metrics_template_time = 0.0
+        start = time.perf_counter()
+        yield
+        total = time.perf_counter() - start
+        if request.resolver_match is not None:
+            registry.record(
+                request.resolver_match.view_name,
+                {
+                    "queries": timer.count,
+                    "sql_ms": timer.duration * 1000,
+                    "template_ms": request.metrics_template_time * 1000,
+                    "total_ms": total * 1000,
+                },
+            )
+
+    def process_template_response(self, request, response):
+        if not hasattr(request, "metrics_template_time"):
+            return response
+        start = time.perf_counter()
+
+        def rendered(response):
+            request.metrics_template_time += time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+@staff_member_required
+def stats_view(request):
+    """Сводка метрик по именам URL для персонала."""
+    return JsonResponse(
+        {
+            "sample_rate": getattr(
+                settings, "REQUEST_METRICS_SAMPLE_RATE", 1.0
+            ),
+            "views": registry.snapshot(),
+        },
+        json_dumps_params={"ensure_ascii": False},
+    )
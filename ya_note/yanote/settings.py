@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -24,6 +25,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "yanote.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -54,13 +56,52 @@ TEMPLATES = [
 WSGI_APPLICATION = "yanote.wsgi.application"
 
 
+# Прагмы выполняются при открытии каждого соединения с SQLite.
+# WAL позволяет читать во время записи, busy_timeout задаёт, сколько
+# миллисекунд ждать освобождения блокировки записи вместо ошибки
+# «database is locked». mmap_size в байтах, cache_size < 0 — в КиБ.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -20000,
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}"
+                for name, value in SQLITE_PRAGMAS.items()
+            ),
+            # Транзакция сразу берёт блокировку записи. При отложенной
+            # транзакции, которая сначала читает, а потом пишет, SQLite
+            # возвращает «database is locked» без ожидания busy_timeout.
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
+# Режим соединений с базой задаётся переменной окружения
+# DJANGO_DB_CONNECTIONS, wsgi.py и asgi.py выбирают свой по умолчанию:
+#   "persistent" — соединение потока живёт между запросами
+#   и проверяется перед повторным использованием;
+#   "pool" — общий ограниченный пул соединений для ASGI;
+#   не задано — новое соединение на каждый запрос.
+DB_CONNECTIONS = os.environ.get("DJANGO_DB_CONNECTIONS", "")
+DB_CONN_MAX_AGE = 600
+DB_POOL = {"max_size": 8, "timeout": 10}
+
+if DB_CONNECTIONS == "persistent":
+    DATABASES["default"]["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+elif DB_CONNECTIONS == "pool":
+    DATABASES["default"]["ENGINE"] = "yanote.sqlite_pool"
+    DATABASES["default"]["OPTIONS"]["pool"] = DB_POOL
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -89,3 +130,15 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 LOGIN_URL = reverse_lazy("users:login")
 LOGIN_REDIRECT_URL = reverse_lazy("notes:home")
+
+NOTES_COUNT_ON_PAGE = 100
+
+NOTES_EXPORT_CHUNK_SIZE = 2000
+
+NOTES_SEARCH_COUNT_ON_PAGE = 20
+
+# Сколько заметок можно удалить или выгрузить одной операцией.
+NOTES_BULK_MAX_SIZE = 500
+
+# Доля запросов, для которых RequestMetricsMiddleware собирает метрики.
+REQUEST_METRICS_SAMPLE_RATE = 1.0
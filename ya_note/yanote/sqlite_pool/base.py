@@ -0,0 +1,102 @@
+"""
+Бэкенд SQLite с ограниченным пулом соединений.
+
+Под ASGI каждый запрос выполняет синхронный код в своём потоке,
+а соединения Django привязаны к потоку, поэтому CONN_MAX_AGE
+не помогает: соединение открывается и закрывается на каждый запрос.
+Этот бэкенд при закрытии возвращает соединение в общий пул, а при
+открытии берёт готовое. Одновременно открыто не больше max_size
+соединений; если все заняты, запрос ждёт до timeout секунд.
+
+    "ENGINE": "yanote.sqlite_pool",
+    "OPTIONS": {"pool": {"max_size": 8, "timeout": 10}},
+
+Копия модуля есть в другом проекте репозитория, см. check_mirrors.py.
+"""
+import queue
+import threading
+
+from django.db.backends.sqlite3 import base
+from django.utils.asyncio import async_unsafe
+
+DEFAULT_POOL = {"max_size": 8, "timeout": 10}
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, max_size, timeout):
+        self.connect = connect
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(max_size)
+
+    def acquire(self):
+        """
+        Выдаёт свободное соединение или открывает новое.
+
+        Соединение из пула сначала проверяется запросом SELECT 1.
+        """
+        if not self.slots.acquire(timeout=self.timeout):
+            raise base.Database.OperationalError(
+                "Все соединения пула заняты."
+            )
+        try:
+            while True:
+                try:
+                    connection = self.idle.get_nowait()
+                except queue.Empty:
+                    return self.connect()
+                try:
+                    connection.execute("SELECT 1")
+                except base.Database.Error:
+                    connection.close()
+                else:
+                    return connection
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, connection):
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+            self.idle.put(connection)
+        except base.Database.Error:
+            connection.close()
+        finally:
+            self.slots.release()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pool_options = {**DEFAULT_POOL, **params.pop("pool", {})}
+        return params
+
+    def get_pool(self, conn_params):
+        key = (self.alias, str(self.settings_dict["NAME"]))
+        with pools_lock:
+            if key not in pools:
+                pools[key] = ConnectionPool(
+                    lambda: super(DatabaseWrapper, self).get_new_connection(
+                        conn_params
+                    ),
+                    **self.pool_options,
+                )
+            return pools[key]
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        # Соединение с базой в памяти Django никогда не закрывает,
+        # поэтому в пул оно бы не вернулось.
+        if self.is_in_memory_db():
+            return super().get_new_connection(conn_params)
+        return self.get_pool(conn_params).acquire()
+
+    def _close(self):
+        if self.connection is not None:
+            self.get_pool(None).release(self.connection)
@@ -4,9 +4,12 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path, reverse_lazy
 from django.views.generic import CreateView
 
+from yanote.metrics import stats_view
+
 urlpatterns = [
     path("", include("notes.urls")),
     path("admin/", admin.site.urls),
+    path("stats/", stats_view, name="stats"),
 ]
 
 auth_urls = (